@@ -233,7 +233,6 @@ MIDDLEWARE = [
     "misago.core.middleware.ExceptionHandlerMiddleware",
     "misago.users.middleware.OnlineTrackerMiddleware",
     "misago.admin.middleware.AdminAuthMiddleware",
-    "misago.threads.middleware.UnreadThreadsCountMiddleware",
 ]
 
 ROOT_URLCONF = "devproject.urls"
@@ -328,6 +327,7 @@ DEBUG_TOOLBAR_PANELS = [
     "debug_toolbar.panels.request.RequestPanel",
     "debug_toolbar.panels.sql.SQLPanel",
     "misago.acl.panels.MisagoACLPanel",
+    "misago.core.panels.MisagoContextProcessorsPanel",
     "debug_toolbar.panels.staticfiles.StaticFilesPanel",
     "debug_toolbar.panels.templates.TemplatesPanel",
     "debug_toolbar.panels.cache.CachePanel",
@@ -3,6 +3,27 @@ from .settings import *  # pylint: disable-all
 # Use in-memory cache
 CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
 
+# Check cache versions on every request
+MISAGO_CACHE_VERSIONS_MAX_STALENESS = 0
+
+# Don't keep versioned caches in process memory
+MISAGO_VERSIONED_CACHE_LOCAL_SIZE = 0
+
+# Don't cache parsing results in process memory
+MISAGO_MARKUP_PARSING_CACHE_SIZE = 0
+
+# Don't cache mentioned users in process memory
+MISAGO_MENTIONS_CACHE_SIZE = 0
+
+# Don't cache finalized posts HTML in process memory
+MISAGO_POSTS_CONTENT_CACHE_SIZE = 0
+
+# Don't cache posts with verified checksums in process memory
+MISAGO_POSTS_CHECKSUMS_CACHE_SIZE = 0
+
+# Don't index unread threads
+MISAGO_UNREAD_THREADS_INDEX_TTL = 0
+
 # Disable Debug Toolbar
 DEBUG_TOOLBAR_CONFIG = {}
 INTERNAL_IPS = []
@@ -1,8 +1,19 @@
+from contextlib import contextmanager
+from threading import local
+
 from .providers import providers
 
+_build_data = local()
+
 
 def build_acl(roles):
     """build ACL for given roles"""
+    with bulk_build():
+        return build_providers_acl(roles)
+
+
+def build_providers_acl(roles):
+    """build ACL for given roles, letting every provider load its own data"""
     acl = {}
 
     for extension, module in providers.list():
@@ -13,3 +24,43 @@ def build_acl(roles):
             raise AttributeError(message)
 
     return acl
+
+
+def build_acls(roles_sets):
+    """build ACLs for list of roles sets, loading providers data only once"""
+    with bulk_build(is_bulk=True):
+        return [build_providers_acl(roles) for roles in roles_sets]
+
+
+@contextmanager
+def bulk_build(is_bulk=False):
+    """Shares data loaded by ACL providers between ACLs built within this context
+
+    Bulk builds are expected to build many ACLs, so providers should load all
+    data they may need at once, instead of loading only data for given roles.
+    """
+    if getattr(_build_data, "data", None) is not None:
+        yield
+        return
+
+    _build_data.data = {}
+    _build_data.is_bulk = is_bulk
+    try:
+        yield
+    finally:
+        _build_data.data = None
+        _build_data.is_bulk = False
+
+
+def is_bulk_build():
+    return getattr(_build_data, "is_bulk", False)
+
+
+def get_build_data(key, load):
+    """Returns data loaded by load, reusing it if ACLs are built in bulk"""
+    data = getattr(_build_data, "data", None)
+    if data is None:
+        return load()
+    if key not in data:
+        data[key] = load()
+    return data[key]
@@ -1,22 +1,35 @@
-from django.core.cache import cache
+from django.db import transaction
 
 from . import ACL_CACHE
-from ..cache.versions import invalidate_cache
+from ..cache.versionedcache import VersionedCache
+from ..conf import settings
+
+acl_cache = VersionedCache(ACL_CACHE)
 
 
 def get_acl_cache(user, cache_versions):
-    key = get_cache_key(user, cache_versions)
-    return cache.get(key)
+    return acl_cache.get(cache_versions, user.acl_key)
 
 
 def set_acl_cache(user, cache_versions, user_acl):
-    key = get_cache_key(user, cache_versions)
-    cache.set(key, user_acl)
+    acl_cache.set(cache_versions, user_acl, user.acl_key)
+
+
+def get_or_build_acl_cache(user, cache_versions, build_acl):
+    return acl_cache.get_or_build(cache_versions, build_acl, user.acl_key)
 
 
 def get_cache_key(user, cache_versions):
-    return "acl_%s_%s" % (user.acl_key, cache_versions[ACL_CACHE])
+    return acl_cache.get_cache_key(cache_versions, user.acl_key)
 
 
 def clear_acl_cache():
-    invalidate_cache(ACL_CACHE)
+    acl_cache.invalidate()
+    if settings.MISAGO_ACL_CACHE_REWARM:
+        transaction.on_commit(schedule_acl_cache_rewarm)
+
+
+def schedule_acl_cache_rewarm():
+    from .tasks import rewarm_acl_cache
+
+    rewarm_acl_cache.delay()
@@ -0,0 +1,75 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ...buildacl import build_acl, build_acls, build_providers_acl
+from ...tasks import get_most_common_acl_users
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares time and number of queries needed to build ACLs for most common "
+        "roles sets separately by each provider, with data shared by providers, "
+        "and in bulk."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--roles-sets",
+            dest="roles_sets",
+            default=100,
+            type=int,
+            help="Number of most common roles sets to build ACLs for.",
+        )
+        parser.add_argument(
+            "--repeat",
+            dest="repeat",
+            default=3,
+            type=int,
+            help="Number of times each build is repeated.",
+        )
+
+    def handle(self, *args, **options):
+        roles_sets = [
+            user.get_roles()
+            for user in get_most_common_acl_users(options["roles_sets"])
+        ]
+
+        self.stdout.write(
+            "Building ACLs for %s roles sets %s times...\n"
+            % (len(roles_sets), options["repeat"])
+        )
+
+        builds = [
+            (
+                "per-provider",
+                lambda: [build_providers_acl(roles) for roles in roles_sets],
+            ),
+            ("shared", lambda: [build_acl(roles) for roles in roles_sets]),
+            ("bulk", lambda: build_acls(roles_sets)),
+        ]
+
+        results = {}
+        for name, build in builds:
+            results[name] = self.benchmark(build, options["repeat"])
+            if results[name]["acls"] != results["per-provider"]["acls"]:
+                self.stderr.write("%s build returned different ACLs!" % name)
+
+        for name, result in results.items():
+            self.stdout.write(
+                "%-14s %8.3fs %8s queries" % (name, result["time"], result["queries"])
+            )
+
+    def benchmark(self, build, repeat):
+        best_time = None
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as queries:
+                start_time = time.perf_counter()
+                acls = build()
+                build_time = time.perf_counter() - start_time
+            if best_time is None or build_time < best_time:
+                best_time = build_time
+
+        return {"acls": acls, "time": best_time, "queries": len(queries)}
@@ -0,0 +1,89 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from ....cache.versions import get_cache_versions
+from ....core.management.progressbar import show_progress
+from ...buildacl import build_acls
+from ...cache import acl_cache
+from ...tasks import get_most_common_acl_users
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Builds ACLs for all roles sets used by users and stores them in cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            dest="processes",
+            default=os.cpu_count() or 1,
+            type=int,
+            help="Number of worker processes building ACLs.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            dest="chunk_size",
+            default=20,
+            type=int,
+            help="Number of ACLs built by worker process at once.",
+        )
+
+    def handle(self, *args, **options):
+        cache_versions = get_cache_versions()
+        users = get_most_common_acl_users(None)
+
+        acls_to_build = len(users)
+        self.stdout.write("Building %s ACLs...\n" % acls_to_build)
+
+        built_count = 0
+        show_progress(self, built_count, acls_to_build)
+        start_time = time.time()
+
+        # Anonymous user has no database row, so its ACL is built by command
+        anonymous_user = users.pop(0)
+        acl = build_acls([anonymous_user.get_roles()])[0]
+        acl_cache.set(cache_versions, acl, anonymous_user.acl_key)
+
+        built_count += 1
+        show_progress(self, built_count, acls_to_build, start_time)
+
+        chunks = get_chunks([user.pk for user in users], options["chunk_size"])
+        for users_acls in self.build_chunks(chunks, options["processes"]):
+            for acl_key, acl in users_acls:
+                acl_cache.set(cache_versions, acl, acl_key)
+
+            built_count += len(users_acls)
+            show_progress(self, built_count, acls_to_build, start_time)
+
+        self.stdout.write("\n\nBuilt and cached %s ACLs" % built_count)
+
+    def build_chunks(self, chunks, processes):
+        if processes < 2 or len(chunks) < 2:
+            for chunk in chunks:
+                yield build_users_acls(chunk)
+            return
+
+        # Worker processes can't share database connections with this process.
+        # Workers are forked because they need Django to be set up.
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=processes, mp_context=multiprocessing.get_context("fork")
+        ) as executor:
+            yield from executor.map(build_users_acls, chunks)
+
+
+def get_chunks(items, chunk_size):
+    return [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+
+def build_users_acls(users_ids):
+    users = list(User.objects.filter(pk__in=users_ids))
+    acls = build_acls([user.get_roles() for user in users])
+    return [(user.acl_key, acl) for user, acl in zip(users, acls)]
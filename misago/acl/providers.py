@@ -4,13 +4,14 @@ from ..conf import settings
 
 _NOT_INITIALIZED_ERROR = (
     "PermissionProviders instance has to load providers with load() "
-    "before get_obj_type_annotators(), get_user_acl_serializers(), "
-    "list() or dict() methods will be available."
+    "before get_obj_type_annotators(), get_type_batch_annotators(), "
+    "get_user_acl_serializers(), list() or dict() methods will be available."
 )
 
 _ALREADY_INITIALIZED_ERROR = (
     "PermissionProviders instance has already loaded providers and "
-    "acl_annotator or user_acl_serializer are no longer available."
+    "acl_annotator, batch_acl_annotator or user_acl_serializer are no longer "
+    "available."
 )
 
 
@@ -23,6 +24,7 @@ class PermissionProviders:
         self._providers_dict = {}
 
         self._annotators = {}
+        self._batch_annotators = {}
         self._user_acl_serializers = []
 
     def load(self):
@@ -31,6 +33,7 @@ class PermissionProviders:
 
         self._register_providers()
         self._coerce_dict_values_to_tuples(self._annotators)
+        self._coerce_dict_values_to_tuples(self._batch_annotators)
         self._user_acl_serializers = tuple(self._user_acl_serializers)
         self._initialized = True
 
@@ -50,6 +53,13 @@ class PermissionProviders:
         """registers ACL annotator for specified types"""
         assert not self._initialized, _ALREADY_INITIALIZED_ERROR
         self._annotators.setdefault(hashable_type, []).append(func)
+        self._batch_annotators.setdefault(hashable_type, []).append(annotate_each(func))
+
+    def batch_acl_annotator(self, hashable_type, func):
+        """registers ACL annotator that annotates list of objects of same type"""
+        assert not self._initialized, _ALREADY_INITIALIZED_ERROR
+        self._annotators.setdefault(hashable_type, []).append(annotate_single(func))
+        self._batch_annotators.setdefault(hashable_type, []).append(func)
 
     def user_acl_serializer(self, func):
         """registers ACL serializer for specified types"""
@@ -60,6 +70,10 @@ class PermissionProviders:
         assert self._initialized, _NOT_INITIALIZED_ERROR
         return self._annotators.get(obj.__class__, [])
 
+    def get_type_batch_annotators(self, hashable_type):
+        assert self._initialized, _NOT_INITIALIZED_ERROR
+        return self._batch_annotators.get(hashable_type, [])
+
     def get_user_acl_serializers(self):
         assert self._initialized, _NOT_INITIALIZED_ERROR
         return self._user_acl_serializers
@@ -73,4 +87,19 @@ class PermissionProviders:
         return self._providers_dict
 
 
+def annotate_each(annotator):
+    def batch_annotator(user_acl, objs):
+        for obj in objs:
+            annotator(user_acl, obj)
+
+    return batch_annotator
+
+
+def annotate_single(batch_annotator):
+    def annotator(user_acl, obj):
+        batch_annotator(user_acl, [obj])
+
+    return annotator
+
+
 providers = PermissionProviders()
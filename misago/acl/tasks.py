@@ -0,0 +1,37 @@
+from celery import shared_task
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+
+from ..cache.versions import get_cache_versions
+from ..conf import settings
+from ..users.models import AnonymousUser
+from .useracl import get_user_acl
+
+User = get_user_model()
+
+
+@shared_task
+def rewarm_acl_cache():
+    cache_versions = get_cache_versions()
+    for user in get_most_common_acl_users(settings.MISAGO_ACL_CACHE_REWARM):
+        get_user_acl(user, cache_versions)
+
+
+def get_most_common_acl_users(limit):
+    """Returns anonymous user and users representing most common ACL keys."""
+    users = [AnonymousUser()]
+
+    acl_keys = (
+        User.objects.filter(is_active=True, acl_key__isnull=False)
+        .values("acl_key")
+        .annotate(users=Count("pk"))
+        .order_by("-users")
+        .values_list("acl_key", flat=True)[:limit]
+    )
+
+    for acl_key in acl_keys:
+        user = User.objects.filter(is_active=True, acl_key=acl_key).first()
+        if user:
+            users.append(user)
+
+    return users
@@ -23,6 +23,8 @@ class patch_user_acl(ContextDecorator, ExitStack):
     def patched_get_user_acl(self, user, cache_versions):
         user_acl = get_user_acl(user, cache_versions)
         self.apply_acl_patches(user, user_acl)
+        # Patched ACL is no longer same as other ACLs with this key
+        user_acl.pop("acl_key", None)
         return user_acl
 
     def apply_acl_patches(self, user, user_acl):
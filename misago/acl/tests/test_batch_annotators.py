@@ -0,0 +1,75 @@
+from unittest.mock import Mock
+
+from ..objectacl import add_acl_to_obj
+from ..providers import PermissionProviders
+
+
+class TestType:
+    pass
+
+
+def test_getter_returns_registered_type_batch_annotator():
+    def test_batch_annotator():
+        pass
+
+    providers = PermissionProviders()
+    providers.batch_acl_annotator(TestType, test_batch_annotator)
+    providers.load()
+
+    assert test_batch_annotator in providers.get_type_batch_annotators(TestType)
+
+
+def test_batch_annotator_is_called_for_single_object():
+    batch_annotator = Mock()
+    obj = TestType()
+
+    providers = PermissionProviders()
+    providers.batch_acl_annotator(TestType, batch_annotator)
+    providers.load()
+
+    for annotator in providers.get_obj_type_annotators(obj):
+        annotator({}, obj)
+
+    batch_annotator.assert_called_once_with({}, [obj])
+
+
+def test_single_object_annotator_is_called_for_each_object_in_batch():
+    annotator = Mock()
+    objs = [TestType(), TestType()]
+
+    providers = PermissionProviders()
+    providers.acl_annotator(TestType, annotator)
+    providers.load()
+
+    for batch_annotator in providers.get_type_batch_annotators(TestType):
+        batch_annotator({}, objs)
+
+    assert annotator.call_count == 2
+
+
+def test_annotators_are_called_in_registration_order():
+    calls = []
+
+    providers = PermissionProviders()
+    providers.acl_annotator(TestType, lambda *_: calls.append("first"))
+    providers.batch_acl_annotator(TestType, lambda *_: calls.append("second"))
+    providers.load()
+
+    for batch_annotator in providers.get_type_batch_annotators(TestType):
+        batch_annotator({}, [TestType()])
+
+    assert calls == ["first", "second"]
+
+
+def test_list_of_objects_is_annotated_with_one_call_per_type(mocker):
+    batch_annotator = Mock()
+    providers = PermissionProviders()
+    providers.batch_acl_annotator(TestType, batch_annotator)
+    providers.load()
+    mocker.patch("misago.acl.objectacl.providers", providers)
+
+    objs = [TestType(), TestType(), TestType()]
+    add_acl_to_obj({}, objs)
+
+    batch_annotator.assert_called_once_with({}, objs)
+    assert all(obj.acl == {} for obj in objs)
@@ -0,0 +1,60 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ..buildacl import build_acl, build_acls, build_providers_acl
+
+
+def count_queries(build):
+    with CaptureQueriesContext(connection) as queries:
+        result = build()
+    return result, len(queries)
+
+
+def test_acl_built_with_shared_data_is_same_as_built_by_providers(
+    anonymous_user, user, superuser
+):
+    for roles in (anonymous_user.get_roles(), user.get_roles(), superuser.get_roles()):
+        assert build_acl(roles) == build_providers_acl(roles)
+
+
+def test_acls_built_in_bulk_are_same_as_built_separately(
+    anonymous_user, user, superuser
+):
+    roles_sets = [
+        anonymous_user.get_roles(),
+        user.get_roles(),
+        superuser.get_roles(),
+    ]
+
+    assert build_acls(roles_sets) == [build_acl(roles) for roles in roles_sets]
+
+
+def test_building_acl_with_shared_data_runs_less_queries(user):
+    roles = user.get_roles()
+    _, providers_queries = count_queries(lambda: build_providers_acl(roles))
+    _, shared_queries = count_queries(lambda: build_acl(roles))
+    assert shared_queries < providers_queries
+
+
+def test_building_acls_in_bulk_runs_less_queries(anonymous_user, user):
+    roles_sets = [anonymous_user.get_roles(), user.get_roles()]
+    _, separate_queries = count_queries(
+        lambda: [build_acl(roles) for roles in roles_sets]
+    )
+    _, bulk_queries = count_queries(lambda: build_acls(roles_sets))
+    assert bulk_queries < separate_queries
+
+
+def test_benchmark_command_reports_builds_times(user):
+    stdout = StringIO()
+    stderr = StringIO()
+    call_command("benchmarkaclbuild", repeat=1, stdout=stdout, stderr=stderr)
+
+    output = stdout.getvalue()
+    assert "per-provider" in output
+    assert "shared" in output
+    assert "bulk" in output
+    assert not stderr.getvalue()
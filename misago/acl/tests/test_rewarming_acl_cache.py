@@ -0,0 +1,52 @@
+from django.test import override_settings
+
+from ..cache import clear_acl_cache
+from ..tasks import get_most_common_acl_users, rewarm_acl_cache
+
+
+def test_most_common_acl_users_include_anonymous_user(db):
+    users = get_most_common_acl_users(0)
+    assert len(users) == 1
+    assert users[0].is_anonymous
+
+
+def test_most_common_acl_users_include_user_for_each_acl_key(
+    user, other_user, staffuser
+):
+    users = get_most_common_acl_users(5)
+    acl_keys = [u.acl_key for u in users]
+    assert acl_keys[0] == "anonymous"
+    assert acl_keys[1] == user.acl_key
+    assert staffuser.acl_key in acl_keys
+    assert len(acl_keys) == len(set(acl_keys))
+
+
+def test_most_common_acl_users_are_limited(user, other_user, staffuser):
+    users = get_most_common_acl_users(1)
+    assert [u.acl_key for u in users] == ["anonymous", user.acl_key]
+
+
+@override_settings(MISAGO_ACL_CACHE_REWARM=5)
+def test_rewarming_acl_cache_builds_acls(mocker, user):
+    get_user_acl = mocker.patch("misago.acl.tasks.get_user_acl")
+    rewarm_acl_cache()
+    assert get_user_acl.call_count == 2
+
+
+@override_settings(MISAGO_ACL_CACHE_REWARM=5)
+def test_clearing_acl_cache_schedules_rewarm(
+    mocker, db, django_capture_on_commit_callbacks
+):
+    delay = mocker.patch("misago.acl.tasks.rewarm_acl_cache.delay")
+    with django_capture_on_commit_callbacks(execute=True):
+        clear_acl_cache()
+    delay.assert_called_once()
+
+
+def test_clearing_acl_cache_doesnt_schedule_rewarm_if_its_disabled(
+    mocker, db, django_capture_on_commit_callbacks
+):
+    delay = mocker.patch("misago.acl.tasks.rewarm_acl_cache.delay")
+    with django_capture_on_commit_callbacks(execute=True):
+        clear_acl_cache()
+    delay.assert_not_called()
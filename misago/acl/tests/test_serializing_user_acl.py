@@ -1,5 +1,8 @@
 import json
 
+from django.test import override_settings
+
+from .. import useracl
 from ..useracl import get_user_acl, serialize_user_acl
 
 
@@ -12,3 +15,54 @@ def test_user_acl_is_json_serializeable(cache_versions, user):
     acl = get_user_acl(user, cache_versions)
     serialized_acl = serialize_user_acl(acl)
     assert json.dumps(serialized_acl)
+
+
+def test_serialized_user_acl_excludes_cache_versions_and_acl_key(cache_versions, user):
+    acl = get_user_acl(user, cache_versions)
+    serialized_acl = serialize_user_acl(acl)
+    assert "cache_versions" not in serialized_acl
+    assert "acl_key" not in serialized_acl
+
+
+def test_serialized_user_acl_includes_user_fields(cache_versions, user):
+    acl = get_user_acl(user, cache_versions)
+    serialized_acl = serialize_user_acl(acl)
+    assert serialized_acl["user_id"] == user.id
+    assert serialized_acl["is_authenticated"] is True
+    assert serialized_acl["is_anonymous"] is False
+
+
+@override_settings(MISAGO_VERSIONED_CACHE_LOCAL_SIZE=10)
+def test_serialized_acl_is_reused_for_users_with_same_acl_key(
+    mocker, cache_versions, user, other_user
+):
+    serializer = mocker.spy(useracl, "build_serialized_acl")
+    user_acl = get_user_acl(user, cache_versions)
+    other_user_acl = get_user_acl(other_user, cache_versions)
+    assert user_acl["acl_key"] == other_user_acl["acl_key"]
+
+    serialized_acl = serialize_user_acl(user_acl)
+    other_serialized_acl = serialize_user_acl(other_user_acl)
+    serializer.assert_called_once()
+
+    assert serialized_acl["user_id"] == user.id
+    assert other_serialized_acl["user_id"] == other_user.id
+    assert serialized_acl["categories"] == other_serialized_acl["categories"]
+
+
+@override_settings(MISAGO_VERSIONED_CACHE_LOCAL_SIZE=10)
+def test_serializing_acl_without_acl_key_skips_cache(mocker, cache_versions, user):
+    serializer = mocker.spy(useracl, "build_serialized_acl")
+    user_acl = get_user_acl(user, cache_versions)
+    user_acl.pop("acl_key")
+
+    serialize_user_acl(user_acl)
+    serialize_user_acl(user_acl)
+    assert serializer.call_count == 2
+
+
+def test_serializing_acl_doesnt_change_user_acl(cache_versions, user):
+    acl = get_user_acl(user, cache_versions)
+    categories = acl["categories"].copy()
+    serialize_user_acl(acl)
+    assert acl["categories"] == categories
@@ -0,0 +1,48 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from ..cache import acl_cache
+from ..useracl import get_user_acl
+
+
+def call_warmaclcache(**options):
+    stdout = StringIO()
+    call_command("warmaclcache", stdout=stdout, **options)
+    return stdout.getvalue()
+
+
+def test_command_caches_acl_for_anonymous_user_and_each_acl_key(
+    mocker, cache_versions, user, other_user, staffuser
+):
+    mocker.patch(
+        "misago.acl.management.commands.warmaclcache.get_cache_versions",
+        return_value=cache_versions,
+    )
+    acl_cache_set = mocker.spy(acl_cache, "set")
+
+    output = call_warmaclcache(processes=1)
+    assert "Built and cached 3 ACLs" in output
+
+    cached_acls = {call.args[2]: call.args[1] for call in acl_cache_set.call_args_list}
+    assert set(cached_acls) == {"anonymous", user.acl_key, staffuser.acl_key}
+
+    user_acl = get_user_acl(user, cache_versions)
+    for key, value in cached_acls[user.acl_key].items():
+        assert user_acl[key] == value
+
+
+@pytest.mark.django_db(transaction=True, serialized_rollback=True)
+def test_command_builds_acls_in_worker_processes(
+    mocker, cache_versions, user, staffuser
+):
+    mocker.patch(
+        "misago.acl.management.commands.warmaclcache.get_cache_versions",
+        return_value=cache_versions,
+    )
+    acl_cache_set = mocker.spy(acl_cache, "set")
+
+    output = call_warmaclcache(processes=2, chunk_size=1)
+    assert "Built and cached 3 ACLs" in output
+    assert acl_cache_set.call_count == 3
@@ -1,28 +1,70 @@
 import copy
 
-from . import buildacl
-from .cache import get_acl_cache, set_acl_cache
+from . import ACL_CACHE, buildacl
+from ..cache.versionedcache import VersionedCache
+from .cache import get_or_build_acl_cache
 from .providers import providers
 
+USER_FIELDS = (
+    "user_id",
+    "is_authenticated",
+    "is_anonymous",
+    "is_staff",
+    "is_superuser",
+)
+
+serialized_acl_cache = VersionedCache(ACL_CACHE)
+
 
 def get_user_acl(user, cache_versions):
-    user_acl = get_acl_cache(user, cache_versions)
-    if user_acl is None:
-        user_acl = buildacl.build_acl(user.get_roles())
-        set_acl_cache(user, cache_versions, user_acl)
+    user_acl = get_or_build_acl_cache(
+        user, cache_versions, lambda: buildacl.build_acl(user.get_roles())
+    )
+    # Cached ACL is shared with other users, copy it before adding user's details
+    user_acl = user_acl.copy()
+    user_acl["acl_key"] = user.acl_key
     user_acl["user_id"] = user.id
     user_acl["is_authenticated"] = bool(user.is_authenticated)
     user_acl["is_anonymous"] = bool(user.is_anonymous)
     user_acl["is_staff"] = user.is_staff
     user_acl["is_superuser"] = user.is_superuser
-    user_acl["cache_versions"] = cache_versions.copy()
+    user_acl["cache_versions"] = cache_versions
     return user_acl
 
 
 def serialize_user_acl(user_acl):
-    """serialize authenticated user's ACL"""
-    serialized_acl = copy.deepcopy(user_acl)
-    serialized_acl.pop("cache_versions")
+    """serialize authenticated user's ACL
+
+    Serialized ACL is cached for ACL key, so ACL serializers are only called with
+    permissions shared by all users with same roles and can't rely on user fields.
+    ACLs that were changed after get_user_acl returned them should have their
+    "acl_key" removed to be serialized from scratch.
+    """
+    acl_key = user_acl.get("acl_key")
+    if acl_key is None:
+        serialized_acl = build_serialized_acl(user_acl)
+    else:
+        serialized_acl = serialized_acl_cache.get_or_build(
+            user_acl["cache_versions"],
+            lambda: build_serialized_acl(user_acl),
+            "%s_serialized" % acl_key,
+        ).copy()
+
+    for field in USER_FIELDS:
+        if field in user_acl:
+            serialized_acl[field] = user_acl[field]
+
+    return serialized_acl
+
+
+def build_serialized_acl(user_acl):
+    serialized_acl = copy.deepcopy(
+        {
+            key: value
+            for key, value in user_acl.items()
+            if key not in USER_FIELDS and key not in ("acl_key", "cache_versions")
+        }
+    )
 
     for serializer in providers.get_user_acl_serializers():
         serializer(serialized_acl)
@@ -6,6 +6,7 @@ from django.core.cache import cache
 from django.utils import timezone
 
 from . import render
+from ...threads.admin.tasks import get_posts_checksums_audit
 from ...threads.models import Post, Thread, Attachment
 from ...users.models import DataDownload
 
@@ -23,6 +24,7 @@ def admin_index(request):
         "debug": check_debug_status(),
         "https": check_https(request),
         "inactive_users": check_inactive_users(),
+        "posts_checksums": check_posts_checksums(),
     }
 
     return render(
@@ -70,6 +72,11 @@ def check_inactive_users():
     return {"is_ok": count <= 10, "count": count}
 
 
+def check_posts_checksums():
+    audit = get_posts_checksums_audit()
+    return {"is_ok": not audit or not audit["invalid"], "audit": audit}
+
+
 def count_db_items():
     return {
         "attachments": Attachment.objects.count(),
@@ -0,0 +1,92 @@
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter
+
+
+class CacheMetrics:
+    """Counts hits, misses and rebuilds of versioned caches in current process."""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.caches = {}
+
+    def get_counters(self, cache_name):
+        counters = self.caches.get(cache_name)
+        if counters is None:
+            counters = self.caches[cache_name] = {
+                "hits": 0,
+                "misses": 0,
+                "rebuilds": 0,
+                "rebuild_time": 0.0,
+                "max_rebuild_time": 0.0,
+            }
+        return counters
+
+    def record_hit(self, cache_name):
+        with self.lock:
+            self.get_counters(cache_name)["hits"] += 1
+
+    def record_miss(self, cache_name):
+        with self.lock:
+            self.get_counters(cache_name)["misses"] += 1
+
+    def record_rebuild(self, cache_name, duration):
+        with self.lock:
+            counters = self.get_counters(cache_name)
+            counters["rebuilds"] += 1
+            counters["rebuild_time"] += duration
+            if duration > counters["max_rebuild_time"]:
+                counters["max_rebuild_time"] = duration
+
+    @contextmanager
+    def measure_rebuild(self, cache_name):
+        start = perf_counter()
+        yield
+        self.record_rebuild(cache_name, perf_counter() - start)
+
+    def get_metrics(self):
+        with self.lock:
+            return [
+                dict(cache=cache_name, **counters)
+                for cache_name, counters in sorted(self.caches.items())
+            ]
+
+    def reset(self):
+        with self.lock:
+            self.caches = {}
+
+
+cache_metrics = CacheMetrics()
+
+
+PROMETHEUS_METRICS = [
+    ("hits", "misago_cache_hits_total", "counter", "Number of cache hits."),
+    ("misses", "misago_cache_misses_total", "counter", "Number of cache misses."),
+    ("rebuilds", "misago_cache_rebuilds_total", "counter", "Number of rebuilds."),
+    (
+        "rebuild_time",
+        "misago_cache_rebuild_seconds_total",
+        "counter",
+        "Total time spent on rebuilding cached values.",
+    ),
+    (
+        "max_rebuild_time",
+        "misago_cache_rebuild_seconds_max",
+        "gauge",
+        "Longest time spent on rebuilding cached value.",
+    ),
+]
+
+
+def render_prometheus_metrics(metrics):
+    """Renders metrics in the Prometheus text exposition format."""
+    lines = []
+    for counter, name, metric_type, help_text in PROMETHEUS_METRICS:
+        lines.append("# HELP %s %s" % (name, help_text))
+        lines.append("# TYPE %s %s" % (name, metric_type))
+        for cache_metrics_row in metrics:
+            lines.append(
+                '%s{cache="%s"} %s'
+                % (name, cache_metrics_row["cache"], cache_metrics_row[counter])
+            )
+    return "\n".join(lines) + "\n"
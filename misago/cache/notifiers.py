@@ -0,0 +1,103 @@
+import os
+
+import psycopg2
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection, transaction
+
+from .utils import generate_version_string
+
+
+class CacheNotifier:
+    """Propagates cache versions changes through Django's cache.
+
+    Invalidation stores new random token in the cache. Processes poll this key and
+    reload their cache versions when the token differs from one they've seen.
+    """
+
+    cache_key = "misago_cache_versions_token"
+
+    def __init__(self, cache_backend=None):
+        self.cache = cache_backend or cache
+
+    def is_shared(self):
+        """Returns False if cache is not shared with other processes"""
+        cache_backend = self.cache
+        if cache_backend is cache:
+            cache_backend = caches[DEFAULT_CACHE_ALIAS]
+        return not isinstance(cache_backend, (DummyCache, LocMemCache))
+
+    def get_token(self):
+        return self.cache.get(self.cache_key)
+
+    def notify(self):
+        transaction.on_commit(self.set_new_token)
+
+    def set_new_token(self):
+        self.cache.set(self.cache_key, generate_version_string(), None)
+
+
+class PostgresNotifier:
+    """Propagates cache versions changes through PostgreSQL's LISTEN/NOTIFY.
+
+    Every process opens dedicated connection listening on the channel. Postgres
+    delivers notifications only after the transaction that sent them is committed.
+    """
+
+    channel = "misago_cache_versions"
+
+    def __init__(self):
+        self.pid = None
+        self.listener = None
+        self.connections = 0
+        self.notifications = 0
+
+    def is_shared(self):
+        return True
+
+    def get_token(self):
+        try:
+            listener = self.get_listener()
+            listener.poll()
+        except psycopg2.Error:
+            self.close_listener()
+            return None
+
+        if listener.notifies:
+            self.notifications += len(listener.notifies)
+            listener.notifies.clear()
+
+        # Notifications sent while we were disconnected are lost, so new listener
+        # connection also produces new token
+        return "%s_%s" % (self.connections, self.notifications)
+
+    def get_listener(self):
+        if self.listener and (self.listener.closed or self.pid != os.getpid()):
+            self.listener = None
+
+        if not self.listener:
+            params = connection.get_connection_params()
+            listener = psycopg2.connect(**params)
+            listener.autocommit = True
+            with listener.cursor() as cursor:
+                cursor.execute("LISTEN %s" % self.channel)
+
+            self.pid = os.getpid()
+            self.listener = listener
+            self.connections += 1
+
+        return self.listener
+
+    def close_listener(self):
+        if self.listener and self.pid == os.getpid():
+            try:
+                self.listener.close()
+            except psycopg2.Error:
+                pass
+
+        self.listener = None
+
+    def notify(self):
+        with connection.cursor() as cursor:
+            cursor.execute("NOTIFY %s" % self.channel)
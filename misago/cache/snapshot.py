@@ -0,0 +1,70 @@
+from threading import Lock
+from time import monotonic
+
+from django.utils.module_loading import import_string
+
+from ..conf import settings
+
+
+class CacheVersionsSnapshot:
+    """Process-local copy of cache versions.
+
+    Snapshot is reloaded from the database only after notifier reports that some
+    cache version was changed. Notifier is checked at most once per
+    MISAGO_CACHE_VERSIONS_MAX_STALENESS seconds. Versions are loaded on every call
+    if there's no notifier or notifier can't reach other processes.
+    """
+
+    def __init__(self, loader, notifier=None):
+        self.loader = loader
+        self._notifier = notifier
+        self.lock = Lock()
+        self.versions = None
+        self.token = None
+        self.checked_at = None
+
+    @property
+    def notifier(self):
+        if self._notifier is None and settings.MISAGO_CACHE_VERSIONS_NOTIFIER:
+            notifier_class = import_string(settings.MISAGO_CACHE_VERSIONS_NOTIFIER)
+            notifier = notifier_class()
+            # Other processes would never see changes made by this one
+            self._notifier = notifier if notifier.is_shared() else False
+        return self._notifier or None
+
+    def get(self):
+        notifier = self.notifier
+        if not notifier:
+            return self.loader()
+
+        with self.lock:
+            now = monotonic()
+            if self.is_fresh(now):
+                return self.versions.copy()
+
+            self.checked_at = now
+            token = notifier.get_token()
+            if self.versions is None or token is None or token != self.token:
+                # Token is read before the versions so change made between two
+                # reads is picked up on next check instead of being missed
+                self.versions = self.loader()
+                self.token = token
+
+            return self.versions.copy()
+
+    def is_fresh(self, now):
+        if self.versions is None or self.checked_at is None:
+            return False
+
+        return now - self.checked_at < settings.MISAGO_CACHE_VERSIONS_MAX_STALENESS
+
+    def clear(self):
+        with self.lock:
+            self.versions = None
+            self.token = None
+            self.checked_at = None
+
+    def notify(self):
+        self.clear()
+        if self.notifier:
+            self.notifier.notify()
@@ -0,0 +1,95 @@
+import pytest
+
+from ..metrics import CacheMetrics, cache_metrics, render_prometheus_metrics
+from ..versionedcache import VersionedCache
+
+
+@pytest.fixture
+def metrics():
+    return CacheMetrics()
+
+
+@pytest.fixture(autouse=True)
+def reset_cache_metrics():
+    cache_metrics.reset()
+    yield
+    cache_metrics.reset()
+
+
+def test_metrics_count_hits_and_misses_per_cache(metrics):
+    metrics.record_hit("acl")
+    metrics.record_hit("acl")
+    metrics.record_miss("acl")
+    metrics.record_miss("settings")
+
+    assert metrics.get_metrics() == [
+        {
+            "cache": "acl",
+            "hits": 2,
+            "misses": 1,
+            "rebuilds": 0,
+            "rebuild_time": 0,
+            "max_rebuild_time": 0,
+        },
+        {
+            "cache": "settings",
+            "hits": 0,
+            "misses": 1,
+            "rebuilds": 0,
+            "rebuild_time": 0,
+            "max_rebuild_time": 0,
+        },
+    ]
+
+
+def test_metrics_sum_rebuild_times_and_track_longest_rebuild(metrics):
+    metrics.record_rebuild("acl", 0.5)
+    metrics.record_rebuild("acl", 1.5)
+    metrics.record_rebuild("acl", 1)
+
+    acl_metrics = metrics.get_metrics()[0]
+    assert acl_metrics["rebuilds"] == 3
+    assert acl_metrics["rebuild_time"] == 3
+    assert acl_metrics["max_rebuild_time"] == 1.5
+
+
+def test_metrics_measure_rebuild_duration(metrics):
+    with metrics.measure_rebuild("acl"):
+        pass
+
+    acl_metrics = metrics.get_metrics()[0]
+    assert acl_metrics["rebuilds"] == 1
+    assert acl_metrics["rebuild_time"] >= 0
+
+
+def test_metrics_can_be_reset(metrics):
+    metrics.record_hit("acl")
+    metrics.reset()
+    assert metrics.get_metrics() == []
+
+
+def test_metrics_are_rendered_in_prometheus_format(metrics):
+    metrics.record_hit("acl")
+    metrics.record_rebuild("acl", 0.25)
+
+    result = render_prometheus_metrics(metrics.get_metrics())
+    assert "# TYPE misago_cache_hits_total counter\n" in result
+    assert 'misago_cache_hits_total{cache="acl"} 1\n' in result
+    assert 'misago_cache_misses_total{cache="acl"} 0\n' in result
+    assert 'misago_cache_rebuilds_total{cache="acl"} 1\n' in result
+    assert 'misago_cache_rebuild_seconds_total{cache="acl"} 0.25\n' in result
+
+
+def test_versioned_cache_records_hits_misses_and_rebuilds(mocker, cache_version):
+    cache_versions = {cache_version.cache: cache_version.version}
+    versioned_cache = VersionedCache(cache_version.cache)
+
+    mocker.patch("django.core.cache.cache.get", side_effect=[None, "value"])
+    versioned_cache.get_or_build(cache_versions, lambda: "value")
+    versioned_cache.get(cache_versions)
+
+    test_metrics = cache_metrics.get_metrics()[0]
+    assert test_metrics["cache"] == cache_version.cache
+    assert test_metrics["hits"] == 1
+    assert test_metrics["misses"] == 1
+    assert test_metrics["rebuilds"] == 1
@@ -0,0 +1,157 @@
+import time
+from unittest.mock import Mock
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import override_settings
+
+from ..models import CacheVersion
+from ..notifiers import CacheNotifier, PostgresNotifier
+from ..snapshot import CacheVersionsSnapshot
+from ..versions import get_cache_versions, invalidate_cache
+
+
+@pytest.fixture
+def shared_cache():
+    return LocMemCache("misago-cache-versions-test", {})
+
+
+@pytest.fixture
+def notifier(shared_cache):
+    return CacheNotifier(shared_cache)
+
+
+def create_worker(notifier):
+    return CacheVersionsSnapshot(get_cache_versions, notifier)
+
+
+def test_snapshot_loads_cache_versions_from_database(cache_version, notifier):
+    snapshot = create_worker(notifier)
+    assert snapshot.get()[cache_version.cache] == cache_version.version
+
+
+def test_snapshot_reuses_versions_until_notifier_token_changes(notifier):
+    notifier.set_new_token()
+    loader = Mock(return_value={"test_cache": "abcdefgh"})
+    snapshot = CacheVersionsSnapshot(loader, notifier)
+
+    snapshot.get()
+    snapshot.get()
+    loader.assert_called_once()
+
+    notifier.set_new_token()
+    snapshot.get()
+    assert loader.call_count == 2
+
+
+def test_snapshot_reloads_versions_if_notifier_has_no_token():
+    notifier = Mock(get_token=Mock(return_value=None))
+    loader = Mock(return_value={"test_cache": "abcdefgh"})
+    snapshot = CacheVersionsSnapshot(loader, notifier)
+
+    snapshot.get()
+    snapshot.get()
+    assert loader.call_count == 2
+
+
+@override_settings(MISAGO_CACHE_VERSIONS_MAX_STALENESS=60)
+def test_snapshot_skips_notifier_check_within_staleness_window():
+    notifier = Mock(get_token=Mock(return_value="token"))
+    loader = Mock(return_value={"test_cache": "abcdefgh"})
+    snapshot = CacheVersionsSnapshot(loader, notifier)
+
+    snapshot.get()
+    snapshot.get()
+    notifier.get_token.assert_called_once()
+    loader.assert_called_once()
+
+
+@override_settings(MISAGO_CACHE_VERSIONS_NOTIFIER=None)
+def test_snapshot_without_notifier_loads_versions_on_every_call():
+    loader = Mock(return_value={"test_cache": "abcdefgh"})
+    snapshot = CacheVersionsSnapshot(loader)
+
+    snapshot.get()
+    snapshot.get()
+    assert loader.call_count == 2
+
+
+@override_settings(
+    MISAGO_CACHE_VERSIONS_NOTIFIER="misago.cache.notifiers.CacheNotifier",
+    MISAGO_CACHE_VERSIONS_MAX_STALENESS=60,
+)
+def test_snapshot_loads_versions_on_every_call_if_cache_is_not_shared():
+    loader = Mock(return_value={"test_cache": "abcdefgh"})
+    snapshot = CacheVersionsSnapshot(loader)
+
+    snapshot.get()
+    snapshot.get()
+    assert snapshot.notifier is None
+    assert loader.call_count == 2
+
+
+def test_cache_notifier_using_local_memory_cache_is_not_shared(notifier):
+    assert not notifier.is_shared()
+
+
+def test_cache_notifier_using_other_cache_is_shared():
+    assert CacheNotifier(Mock()).is_shared()
+
+
+def test_snapshot_returns_copy_of_versions(notifier):
+    notifier.set_new_token()
+    snapshot = CacheVersionsSnapshot(Mock(return_value={"test_cache": "a"}), notifier)
+    snapshot.get()["test_cache"] = "b"
+    assert snapshot.get()["test_cache"] == "a"
+
+
+def test_invalidation_reaches_every_worker(
+    mocker, django_capture_on_commit_callbacks, cache_version, notifier
+):
+    workers = [create_worker(notifier) for _ in range(3)]
+    for worker in workers:
+        assert worker.get()[cache_version.cache] == cache_version.version
+
+    mocker.patch("misago.cache.versions.cache_versions_snapshot", workers[0])
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidate_cache(cache_version.cache)
+
+    new_version = CacheVersion.objects.get(cache=cache_version.cache).version
+    for worker in workers:
+        assert worker.get()[cache_version.cache] == new_version
+
+
+def test_notifier_doesnt_change_token_before_transaction_commit(
+    mocker, cache_version, notifier
+):
+    worker = create_worker(notifier)
+    notifier.set_new_token()
+    worker.get()
+
+    token = notifier.get_token()
+    mocker.patch("misago.cache.versions.cache_versions_snapshot", worker)
+    invalidate_cache(cache_version.cache)
+    assert notifier.get_token() == token
+
+
+def wait_for_token_change(notifier, token):
+    for _ in range(50):
+        if notifier.get_token() != token:
+            return True
+        time.sleep(0.1)
+    return False
+
+
+@pytest.mark.django_db(transaction=True, serialized_rollback=True)
+def test_postgres_notifier_reaches_every_listener():
+    listeners = [PostgresNotifier() for _ in range(2)]
+    try:
+        tokens = [listener.get_token() for listener in listeners]
+        assert all(tokens)
+
+        PostgresNotifier().notify()
+        for listener, token in zip(listeners, tokens):
+            assert wait_for_token_change(listener, token)
+    finally:
+        for listener in listeners:
+            listener.close_listener()
@@ -0,0 +1,171 @@
+import pytest
+from django.test import override_settings
+
+from ..models import CacheVersion
+from ..versionedcache import VersionedCache
+
+
+@pytest.fixture
+def versioned_cache(cache_version):
+    return VersionedCache(cache_version.cache)
+
+
+@pytest.fixture
+def cache_versions(cache_version):
+    return {cache_version.cache: cache_version.version}
+
+
+def test_cache_key_includes_cache_name_and_version(versioned_cache, cache_versions):
+    cache_key = versioned_cache.get_cache_key(cache_versions)
+    assert cache_key == "test_cache_%s" % cache_versions["test_cache"]
+
+
+def test_cache_key_includes_custom_key(versioned_cache, cache_versions):
+    cache_key = versioned_cache.get_cache_key(cache_versions, "custom")
+    assert cache_key == "test_cache_custom_%s" % cache_versions["test_cache"]
+
+
+def test_cache_reads_value_from_shared_cache(mocker, versioned_cache, cache_versions):
+    cache_get = mocker.patch("django.core.cache.cache.get", return_value="value")
+    assert versioned_cache.get(cache_versions) == "value"
+    cache_get.assert_called_once_with(versioned_cache.get_cache_key(cache_versions))
+
+
+def test_cache_writes_value_to_shared_cache(mocker, versioned_cache, cache_versions):
+    cache_set = mocker.patch("django.core.cache.cache.set")
+    versioned_cache.set(cache_versions, "value")
+    cache_set.assert_called_once_with(
+        versioned_cache.get_cache_key(cache_versions), "value"
+    )
+
+
+def test_cache_without_local_tier_always_reads_shared_cache(
+    mocker, versioned_cache, cache_versions
+):
+    cache_get = mocker.patch("django.core.cache.cache.get", return_value="value")
+    versioned_cache.set(cache_versions, "value")
+    versioned_cache.get(cache_versions)
+    versioned_cache.get(cache_versions)
+    assert cache_get.call_count == 2
+
+
+@override_settings(MISAGO_VERSIONED_CACHE_LOCAL_SIZE=10)
+def test_cache_returns_value_from_local_tier_without_reading_shared_cache(
+    mocker, versioned_cache, cache_versions
+):
+    cache_get = mocker.patch("django.core.cache.cache.get")
+    value = {"hot": "object"}
+    versioned_cache.set(cache_versions, value)
+    assert versioned_cache.get(cache_versions) is value
+    cache_get.assert_not_called()
+
+
+@override_settings(MISAGO_VERSIONED_CACHE_LOCAL_SIZE=10)
+def test_cache_stores_value_read_from_shared_cache_in_local_tier(
+    mocker, versioned_cache, cache_versions
+):
+    cache_get = mocker.patch("django.core.cache.cache.get", return_value="value")
+    versioned_cache.get(cache_versions)
+    versioned_cache.get(cache_versions)
+    cache_get.assert_called_once()
+
+
+@override_settings(MISAGO_VERSIONED_CACHE_LOCAL_SIZE=10)
+def test_cache_ignores_local_entry_for_other_version(
+    mocker, versioned_cache, cache_versions
+):
+    versioned_cache.set(cache_versions, "old")
+    mocker.patch("django.core.cache.cache.get", return_value=None)
+    new_versions = {"test_cache": "newversn"}
+    assert versioned_cache.get(new_versions) is None
+
+
+@override_settings(MISAGO_VERSIONED_CACHE_LOCAL_SIZE=2)
+def test_cache_local_tier_is_bounded(mocker, versioned_cache, cache_versions):
+    mocker.patch("django.core.cache.cache.get", return_value=None)
+    versioned_cache.set(cache_versions, "a", "a")
+    versioned_cache.set(cache_versions, "b", "b")
+    versioned_cache.get(cache_versions, "a")
+    versioned_cache.set(cache_versions, "c", "c")
+
+    assert versioned_cache.get(cache_versions, "a") == "a"
+    assert versioned_cache.get(cache_versions, "b") is None
+    assert versioned_cache.get(cache_versions, "c") == "c"
+
+
+@override_settings(MISAGO_VERSIONED_CACHE_LOCAL_SIZE=10)
+def test_invalidating_cache_updates_version_and_clears_local_tier(
+    mocker, versioned_cache, cache_versions, cache_version
+):
+    mocker.patch("django.core.cache.cache.get", return_value=None)
+    versioned_cache.set(cache_versions, "value")
+    versioned_cache.invalidate()
+
+    assert versioned_cache.get(cache_versions) is None
+    updated_cache_version = CacheVersion.objects.get(cache=cache_version.cache)
+    assert updated_cache_version.version != cache_version.version
+
+
+def test_get_or_build_returns_cached_value_without_building(
+    mocker, versioned_cache, cache_versions
+):
+    mocker.patch("django.core.cache.cache.get", return_value="cached")
+    build = mocker.Mock(return_value="built")
+    assert versioned_cache.get_or_build(cache_versions, build) == "cached"
+    build.assert_not_called()
+
+
+def test_get_or_build_builds_and_caches_value_on_miss(
+    mocker, versioned_cache, cache_versions
+):
+    mocker.patch("django.core.cache.cache.get", return_value=None)
+    cache_set = mocker.patch("django.core.cache.cache.set")
+    cache_delete = mocker.patch("django.core.cache.cache.delete")
+    build = mocker.Mock(return_value="built")
+
+    assert versioned_cache.get_or_build(cache_versions, build) == "built"
+    build.assert_called_once()
+    cache_set.assert_called_once_with(
+        versioned_cache.get_cache_key(cache_versions), "built"
+    )
+    cache_delete.assert_called_once()
+
+
+@override_settings(MISAGO_VERSIONED_CACHE_REBUILD_WAIT=1)
+def test_get_or_build_waits_for_value_rebuilt_by_other_process(
+    mocker, versioned_cache, cache_versions
+):
+    mocker.patch("django.core.cache.cache.add", return_value=False)
+    mocker.patch("django.core.cache.cache.get", side_effect=[None, None, "rebuilt"])
+    cache_delete = mocker.patch("django.core.cache.cache.delete")
+    build = mocker.Mock(return_value="built")
+
+    assert versioned_cache.get_or_build(cache_versions, build) == "rebuilt"
+    build.assert_not_called()
+    cache_delete.assert_not_called()
+
+
+@override_settings(MISAGO_VERSIONED_CACHE_REBUILD_WAIT=0.1)
+def test_get_or_build_builds_value_if_other_process_rebuild_times_out(
+    mocker, versioned_cache, cache_versions
+):
+    mocker.patch("django.core.cache.cache.add", return_value=False)
+    mocker.patch("django.core.cache.cache.get", return_value=None)
+    cache_delete = mocker.patch("django.core.cache.cache.delete")
+    build = mocker.Mock(return_value="built")
+
+    assert versioned_cache.get_or_build(cache_versions, build) == "built"
+    build.assert_called_once()
+    cache_delete.assert_not_called()
+
+
+def test_get_or_build_releases_lock_if_build_fails(
+    mocker, versioned_cache, cache_versions
+):
+    mocker.patch("django.core.cache.cache.get", return_value=None)
+    cache_delete = mocker.patch("django.core.cache.cache.delete")
+    build = mocker.Mock(side_effect=ValueError)
+
+    with pytest.raises(ValueError):
+        versioned_cache.get_or_build(cache_versions, build)
+    cache_delete.assert_called_once()
@@ -0,0 +1,118 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic, sleep
+
+from django.core.cache import cache
+
+from ..conf import settings
+from .metrics import cache_metrics
+from .versions import invalidate_cache
+
+REBUILD_POLL_INTERVAL = 0.05
+
+
+class VersionedCache:
+    """Two-tier cache for values that are invalidated by bumping cache version.
+
+    Values are kept in Django's cache shared by all processes, with bounded
+    process-local LRU in front of it. Local entries remember version they were
+    stored for and are discarded as soon as that version changes.
+
+    Values returned from this cache are shared between requests and should be
+    treated as read-only.
+    """
+
+    def __init__(self, cache_name):
+        self.cache_name = cache_name
+        self.lock = Lock()
+        self.local = OrderedDict()
+
+    def get_cache_key(self, cache_versions, key=None):
+        version = cache_versions[self.cache_name]
+        if key is None:
+            return "%s_%s" % (self.cache_name, version)
+        return "%s_%s_%s" % (self.cache_name, key, version)
+
+    def get(self, cache_versions, key=None):
+        value = self.get_value(cache_versions, key)
+        if value is None:
+            cache_metrics.record_miss(self.cache_name)
+        else:
+            cache_metrics.record_hit(self.cache_name)
+        return value
+
+    def get_value(self, cache_versions, key=None):
+        version = cache_versions[self.cache_name]
+        if settings.MISAGO_VERSIONED_CACHE_LOCAL_SIZE:
+            with self.lock:
+                entry = self.local.get(key)
+                if entry and entry[0] == version:
+                    self.local.move_to_end(key)
+                    return entry[1]
+
+        value = cache.get(self.get_cache_key(cache_versions, key))
+        if value is not None:
+            self.set_local(key, version, value)
+        return value
+
+    def get_or_build(self, cache_versions, build, key=None):
+        """Returns cached value, calling build to create it on cache miss.
+
+        Only one process rebuilds the value at a time. Other processes that miss
+        the cache wait for it to appear in the shared cache, and build the value
+        themselves only if it doesn't appear within
+        MISAGO_VERSIONED_CACHE_REBUILD_WAIT seconds.
+        """
+        value = self.get(cache_versions, key)
+        if value is not None:
+            return value
+
+        lock_key = "%s_rebuild" % self.get_cache_key(cache_versions, key)
+        lock_timeout = settings.MISAGO_VERSIONED_CACHE_REBUILD_TIMEOUT
+        has_lock = cache.add(lock_key, True, lock_timeout)
+        if not has_lock:
+            value = self.wait_for_rebuild(cache_versions, key)
+            if value is not None:
+                return value
+
+        try:
+            with cache_metrics.measure_rebuild(self.cache_name):
+                value = build()
+            self.set(cache_versions, value, key)
+        finally:
+            if has_lock:
+                cache.delete(lock_key)
+
+        return value
+
+    def wait_for_rebuild(self, cache_versions, key=None):
+        deadline = monotonic() + settings.MISAGO_VERSIONED_CACHE_REBUILD_WAIT
+        while monotonic() < deadline:
+            sleep(REBUILD_POLL_INTERVAL)
+            value = self.get_value(cache_versions, key)
+            if value is not None:
+                return value
+        return None
+
+    def set(self, cache_versions, value, key=None):
+        cache.set(self.get_cache_key(cache_versions, key), value)
+        self.set_local(key, cache_versions[self.cache_name], value)
+
+    def set_local(self, key, version, value):
+        size = settings.MISAGO_VERSIONED_CACHE_LOCAL_SIZE
+        if not size:
+            return
+
+        with self.lock:
+            self.local[key] = (version, value)
+            self.local.move_to_end(key)
+            while len(self.local) > size:
+                self.local.popitem(last=False)
+
+    def clear_local(self):
+        with self.lock:
+            self.local.clear()
+
+    def invalidate(self):
+        invalidate_cache(self.cache_name)
+        self.clear_local()
@@ -1,4 +1,5 @@
 from .models import CacheVersion
+from .snapshot import CacheVersionsSnapshot
 from .utils import generate_version_string
 
 
@@ -7,10 +8,18 @@ def get_cache_versions():
     return {i.cache: i.version for i in queryset}
 
 
+cache_versions_snapshot = CacheVersionsSnapshot(get_cache_versions)
+
+
+def get_cache_versions_snapshot():
+    return cache_versions_snapshot.get()
+
+
 def invalidate_cache(cache_name):
     CacheVersion.objects.filter(cache=cache_name).update(
         version=generate_version_string()
     )
+    cache_versions_snapshot.notify()
 
 
 def invalidate_all_caches():
@@ -18,3 +27,4 @@ def invalidate_all_caches():
         CacheVersion.objects.filter(cache=cache_name).update(
             version=generate_version_string()
         )
+    cache_versions_snapshot.notify()
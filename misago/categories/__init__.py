@@ -1,2 +1,3 @@
+CATEGORIES_CACHE = "categories"
 PRIVATE_THREADS_ROOT_NAME = "private_threads"
 THREADS_ROOT_NAME = "root_category"
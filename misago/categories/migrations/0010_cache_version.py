@@ -0,0 +1,13 @@
+from django.db import migrations
+
+from .. import CATEGORIES_CACHE
+from ...cache.operations import StartCacheVersioning
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("misago_categories", "0009_auto_20221101_2111"),
+        ("misago_cache", "0001_initial"),
+    ]
+
+    operations = [StartCacheVersioning(CATEGORIES_CACHE)]
@@ -3,15 +3,18 @@ from django.db import models
 from mptt.managers import TreeManager
 from mptt.models import MPTTModel, TreeForeignKey
 
-from . import PRIVATE_THREADS_ROOT_NAME, THREADS_ROOT_NAME
+from . import CATEGORIES_CACHE, PRIVATE_THREADS_ROOT_NAME, THREADS_ROOT_NAME
 from ..acl.cache import clear_acl_cache
 from ..acl.models import BaseRole
+from ..cache.versionedcache import VersionedCache
 from ..conf import settings
 from ..core.utils import slugify
 from ..threads.threadtypes import trees_map
 
 CACHE_NAME = "misago_categories_tree"
 
+categories_cache = VersionedCache(CATEGORIES_CACHE)
+
 
 class CategoryManager(TreeManager):
     def private_threads(self):
@@ -36,11 +39,11 @@ class CategoryManager(TreeManager):
             queryset = queryset.filter(level__gt=0)
         return queryset.order_by("lft")
 
-    def get_cached_categories_dict(self):
-        categories_dict = cache.get(CACHE_NAME, "nada")
-        if categories_dict == "nada":
+    def get_cached_categories_dict(self, cache_versions):
+        categories_dict = categories_cache.get(cache_versions)
+        if categories_dict is None:
             categories_dict = self.get_categories_dict_from_db()
-            cache.set(CACHE_NAME, categories_dict)
+            categories_cache.set(cache_versions, categories_dict)
         return categories_dict
 
     def get_categories_dict_from_db(self):
@@ -50,7 +53,7 @@ class CategoryManager(TreeManager):
         return categories_dict
 
     def clear_cache(self):
-        cache.delete(CACHE_NAME)
+        categories_cache.invalidate()
 
 
 class Category(MPTTModel):
@@ -4,6 +4,7 @@ from django.http import Http404
 from django.utils.translation import gettext_lazy as _
 
 from ..acl import algebra
+from ..acl.buildacl import get_build_data, is_bulk_build
 from ..acl.decorators import return_boolean
 from ..admin.forms import YesNoSwitch
 from .models import Category, CategoryRole, RoleCategoryACL
@@ -27,13 +28,39 @@ def build_acl(acl, roles, key_name):
 
     roles = get_categories_roles(roles)
 
-    for category in Category.objects.all_categories():
-        build_category_acl(new_acl, category, roles, key_name)
+    for category in get_categories():
+        if category.level:
+            build_category_acl(new_acl, category, roles, key_name)
 
     return new_acl
 
 
+def get_categories():
+    """Returns list of all threads categories, including root"""
+    return get_build_data(
+        "categories", lambda: list(Category.objects.all_categories(include_root=True))
+    )
+
+
 def get_categories_roles(roles):
+    if is_bulk_build():
+        roles_categories = get_build_data(
+            "roles_categories_roles", get_roles_categories_roles
+        )
+
+        categories_roles = {}
+        for role in roles:
+            for category_id, category_role in roles_categories.get(role.pk, []):
+                categories_roles.setdefault(category_id, []).append(category_role)
+        return categories_roles
+
+    return get_build_data(
+        ("categories_roles", tuple(role.pk for role in roles)),
+        lambda: get_categories_roles_from_db(roles),
+    )
+
+
+def get_categories_roles_from_db(roles):
     queryset = RoleCategoryACL.objects.filter(role__in=roles)
     queryset = queryset.select_related("category_role")
 
@@ -44,9 +71,24 @@ def get_categories_roles(roles):
     return roles
 
 
+def get_roles_categories_roles():
+    """Returns dict of (category id, category role) pairs for every role"""
+    categories_roles = CategoryRole.objects.in_bulk()
+    queryset = RoleCategoryACL.objects.values_list(
+        "role_id", "category_id", "category_role_id"
+    )
+
+    roles = {}
+    for role_id, category_id, category_role_id in queryset.iterator():
+        roles.setdefault(role_id, []).append(
+            (category_id, categories_roles[category_role_id])
+        )
+    return roles
+
+
 def build_category_acl(acl, category, categories_roles, key_name):
     if category.level > 1:
-        if category.parent_id not in acl["visible_categories"]:
+        if category.parent_id not in acl["categories"]:
             # dont bother with child categories of invisible parents
             return
         if not acl["categories"][category.parent_id]["can_browse"]:
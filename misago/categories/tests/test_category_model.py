@@ -1,6 +1,8 @@
 from django.test import TestCase
 
-from .. import THREADS_ROOT_NAME
+from .. import CATEGORIES_CACHE, THREADS_ROOT_NAME
+from ...cache.test import assert_invalidates_cache
+from ...cache.versions import get_cache_versions
 from ...threads import test
 from ...threads.threadtypes import trees_map
 from ..models import Category
@@ -45,6 +47,17 @@ class CategoryManagerTests(TestCase):
             else:
                 self.assertNotIn(category.id, test_dict)
 
+    def test_get_cached_categories_dict(self):
+        """get_cached_categories_dict returns dict with categories"""
+        cache_versions = get_cache_versions()
+        test_dict = Category.objects.get_cached_categories_dict(cache_versions)
+        self.assertEqual(test_dict, Category.objects.get_categories_dict_from_db())
+
+    def test_clear_cache(self):
+        """clear_cache invalidates categories cache"""
+        with assert_invalidates_cache(CATEGORIES_CACHE):
+            Category.objects.clear_cache()
+
 
 class CategoryModelTests(TestCase):
     def setUp(self):
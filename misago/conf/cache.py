@@ -1,22 +1,29 @@
-from django.core.cache import cache
-
 from . import SETTINGS_CACHE
-from ..cache.versions import invalidate_cache
+from ..cache.versionedcache import VersionedCache
+
+settings_cache = VersionedCache(SETTINGS_CACHE)
 
 
 def get_settings_cache(cache_versions):
-    key = get_cache_key(cache_versions)
-    return cache.get(key)
+    return settings_cache.get(cache_versions)
 
 
 def set_settings_cache(cache_versions, user_settings):
-    key = get_cache_key(cache_versions)
-    cache.set(key, user_settings)
+    settings_cache.set(cache_versions, user_settings)
+
+
+def get_or_build_settings_cache(cache_versions, build_settings):
+    return settings_cache.get_or_build(cache_versions, build_settings)
+
+
+def get_or_build_lazy_settings_cache(cache_versions, settings, build_settings):
+    cache_key = "lazy_%s" % ",".join(sorted(settings))
+    return settings_cache.get_or_build(cache_versions, build_settings, cache_key)
 
 
 def get_cache_key(cache_versions):
-    return "%s_%s" % (SETTINGS_CACHE, cache_versions[SETTINGS_CACHE])
+    return settings_cache.get_cache_key(cache_versions)
 
 
 def clear_settings_cache():
-    invalidate_cache(SETTINGS_CACHE)
+    settings_cache.invalidate()
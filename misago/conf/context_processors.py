@@ -2,7 +2,9 @@ from django.templatetags.static import static
 from django.urls import reverse
 from django.utils.translation import get_language
 
+from ..core.frontendcontext import update_frontend_context
 from . import settings
+from .cache import settings_cache
 
 
 def conf(request):
@@ -35,11 +37,22 @@ def og_image(request):
 
 
 def preload_settings_json(request):
-    preloaded_settings = request.settings.get_public_settings()
+    update_frontend_context(
+        request,
+        settings_cache,
+        "settings",
+        lambda: get_settings_frontend_context(request.settings),
+    )
+
+    return {}
+
 
-    delegate_auth = request.settings.enable_oauth2_client
+def get_settings_frontend_context(dynamic_settings):
+    preloaded_settings = dynamic_settings.get_public_settings()
 
-    if request.settings.enable_oauth2_client:
+    delegate_auth = dynamic_settings.enable_oauth2_client
+
+    if dynamic_settings.enable_oauth2_client:
         login_url = reverse("misago:oauth2-login")
     else:
         login_url = reverse(settings.LOGIN_URL)
@@ -54,21 +67,17 @@ def preload_settings_json(request):
         }
     )
 
-    request.frontend_context.update(
-        {
-            "BLANK_AVATAR_URL": (
-                request.settings.blank_avatar or static(settings.MISAGO_BLANK_AVATAR)
-            ),
-            "CSRF_COOKIE_NAME": settings.CSRF_COOKIE_NAME,
-            "ENABLE_DELETE_OWN_ACCOUNT": (
-                not delegate_auth and request.settings.allow_delete_own_account
-            ),
-            "ENABLE_DOWNLOAD_OWN_DATA": request.settings.allow_data_downloads,
-            "MISAGO_PATH": reverse("misago:index"),
-            "SETTINGS": preloaded_settings,
-            "STATIC_URL": settings.STATIC_URL,
-            "THREADS_ON_INDEX": settings.MISAGO_THREADS_ON_INDEX,
-        }
-    )
-
-    return {}
+    return {
+        "BLANK_AVATAR_URL": (
+            dynamic_settings.blank_avatar or static(settings.MISAGO_BLANK_AVATAR)
+        ),
+        "CSRF_COOKIE_NAME": settings.CSRF_COOKIE_NAME,
+        "ENABLE_DELETE_OWN_ACCOUNT": (
+            not delegate_auth and dynamic_settings.allow_delete_own_account
+        ),
+        "ENABLE_DOWNLOAD_OWN_DATA": dynamic_settings.allow_data_downloads,
+        "MISAGO_PATH": reverse("misago:index"),
+        "SETTINGS": preloaded_settings,
+        "STATIC_URL": settings.STATIC_URL,
+        "THREADS_ON_INDEX": settings.MISAGO_THREADS_ON_INDEX,
+    }
@@ -46,6 +46,49 @@ MISAGO_ACL_EXTENSIONS = [
 ]
 
 
+# Cache versions are kept in process memory and reloaded from database only after
+# notifier reports that some cache was invalidated. Use
+# "misago.cache.notifiers.PostgresNotifier" to propagate changes with LISTEN/NOTIFY
+# instead of the cache key, or set to None to query database on every request.
+# Database is also queried on every request if cache notifier is used with cache
+# that is not shared between processes, like LocMemCache.
+
+MISAGO_CACHE_VERSIONS_NOTIFIER = "misago.cache.notifiers.CacheNotifier"
+
+
+# Max number of seconds for which process may use its copy of cache versions
+# without checking notifier for changes.
+
+MISAGO_CACHE_VERSIONS_MAX_STALENESS = 2
+
+
+# Max number of entries each versioned cache (eg. ACL or settings) keeps in process
+# memory in front of Django's cache. Set to 0 to always read from Django's cache.
+
+MISAGO_VERSIONED_CACHE_LOCAL_SIZE = 500
+
+
+# Max number of seconds for which process may hold the lock on rebuilding value of
+# versioned cache, and number of seconds that other processes will wait for this
+# value before building it themselves.
+
+MISAGO_VERSIONED_CACHE_REBUILD_TIMEOUT = 30
+MISAGO_VERSIONED_CACHE_REBUILD_WAIT = 3
+
+
+# Number of most common users ACLs that should be rebuilt in background task after
+# ACL cache is invalidated. Anonymous user's ACL is always included. Set to 0 to
+# disable rebuilding ACLs ahead of requests.
+
+MISAGO_ACL_CACHE_REWARM = 0
+
+
+# Expose hits, misses and rebuild times of versioned caches in Prometheus text
+# format under /metrics/ url. Those metrics are counted for each process separately.
+
+MISAGO_CACHE_METRICS_ENDPOINT = False
+
+
 # Path to the directory that Misago should use to prepare user data downloads.
 # Should not be accessible from internet.
 
@@ -57,6 +100,43 @@ MISAGO_USER_DATA_DOWNLOADS_WORKING_DIR = None
 MISAGO_MARKUP_EXTENSIONS = []
 
 
+# Parser used to build HTML tree from markdown output for post-processing.
+# Can be "html5lib" or faster "html.parser" that doesn't fix misnested HTML.
+
+MISAGO_MARKUP_HTML_PARSER = "html5lib"
+
+
+# Max number of parsing results (eg. for previews of posts) kept in process memory.
+# Set to 0 to parse text every time.
+
+MISAGO_MARKUP_PARSING_CACHE_SIZE = 1000
+
+
+# Max number of mentioned users kept in process memory by mentions resolver.
+# Set to 0 to always resolve mentions from database.
+
+MISAGO_MENTIONS_CACHE_SIZE = 5000
+
+
+# Max number of posts finalized HTML versions kept in process memory.
+# Set to 0 to finalize posts HTML every time they are displayed.
+
+MISAGO_POSTS_CONTENT_CACHE_SIZE = 2000
+
+
+# Max number of posts with verified checksums kept in process memory.
+# Set to 0 to verify posts checksums every time they are displayed.
+
+MISAGO_POSTS_CHECKSUMS_CACHE_SIZE = 5000
+
+
+# Number of hours for which users indexes of unread threads, used by "new" and "unread"
+# threads lists, are kept up to date before being rebuilt. Indexes are built by Celery.
+# Set to 0 to always look for unread posts when displaying those lists.
+
+MISAGO_UNREAD_THREADS_INDEX_TTL = 24
+
+
 # Custom post validators
 
 MISAGO_POST_VALIDATORS = []
@@ -1,4 +1,4 @@
-from .cache import get_settings_cache, set_settings_cache
+from .cache import get_or_build_lazy_settings_cache, get_or_build_settings_cache
 from .models import Setting
 
 
@@ -6,10 +6,11 @@ class DynamicSettings:
     _overrides = {}
 
     def __init__(self, cache_versions):
-        self._settings = get_settings_cache(cache_versions)
-        if self._settings is None:
-            self._settings = get_settings_from_db()
-            set_settings_cache(cache_versions, self._settings)
+        self._cache_versions = cache_versions
+        self._settings = get_or_build_settings_cache(
+            cache_versions, get_settings_from_db
+        )
+        self._lazy_settings = {}
 
     def get(self, setting):
         return self._settings.get(setting)
@@ -22,17 +23,43 @@ class DynamicSettings:
         return public_settings
 
     def get_lazy_setting_value(self, setting):
-        try:
-            if self._settings[setting]["is_lazy"]:
-                if setting in self._overrides:
-                    return self._overrides[setting]
-                if not self._settings[setting].get("real_value"):
-                    real_value = Setting.objects.get(setting=setting).value
-                    self._settings[setting]["real_value"] = real_value
-                return self._settings[setting]["real_value"]
-            raise ValueError("Setting %s is not lazy" % setting)
-        except (KeyError, Setting.DoesNotExist):
-            raise AttributeError("Setting %s is not defined" % setting)
+        return self.get_lazy_settings_values(setting)[setting]
+
+    def get_lazy_settings_values(self, *settings):
+        """Returns dict with values of lazy settings
+
+        Values missing from this instance are read from cache or loaded from
+        database with one query for all of them.
+        """
+        for setting in settings:
+            if setting not in self._settings:
+                raise AttributeError("Setting %s is not defined" % setting)
+            if not self._settings[setting]["is_lazy"]:
+                raise ValueError("Setting %s is not lazy" % setting)
+
+        missing_settings = [
+            setting
+            for setting in settings
+            if setting not in self._overrides and setting not in self._lazy_settings
+        ]
+        if missing_settings:
+            self._lazy_settings.update(
+                get_or_build_lazy_settings_cache(
+                    self._cache_versions,
+                    missing_settings,
+                    lambda: get_lazy_settings_from_db(missing_settings),
+                )
+            )
+
+        values = {}
+        for setting in settings:
+            if setting in self._overrides:
+                values[setting] = self._overrides[setting]
+            elif setting in self._lazy_settings:
+                values[setting] = self._lazy_settings[setting]
+            else:
+                raise AttributeError("Setting %s is not defined" % setting)
+        return values
 
     def __getattr__(self, setting):
         if setting in self._overrides:
@@ -75,3 +102,8 @@ def get_settings_from_db():
             settings[setting.setting]["value"] = setting.value
 
     return settings
+
+
+def get_lazy_settings_from_db(settings):
+    queryset = Setting.objects.filter(setting__in=settings, is_lazy=True)
+    return {setting.setting: setting.value for setting in queryset.iterator()}
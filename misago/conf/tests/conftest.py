@@ -27,3 +27,10 @@ def public_setting(db):
     return Setting.objects.create(
         setting="public_setting", dry_value="Hello", is_public=True
     )
+
+
+@pytest.fixture
+def other_lazy_setting(db):
+    return Setting.objects.create(
+        setting="other_lazy_setting", dry_value="World", is_lazy=True
+    )
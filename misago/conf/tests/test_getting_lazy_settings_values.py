@@ -0,0 +1,98 @@
+import pytest
+from django.test import override_settings
+
+from ..cache import settings_cache
+from ..dynamicsettings import DynamicSettings
+
+
+@pytest.fixture(autouse=True)
+def clear_settings_cache():
+    settings_cache.clear_local()
+    yield
+    settings_cache.clear_local()
+
+
+def test_lazy_settings_getter_returns_dict_with_settings_values(
+    cache_versions, lazy_setting, other_lazy_setting
+):
+    settings = DynamicSettings(cache_versions)
+    assert settings.get_lazy_settings_values("lazy_setting", "other_lazy_setting") == {
+        "lazy_setting": "Hello",
+        "other_lazy_setting": "World",
+    }
+
+
+def test_lazy_settings_getter_loads_all_settings_with_one_query(
+    cache_versions, lazy_setting, other_lazy_setting, django_assert_num_queries
+):
+    settings = DynamicSettings(cache_versions)
+    with django_assert_num_queries(1):
+        settings.get_lazy_settings_values("lazy_setting", "other_lazy_setting")
+
+
+def test_lazy_settings_getter_loads_only_settings_missing_from_instance(
+    mocker, cache_versions, lazy_setting, other_lazy_setting
+):
+    settings = DynamicSettings(cache_versions)
+    settings.get_lazy_setting_value("lazy_setting")
+
+    cache_get = mocker.spy(settings_cache, "get_or_build")
+    settings.get_lazy_settings_values("lazy_setting", "other_lazy_setting")
+    assert cache_get.call_args[0][2] == "lazy_other_lazy_setting"
+
+
+def test_lazy_settings_are_cached_outside_of_settings_cache(
+    mocker, cache_versions, lazy_setting
+):
+    settings = DynamicSettings(cache_versions)
+    cache_set = mocker.patch("django.core.cache.cache.set")
+    settings.get_lazy_setting_value("lazy_setting")
+
+    cache_set.assert_called_once_with(
+        settings_cache.get_cache_key(cache_versions, "lazy_lazy_setting"),
+        {"lazy_setting": "Hello"},
+    )
+
+
+def test_lazy_settings_are_read_from_cache(
+    mocker, cache_versions, lazy_setting, django_assert_num_queries
+):
+    settings = DynamicSettings(cache_versions)
+    mocker.patch("django.core.cache.cache.get", return_value={"lazy_setting": "Cached"})
+    with django_assert_num_queries(0):
+        assert settings.get_lazy_setting_value("lazy_setting") == "Cached"
+
+
+@override_settings(MISAGO_VERSIONED_CACHE_LOCAL_SIZE=10)
+def test_lazy_settings_are_reused_by_other_instances_in_process(
+    cache_versions, lazy_setting, django_assert_num_queries
+):
+    DynamicSettings(cache_versions).get_lazy_setting_value("lazy_setting")
+    settings = DynamicSettings(cache_versions)
+    with django_assert_num_queries(0):
+        assert settings.get_lazy_setting_value("lazy_setting") == "Hello"
+
+
+def test_lazy_settings_getter_for_undefined_setting_raises_attribute_error(
+    cache_versions, lazy_setting
+):
+    settings = DynamicSettings(cache_versions)
+    with pytest.raises(AttributeError):
+        settings.get_lazy_settings_values("lazy_setting", "undefined")
+
+
+def test_lazy_settings_getter_for_not_lazy_setting_raises_value_error(
+    cache_versions, lazy_setting
+):
+    settings = DynamicSettings(cache_versions)
+    with pytest.raises(ValueError):
+        settings.get_lazy_settings_values("lazy_setting", "forum_name")
+
+
+def test_lazy_settings_getter_returns_overridden_value(cache_versions, lazy_setting):
+    settings = DynamicSettings(cache_versions)
+    DynamicSettings.override_settings({"lazy_setting": "Overridden"})
+    try:
+        assert settings.get_lazy_setting_value("lazy_setting") == "Overridden"
+    finally:
+        DynamicSettings.remove_overrides()
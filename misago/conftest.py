@@ -2,6 +2,7 @@ import pytest
 
 from .acl import ACL_CACHE, useracl
 from .admin.auth import authorize_admin
+from .categories import CATEGORIES_CACHE
 from .categories.models import Category
 from .conf import SETTINGS_CACHE
 from .conf.dynamicsettings import DynamicSettings
@@ -11,7 +12,7 @@ from .socialauth import SOCIALAUTH_CACHE
 from .test import MisagoClient
 from .themes import THEME_CACHE
 from .threads.test import post_thread
-from .users import BANS_CACHE
+from .users import BANS_CACHE, USERNAMES_CACHE
 from .users.models import AnonymousUser
 from .users.test import create_test_superuser, create_test_user
 
@@ -20,10 +21,12 @@ def get_cache_versions():
     return {
         ACL_CACHE: "abcdefgh",
         BANS_CACHE: "abcdefgh",
+        CATEGORIES_CACHE: "abcdefgh",
         SETTINGS_CACHE: "abcdefgh",
         SOCIALAUTH_CACHE: "abcdefgh",
         THEME_CACHE: "abcdefgh",
         MENU_ITEMS_CACHE: "abcdefgh",
+        USERNAMES_CACHE: "abcdefgh",
     }
 
 
@@ -0,0 +1,100 @@
+import json
+
+from django.urls import get_script_prefix
+from django.utils.translation import get_language
+
+from ..conf import settings
+from .lazycontext import timed_call
+
+
+class FrontendContext(dict):
+    """Dict with data for frontend app.
+
+    Values shared by all requests are added with update_shared() together with
+    their JSON, so they aren't serialized again when page is rendered. Shared
+    values come from cache and should be replaced instead of being mutated.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.shared_json = {}
+        self.lazy_updates = []
+
+    def add_lazy_update(self, update):
+        """Adds function that will update context before it's serialized"""
+        self.lazy_updates.append(update)
+
+    def run_lazy_updates(self):
+        while self.lazy_updates:
+            self.lazy_updates.pop(0)(self)
+
+    def update_shared(self, fragment):
+        for key, (value, value_json) in fragment.items():
+            self[key] = value
+            self.shared_json[key] = (value, value_json)
+
+    def to_json(self):
+        self.run_lazy_updates()
+
+        items = []
+        for key, value in self.items():
+            shared = self.shared_json.get(key)
+            if shared and shared[0] is value:
+                value_json = shared[1]
+            else:
+                value_json = json.dumps(value)
+            items.append("%s: %s" % (json.dumps(key), value_json))
+        return "{%s}" % ", ".join(items)
+
+
+def update_frontend_context(request, versioned_cache, name, build):
+    """Updates request's frontend context with fragment shared by requests
+
+    Fragment is built by calling build() once per cache version, language and
+    script prefix, and is stored in versioned cache together with its JSON.
+    """
+    fragment = get_frontend_context_fragment(
+        versioned_cache, request.cache_versions, name, build
+    )
+
+    if isinstance(request.frontend_context, FrontendContext):
+        request.frontend_context.update_shared(fragment)
+    else:
+        request.frontend_context.update(
+            {key: value for key, (value, _) in fragment.items()}
+        )
+
+
+def update_frontend_context_lazily(request, name, update):
+    """Updates request's frontend context only if it's included on the page
+
+    Update is a function that receives frontend context to update.
+    """
+    if settings.DEBUG:
+
+        def timed_update(frontend_context):
+            timed_call(request, name, update, frontend_context)
+
+    else:
+        timed_update = update
+
+    if isinstance(request.frontend_context, FrontendContext):
+        request.frontend_context.add_lazy_update(timed_update)
+    else:
+        timed_update(request.frontend_context)
+
+
+def get_frontend_context_fragment(versioned_cache, cache_versions, name, build):
+    cache_key = "frontend_context_%s_%s_%s" % (
+        name,
+        get_language(),
+        get_script_prefix(),
+    )
+
+    return versioned_cache.get_or_build(
+        cache_versions, lambda: build_frontend_context_fragment(build()), cache_key
+    )
+
+
+def build_frontend_context_fragment(values):
+    return {key: (value, json.dumps(value)) for key, value in values.items()}
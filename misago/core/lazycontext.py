@@ -0,0 +1,31 @@
+from time import perf_counter
+
+from django.utils.functional import SimpleLazyObject
+
+from ..conf import settings
+
+
+def lazy_context_value(request, name, get_value):
+    """Returns template context value that is computed when it's first read
+
+    In debug mode time spent on computing the value is recorded in request's
+    context_processors_timings list.
+    """
+    if settings.DEBUG and request is not None:
+        return SimpleLazyObject(lambda: timed_call(request, name, get_value))
+    return SimpleLazyObject(get_value)
+
+
+def timed_call(request, name, func, *args):
+    start = perf_counter()
+    result = func(*args)
+    record_timing(request, name, perf_counter() - start)
+    return result
+
+
+def record_timing(request, name, duration):
+    try:
+        timings = request.context_processors_timings
+    except AttributeError:
+        timings = request.context_processors_timings = []
+    timings.append((name, duration))
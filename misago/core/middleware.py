@@ -1,4 +1,5 @@
 from . import exceptionhandler
+from .frontendcontext import FrontendContext
 from .utils import is_request_to_misago
 
 
@@ -23,5 +24,5 @@ class FrontendContextMiddleware:
 
     def __call__(self, request):
         request.include_frontend_context = True
-        request.frontend_context = {}
+        request.frontend_context = FrontendContext()
         return self.get_response(request)
@@ -0,0 +1,26 @@
+from debug_toolbar.panels import Panel
+from django.utils.translation import gettext_lazy as _
+
+
+class MisagoContextProcessorsPanel(Panel):
+    """panel that displays time spent on computing lazy context values"""
+
+    title = _("Misago Context Processors")
+    template = "misago/context_processors_debug.html"
+
+    @property
+    def nav_subtitle(self):
+        total_time = self.get_stats().get("total_time") or 0
+        return _("%(time).2fms") % {"time": total_time * 1000}
+
+    def generate_stats(self, request, response):
+        timings = getattr(request, "context_processors_timings", [])
+        self.record_stats(
+            {
+                "timings": [
+                    {"name": name, "time": duration * 1000}
+                    for name, duration in timings
+                ],
+                "total_time": sum(duration for name, duration in timings),
+            }
+        )
@@ -3,6 +3,7 @@ import json
 from django import template
 from django.utils.safestring import mark_safe
 
+from ..frontendcontext import FrontendContext
 from ..utils import encode_json_html
 
 register = template.Library()
@@ -10,6 +11,9 @@ register = template.Library()
 
 @register.filter
 def as_json(value):
-    json_dump = json.dumps(value)
+    if isinstance(value, FrontendContext):
+        json_dump = value.to_json()
+    else:
+        json_dump = json.dumps(value)
     # fixes XSS as described in #651
     return mark_safe(encode_json_html(json_dump))
@@ -0,0 +1,79 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+from django.test import override_settings
+from django.utils import translation
+
+from ...conf.cache import settings_cache
+from ..frontendcontext import (
+    FrontendContext,
+    build_frontend_context_fragment,
+    update_frontend_context,
+)
+from ..templatetags.misago_json import as_json
+
+
+@pytest.fixture(autouse=True)
+def clear_settings_cache():
+    settings_cache.clear_local()
+    yield
+    settings_cache.clear_local()
+
+
+def test_frontend_context_json_is_same_as_dict_json():
+    frontend_context = FrontendContext({"user": {"id": 1}})
+    frontend_context.update_shared(
+        build_frontend_context_fragment({"SETTINGS": {"forum_name": "Misago"}})
+    )
+    frontend_context["CURRENT_LINK"] = "misago:index"
+
+    assert frontend_context.to_json() == json.dumps(dict(frontend_context))
+
+
+def test_frontend_context_json_reuses_shared_values_json():
+    frontend_context = FrontendContext()
+    frontend_context.update_shared({"SETTINGS": ({"forum_name": "Misago"}, '"json"')})
+    assert frontend_context.to_json() == '{"SETTINGS": "json"}'
+
+
+def test_frontend_context_json_serializes_replaced_shared_values():
+    frontend_context = FrontendContext()
+    frontend_context.update_shared({"SETTINGS": ({"forum_name": "Misago"}, '"json"')})
+    frontend_context["SETTINGS"] = {"forum_name": "Changed"}
+    assert frontend_context.to_json() == '{"SETTINGS": {"forum_name": "Changed"}}'
+
+
+def test_as_json_filter_serializes_frontend_context():
+    frontend_context = FrontendContext({"html": "</script>"})
+    assert as_json(frontend_context) == as_json({"html": "</script>"})
+
+
+def test_update_frontend_context_adds_values_to_plain_dict(cache_versions):
+    request = Mock(frontend_context={}, cache_versions=cache_versions)
+    update_frontend_context(request, settings_cache, "test", lambda: {"a": 1})
+    assert request.frontend_context == {"a": 1}
+
+
+@override_settings(MISAGO_VERSIONED_CACHE_LOCAL_SIZE=10)
+def test_frontend_context_fragment_is_built_once(db, cache_versions):
+    build = Mock(return_value={"a": 1})
+    for _ in range(2):
+        request = Mock(
+            frontend_context=FrontendContext(), cache_versions=cache_versions
+        )
+        update_frontend_context(request, settings_cache, "test", build)
+        assert request.frontend_context == {"a": 1}
+
+    build.assert_called_once()
+
+
+@override_settings(MISAGO_VERSIONED_CACHE_LOCAL_SIZE=10)
+def test_frontend_context_fragment_is_built_for_each_language(db, cache_versions):
+    build = Mock(return_value={"a": 1})
+    for language in ("en", "pl", "en"):
+        with translation.override(language):
+            request = Mock(frontend_context={}, cache_versions=cache_versions)
+            update_frontend_context(request, settings_cache, "test", build)
+
+    assert build.call_count == 2
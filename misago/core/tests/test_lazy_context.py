@@ -0,0 +1,71 @@
+from unittest.mock import Mock
+
+from django.test import override_settings
+
+from ..frontendcontext import FrontendContext, update_frontend_context_lazily
+from ..lazycontext import lazy_context_value
+from ..panels import MisagoContextProcessorsPanel
+
+
+class MockRequest:
+    def __init__(self, frontend_context=None):
+        self.frontend_context = frontend_context
+
+
+def test_lazy_context_value_is_computed_when_its_read():
+    get_value = Mock(return_value=[1, 2])
+    value = lazy_context_value(MockRequest(), "test", get_value)
+    get_value.assert_not_called()
+
+    assert len(value) == 2
+    assert list(value) == [1, 2]
+    get_value.assert_called_once()
+
+
+def test_lazy_context_value_is_not_timed_if_debug_is_disabled():
+    request = MockRequest()
+    value = lazy_context_value(request, "test", lambda: {"a": 1})
+    assert value["a"] == 1
+    assert not hasattr(request, "context_processors_timings")
+
+
+@override_settings(DEBUG=True)
+def test_lazy_context_value_is_timed_in_debug_mode():
+    request = MockRequest()
+    value = lazy_context_value(request, "test", lambda: {"a": 1})
+    assert value["a"] == 1
+
+    assert len(request.context_processors_timings) == 1
+    assert request.context_processors_timings[0][0] == "test"
+
+
+def test_lazy_frontend_context_update_is_ran_when_context_is_serialized():
+    request = MockRequest(FrontendContext())
+    update = Mock(side_effect=lambda context: context.update({"a": 1}))
+    update_frontend_context_lazily(request, "test", update)
+    update.assert_not_called()
+
+    assert request.frontend_context.to_json() == '{"a": 1}'
+    update.assert_called_once()
+
+
+def test_lazy_frontend_context_update_is_ran_at_once_for_plain_dict():
+    request = MockRequest({})
+    update_frontend_context_lazily(
+        request, "test", lambda context: context.update({"a": 1})
+    )
+    assert request.frontend_context == {"a": 1}
+
+
+@override_settings(DEBUG=True)
+def test_context_processors_panel_reports_timings():
+    request = MockRequest()
+    request.context_processors_timings = [("menus", 0.002), ("theme", 0.001)]
+
+    panel = MisagoContextProcessorsPanel(Mock(), Mock())
+    panel.record_stats = Mock()
+    panel.generate_stats(request, Mock())
+
+    stats = panel.record_stats.call_args[0][0]
+    assert [timing["name"] for timing in stats["timings"]] == ["menus", "theme"]
+    assert stats["total_time"] == 0.003
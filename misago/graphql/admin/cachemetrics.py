@@ -0,0 +1,20 @@
+from ariadne import QueryType
+
+from ...cache.metrics import cache_metrics as metrics
+
+cache_metrics = QueryType()
+
+
+@cache_metrics.field("cacheMetrics")
+def resolve_cache_metrics(*_):
+    return [
+        {
+            "cache": row["cache"],
+            "hits": row["hits"],
+            "misses": row["misses"],
+            "rebuilds": row["rebuilds"],
+            "rebuildTime": row["rebuild_time"],
+            "maxRebuildTime": row["max_rebuild_time"],
+        }
+        for row in metrics.get_metrics()
+    ]
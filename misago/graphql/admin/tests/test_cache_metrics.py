@@ -0,0 +1,44 @@
+import pytest
+from ariadne import gql
+
+from ....cache.metrics import cache_metrics
+
+test_query = gql(
+    """
+        {
+            cacheMetrics {
+                cache
+                hits
+                misses
+                rebuilds
+                rebuildTime
+                maxRebuildTime
+            }
+        }
+    """
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_cache_metrics():
+    cache_metrics.reset()
+    yield
+    cache_metrics.reset()
+
+
+def test_cache_metrics_query_returns_metrics(admin_graphql_client):
+    cache_metrics.record_hit("test")
+    cache_metrics.record_miss("test")
+    cache_metrics.record_rebuild("test", 2)
+    result = admin_graphql_client.query(test_query)
+    test_metrics = [i for i in result["cacheMetrics"] if i["cache"] == "test"]
+    assert test_metrics == [
+        {
+            "cache": "test",
+            "hits": 1,
+            "misses": 1,
+            "rebuilds": 1,
+            "rebuildTime": 2,
+            "maxRebuildTime": 2,
+        }
+    ]
@@ -1,6 +1,23 @@
+from django.test import override_settings
 from django.urls import reverse
 
+from ..cache.metrics import cache_metrics
+
 
 def test_healtcheck_returns_200_response(db, client):
     response = client.get(reverse("misago:healthcheck"))
     assert response.status_code == 200
+
+
+def test_metrics_endpoint_is_disabled_by_default(db, client):
+    response = client.get(reverse("misago:metrics"))
+    assert response.status_code == 404
+
+
+@override_settings(MISAGO_CACHE_METRICS_ENDPOINT=True)
+def test_metrics_endpoint_returns_cache_metrics(db, client):
+    cache_metrics.record_hit("test")
+    response = client.get(reverse("misago:metrics"))
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain")
+    assert 'misago_cache_hits_total{cache="test"}' in response.content.decode()
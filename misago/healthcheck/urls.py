@@ -1,5 +1,8 @@
 from django.urls import path
 
-from .views import healthcheck
+from .views import healthcheck, metrics
 
-urlpatterns = [path("healthcheck/", healthcheck, name="healthcheck")]
+urlpatterns = [
+    path("healthcheck/", healthcheck, name="healthcheck"),
+    path("metrics/", metrics, name="metrics"),
+]
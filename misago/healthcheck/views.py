@@ -1,7 +1,20 @@
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from rest_framework.decorators import action
 
+from ..cache.metrics import cache_metrics, render_prometheus_metrics
+from ..conf import settings
+
 
 @action(methods=["get"], detail=True)
 def healthcheck(request):
     return JsonResponse({"status": "OK"})
+
+
+def metrics(request):
+    if not settings.MISAGO_CACHE_METRICS_ENDPOINT:
+        raise Http404()
+
+    return HttpResponse(
+        render_prometheus_metrics(cache_metrics.get_metrics()),
+        content_type="text/plain; version=0.0.4",
+    )
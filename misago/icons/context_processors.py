@@ -1,5 +1,10 @@
+from ..core.lazycontext import lazy_context_value
 from .models import Icon
 
 
 def icons(request):
-    return {"icons": {i.type: i.image.url for i in Icon.objects.all()}}
+    return {"icons": lazy_context_value(request, "icons", get_icons)}
+
+
+def get_icons():
+    return {i.type: i.image.url for i in Icon.objects.all()}
@@ -1,9 +1,16 @@
 from django.urls import reverse
 
+from ..conf.cache import settings_cache
+from ..core.frontendcontext import update_frontend_context
+
 
 def preload_api_url(request):
-    request.frontend_context.update(
-        {"PARSE_MARKUP_API": reverse("misago:api:parse-markup")}
+    update_frontend_context(
+        request, settings_cache, "markup_urls", get_markup_urls_frontend_context
     )
 
     return {}
+
+
+def get_markup_urls_frontend_context():
+    return {"PARSE_MARKUP_API": reverse("misago:api:parse-markup")}
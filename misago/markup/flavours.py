@@ -1,4 +1,4 @@
-from .parser import parse
+from .parsingcache import parse_with_cache
 
 
 def common(request, poster, text, allow_mentions=True, force_shva=False):
@@ -12,7 +12,7 @@ def common(request, poster, text, allow_mentions=True, force_shva=False):
 
     Returns dict object
     """
-    return parse(
+    return parse_with_cache(
         text, request, poster, allow_mentions=allow_mentions, force_shva=force_shva
     )
 
@@ -26,7 +26,7 @@ def limited(request, text):
 
     Returns parsed text
     """
-    result = parse(
+    result = parse_with_cache(
         text,
         request,
         request.user,
@@ -40,7 +40,7 @@ def limited(request, text):
 
 
 def signature(request, owner, user_acl, text):
-    result = parse(
+    result = parse_with_cache(
         text,
         request,
         owner,
@@ -1,8 +1,11 @@
 import html
 from dataclasses import dataclass
+from html.parser import HTMLParser
 
 import html5lib
 
+from ..conf import settings
+
 SINGLETON_TAGS = (
     "area",
     "base",
@@ -22,37 +25,75 @@ SINGLETON_TAGS = (
     "wbr",
 )
 
+# Tags that close open paragraph, and tags that limit search for it
+CLOSE_P_TAGS = (
+    "address",
+    "article",
+    "aside",
+    "blockquote",
+    "center",
+    "details",
+    "dialog",
+    "dir",
+    "div",
+    "dl",
+    "fieldset",
+    "figcaption",
+    "figure",
+    "footer",
+    "form",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "header",
+    "hgroup",
+    "hr",
+    "listing",
+    "main",
+    "menu",
+    "nav",
+    "ol",
+    "p",
+    "pre",
+    "section",
+    "summary",
+    "ul",
+)
+P_SCOPE_TAGS = (
+    "applet",
+    "button",
+    "caption",
+    "marquee",
+    "object",
+    "table",
+    "td",
+    "template",
+    "th",
+)
+
 
 class Node:
+    __slots__ = ()
+
     def __str__(self):
-        raise NotImplementedError("Subclasses of 'Node' need to implement __str__")
+        return print_html_string(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class RootNode(Node):
     tag = None
     children: list
 
-    def __str__(self):
-        return "".join(str(child) for child in self.children)
-
 
-@dataclass
+@dataclass(slots=True)
 class ElementNode(Node):
     tag: str
     attrs: dict
     children: list
 
-    def __str__(self):
-        attrs_padding = " " if self.attrs else ""
-        attrs = " ".join(self.attrs_str())
-
-        if self.tag in SINGLETON_TAGS:
-            return f"<{self.tag}{attrs_padding}{attrs} />"
-
-        children = "".join(str(child) for child in self.children)
-        return f"<{self.tag}{attrs_padding}{attrs}>{children}</{self.tag}>"
-
     def attrs_str(self):
         for name, value in self.attrs.items():
             if value is True or not value:
@@ -61,15 +102,19 @@ class ElementNode(Node):
                 yield (f'{html.escape(str(name))}="{html.escape(str(value))}"')
 
 
-@dataclass
+@dataclass(slots=True)
 class TextNode(Node):
     text: str
 
-    def __str__(self):
-        return html.escape(self.text)
-
 
 def parse_html_string(string: str) -> RootNode:
+    if settings.MISAGO_MARKUP_HTML_PARSER == "html.parser":
+        return parse_html_string_with_html_parser(string)
+
+    return parse_html_string_with_html5lib(string)
+
+
+def parse_html_string_with_html5lib(string: str) -> RootNode:
     element = html5lib.parse(
         string,
         namespaceHTMLElements=False,
@@ -81,30 +126,132 @@ def parse_html_string(string: str) -> RootNode:
     if body.text:
         root_node.children.append(TextNode(text=body.text))
 
-    for child in body:
-        add_child_node(root_node, child)
+    # Walk elements with explicit stack so deeply nested quotes don't hit
+    # Python's recursion limit
+    stack = [(root_node, child) for child in reversed(body)]
+    while stack:
+        parent, element = stack.pop()
+
+        node = ElementNode(
+            tag=element.tag,
+            attrs=element.attrib,
+            children=[],
+        )
+
+        if element.text:
+            node.children.append(TextNode(text=element.text))
+
+        parent.children.append(node)
+
+        if element.tail:
+            parent.children.append(TextNode(text=element.tail))
+
+        stack.extend((node, child) for child in reversed(element))
 
     return root_node
 
 
-def add_child_node(parent, element):
-    node = ElementNode(
-        tag=element.tag,
-        attrs=element.attrib,
-        children=[],
-    )
+def parse_html_string_with_html_parser(string: str) -> RootNode:
+    parser = TreeBuilder()
+    parser.feed(string)
+    parser.close()
+    return parser.root_node
+
+
+class TreeBuilder(HTMLParser):
+    """
+    Builds nodes tree using Python's html.parser
+
+    Faster alternative to html5lib for HTML produced by markdown. Like html5lib
+    it closes paragraphs containing block elements, but it doesn't implement
+    other rules for fixing misnested HTML.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root_node = RootNode(children=[])
+        self.stack = [self.root_node]
+
+    def handle_starttag(self, tag, attrs):
+        if tag in CLOSE_P_TAGS:
+            self.close_p()
+
+        node_attrs = {}
+        for name, value in attrs:
+            node_attrs.setdefault(name, "" if value is None else value)
 
-    if element.text:
-        node.children.append(TextNode(text=element.text))
+        node = ElementNode(tag=tag, attrs=node_attrs, children=[])
+        self.stack[-1].children.append(node)
+        if tag not in SINGLETON_TAGS:
+            self.stack.append(node)
 
-    parent.children.append(node)
+    def handle_startendtag(self, tag, attrs):
+        # Like html5lib, treat self-closing non-void elements as opened
+        self.handle_starttag(tag, attrs)
 
-    if element.tail:
-        parent.children.append(TextNode(text=element.tail))
+    def handle_endtag(self, tag):
+        if tag == "p" and not self.close_p():
+            # Like html5lib, replace </p> without opening tag with empty paragraph
+            self.stack[-1].children.append(ElementNode(tag="p", attrs={}, children=[]))
+            return
 
-    for child in element:
-        add_child_node(node, child)
+        for index in range(len(self.stack) - 1, 0, -1):
+            if self.stack[index].tag == tag:
+                del self.stack[index:]
+                return
 
+    def close_p(self) -> bool:
+        for index in range(len(self.stack) - 1, 0, -1):
+            node_tag = self.stack[index].tag
+            if node_tag == "p":
+                del self.stack[index:]
+                return True
+            if node_tag in P_SCOPE_TAGS:
+                break
+
+        return False
+
+    def handle_data(self, data):
+        parent = self.stack[-1]
+        if parent.tag == "pre" and not parent.children and data[:1] == "\n":
+            data = data[1:]  # Like html5lib, drop newline after opening <pre>
+            if not data:
+                return
+
+        if parent.children and isinstance(parent.children[-1], TextNode):
+            parent.children[-1].text += data
+        else:
+            parent.children.append(TextNode(text=data))
+
+
+def print_html_string(root_node: Node) -> str:
+    buffer = []
+    write = buffer.append
+    escape = html.escape
+
+    # Closing tags and other strings on the stack are written as they are
+    stack = [root_node]
+    while stack:
+        node = stack.pop()
+
+        if isinstance(node, TextNode):
+            write(escape(node.text))
+        elif isinstance(node, ElementNode):
+            write("<")
+            write(node.tag)
+            if node.attrs:
+                write(" ")
+                write(" ".join(node.attrs_str()))
+
+            if node.tag in SINGLETON_TAGS:
+                write(" />")
+            else:
+                write(">")
+                stack.append(f"</{node.tag}>")
+                stack.extend(reversed(node.children))
+        elif isinstance(node, RootNode):
+            stack.extend(reversed(node.children))
+        else:
+            write(str(node))
 
-def print_html_string(root_node: RootNode) -> str:
-    return str(root_node)
+    return "".join(buffer)
@@ -0,0 +1,137 @@
+from typing import Union
+
+from .htmlparser import ElementNode, RootNode, TextNode
+from .links import URL_RE, clean_image_node, clean_link_node, replace_links_in_text
+from .mentions import (
+    EXCLUDE_ELEMENTS,
+    MENTIONS_LIMIT,
+    add_mentions_to_text,
+    find_mentions_in_str,
+    get_users_data,
+)
+
+
+class HtmlTreeProcessor:
+    """
+    Linkifies texts, adds mentions and cleans links and images in a single
+    traversal of parsed HTML tree
+
+    Mentioned users are looked up after the traversal, so only nodes that
+    contain mentions are visited again to replace them with links.
+    """
+
+    def __init__(
+        self,
+        request,
+        result: dict,
+        allow_mentions=True,
+        allow_links=True,
+        allow_images=True,
+        force_shva=False,
+    ):
+        self.request = request
+        self.result = result
+        self.linkify = allow_links
+        self.find_mentions = allow_mentions and "@" in result["parsed_text"]
+        self.clean_links = allow_links or allow_images
+        self.force_shva = force_shva
+
+        self.mentions = set()
+        self.mentions_nodes = []
+
+    def process(self, root_node: RootNode):
+        self.visit_node(root_node, False)
+
+        if self.mentions and len(self.mentions) <= MENTIONS_LIMIT:
+            self.add_mentions()
+
+    def visit_node(self, node: Union[RootNode, ElementNode], is_excluded: bool):
+        new_children = []
+        has_mentions = False
+
+        for child in node.children:
+            if isinstance(child, ElementNode):
+                new_children.append(child)
+                self.visit_element(child, is_excluded)
+            elif is_excluded:
+                new_children.append(child)
+            elif self.linkify and URL_RE.search(child.text):
+                for new_child in replace_links_in_text(child.text):
+                    new_children.append(new_child)
+                    if isinstance(new_child, ElementNode):
+                        self.clean_element(new_child)
+                    elif self.find_mentions_in_text(new_child):
+                        has_mentions = True
+            else:
+                new_children.append(child)
+                if self.find_mentions_in_text(child):
+                    has_mentions = True
+
+        node.children = new_children
+        if has_mentions:
+            self.mentions_nodes.append(node)
+
+    def visit_element(self, node: ElementNode, is_excluded: bool):
+        self.clean_element(node)
+        if node.tag != "img":
+            self.visit_node(node, is_excluded or node.tag in EXCLUDE_ELEMENTS)
+
+    def clean_element(self, node: ElementNode):
+        if not self.clean_links:
+            return
+
+        if node.tag == "a":
+            clean_link_node(self.request, self.result, node, self.force_shva)
+        elif node.tag == "img":
+            clean_image_node(self.request, self.result, node, self.force_shva)
+
+    def find_mentions_in_text(self, node: TextNode) -> bool:
+        if not self.find_mentions:
+            return False
+
+        mentions = find_mentions_in_str(node.text)
+        if mentions:
+            self.mentions.update(mentions)
+            return True
+
+        return False
+
+    def add_mentions(self):
+        users_data = get_users_data(self.mentions)
+        if not users_data:
+            return  # Mentioned users don't exist
+
+        for node in self.mentions_nodes:
+            new_children = []
+            for child in node.children:
+                if isinstance(child, TextNode):
+                    for new_child in add_mentions_to_text(child.text, users_data):
+                        new_children.append(new_child)
+                        if isinstance(new_child, ElementNode):
+                            self.clean_element(new_child)
+                else:
+                    new_children.append(child)
+
+            node.children = new_children
+
+        self.result["mentions"] = sorted(user[0] for user in users_data.values())
+
+
+def process_html_tree(
+    request,
+    result: dict,
+    root_node: RootNode,
+    allow_mentions=True,
+    allow_links=True,
+    allow_images=True,
+    force_shva=False,
+):
+    processor = HtmlTreeProcessor(
+        request,
+        result,
+        allow_mentions=allow_mentions,
+        allow_links=allow_links,
+        allow_images=allow_images,
+        force_shva=force_shva,
+    )
+    processor.process(root_node)
@@ -1,12 +1,15 @@
 import re
+from functools import lru_cache
 from typing import Union
 
 from django.http import Http404
-from django.urls import resolve
+from django.urls import get_urlconf, resolve
 
+from ..conf import settings
 from .htmlparser import ElementNode, RootNode, TextNode
 
 MISAGO_ATTACHMENT_VIEWS = ("misago:attachment", "misago:attachment-thumbnail")
+RESOLVED_LINKS_CACHE_SIZE = 2000
 URL_RE = re.compile(
     r"(https?://)?"
     r"(www\.)?"
@@ -38,20 +41,15 @@ def linkify_texts(node: Union[RootNode, ElementNode]):
 
 def replace_links_in_text(text: str) -> list:
     nodes = []
+    position = 0
 
-    while True:
-        match = URL_RE.search(text)
-        if not match:
-            if text:
-                nodes.append(TextNode(text=text))
-            return nodes
-
+    for match in URL_RE.finditer(text):
         start, end = match.span()
-        url = text[start:end]
+        url = match.group(0)
 
-        # Append text between 0 and start to nodes
-        if start > 0:
-            nodes.append(TextNode(text=text[:start]))
+        # Append text between previous link and this one to nodes
+        if start > position:
+            nodes.append(TextNode(text=text[position:start]))
 
         nodes.append(
             ElementNode(
@@ -63,7 +61,12 @@ def replace_links_in_text(text: str) -> list:
             )
         )
 
-        text = text[end:]
+        position = end
+
+    if position < len(text):
+        nodes.append(TextNode(text=text[position:]))
+
+    return nodes
 
 
 def clean_links(
@@ -183,17 +186,23 @@ def clean_internal_link(link, host):
 
 
 def clean_attachment_link(link, force_shva=False):
-    try:
-        resolution = resolve(link)
-        if not resolution.namespaces:
-            return link
-        url_name = ":".join(resolution.namespaces + [resolution.url_name])
-    except (Http404, ValueError):
-        return link
-
+    url_name = get_link_url_name(link, get_urlconf() or settings.ROOT_URLCONF)
     if url_name in MISAGO_ATTACHMENT_VIEWS:
         if force_shva:
             link = "%s?shva=1" % link
         elif link.endswith("?shva=1"):
             link = link[:-7]
     return link
+
+
+@lru_cache(maxsize=RESOLVED_LINKS_CACHE_SIZE)
+def get_link_url_name(link, urlconf):
+    """returns namespaced name of view link resolves to, memoized per urlconf"""
+    try:
+        resolution = resolve(link, urlconf)
+    except (Http404, ValueError):
+        return None
+
+    if not resolution.namespaces:
+        return None
+    return ":".join(resolution.namespaces + [resolution.url_name])
@@ -0,0 +1,78 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...links import clean_attachment_link, get_link_url_name, replace_links_in_text
+from ...mentions import add_mentions_to_text
+
+LINK_TEXT = "See http://example.com/t/thread-%s/%s/ and ask @user%s about it. "
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures time needed to linkify texts, add mentions to them and resolve "
+        "internal links in link-heavy posts of growing length."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--links",
+            dest="links",
+            default=[10, 100, 1000, 5000],
+            nargs="+",
+            type=int,
+            help="Numbers of links in benchmarked posts.",
+        )
+        parser.add_argument(
+            "--repeat",
+            dest="repeat",
+            default=3,
+            type=int,
+            help="Number of times each benchmark is repeated.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            "%8s %14s %14s %14s %14s"
+            % ("links", "linkify", "mentions", "resolve-cold", "resolve-warm")
+        )
+
+        for links in options["links"]:
+            text = "".join(LINK_TEXT % (i, i, i) for i in range(links))
+            users_data = {"user%s" % i: (i, "User%s" % i) for i in range(links)}
+            paths = ["/t/thread-%s/%s/" % (i, i) for i in range(links)]
+
+            results = [
+                self.benchmark(lambda: replace_links_in_text(text), options),
+                self.benchmark(lambda: add_mentions_to_text(text, users_data), options),
+                self.benchmark(lambda: resolve_links(paths, clear_cache=True), options),
+                self.benchmark(lambda: resolve_links(paths), options),
+            ]
+
+            self.stdout.write(
+                "%8s %s"
+                % (
+                    links,
+                    " ".join(
+                        "%8.1fus/link" % (result / links * 1000000)
+                        for result in results
+                    ),
+                )
+            )
+
+    def benchmark(self, func, options):
+        best_time = None
+        for _ in range(options["repeat"]):
+            start_time = time.perf_counter()
+            func()
+            run_time = time.perf_counter() - start_time
+            if best_time is None or run_time < best_time:
+                best_time = run_time
+        return best_time
+
+
+def resolve_links(paths, clear_cache=False):
+    if clear_cache:
+        get_link_url_name.cache_clear()
+    for path in paths:
+        clean_attachment_link(path)
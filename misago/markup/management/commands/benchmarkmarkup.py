@@ -0,0 +1,97 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ....threads.models import Post
+from ...parser import md_factory, pooled_markdown
+
+SAMPLE_TEXT = """
+Hello **world**! This is [b]sample[/b] post with [url=http://example.com]link[/url].
+
+> Quoted text
+> with two lines
+
+[quote="Bob"]
+Nested [i]quote[/i] with ~~deleted~~ text.
+[/quote]
+
+```python
+print("Hello world!")
+```
+
+* First item
+* Second item
+""".strip()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares average time needed to convert post's markdown to HTML with "
+        "markdown object created for every post and with pooled markdown objects."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--posts",
+            dest="posts",
+            default=500,
+            type=int,
+            help="Number of most recent posts to parse.",
+        )
+        parser.add_argument(
+            "--repeat",
+            dest="repeat",
+            default=3,
+            type=int,
+            help="Number of times each benchmark is repeated.",
+        )
+
+    def handle(self, *args, **options):
+        texts = list(
+            Post.objects.order_by("-id").values_list("original", flat=True)[
+                : options["posts"]
+            ]
+        )
+        if not texts:
+            texts = [SAMPLE_TEXT] * options["posts"]
+
+        self.stdout.write(
+            "Parsing %s posts %s times...\n" % (len(texts), options["repeat"])
+        )
+
+        benchmarks = [
+            ("new-engine", convert_with_new_engine),
+            ("pooled-engine", convert_with_pooled_engine),
+        ]
+
+        results = {}
+        for name, convert in benchmarks:
+            results[name] = self.benchmark(convert, texts, options["repeat"])
+            if results[name]["html"] != results["new-engine"]["html"]:
+                self.stderr.write("%s returned different HTML!" % name)
+
+        for name, result in results.items():
+            self.stdout.write(
+                "%-14s %8.3fs %8.1fus per post"
+                % (name, result["time"], result["time"] / len(texts) * 1000000)
+            )
+
+    def benchmark(self, convert, texts, repeat):
+        best_time = None
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            html = [convert(text) for text in texts]
+            convert_time = time.perf_counter() - start_time
+            if best_time is None or convert_time < best_time:
+                best_time = convert_time
+
+        return {"html": html, "time": best_time}
+
+
+def convert_with_new_engine(text):
+    return md_factory().convert(text)
+
+
+def convert_with_pooled_engine(text):
+    with pooled_markdown() as md:
+        return md.convert(text)
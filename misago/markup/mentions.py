@@ -1,8 +1,6 @@
 import re
 from typing import Union
 
-from django.contrib.auth import get_user_model
-
 from .htmlparser import (
     ElementNode,
     RootNode,
@@ -33,7 +31,7 @@ def add_mentions(result, root_node):
     for node in nodes:
         add_mentions_to_node(node, users_data)
 
-    result["mentions"] = [user[0] for user in users_data.values()]
+    result["mentions"] = sorted(user[0] for user in users_data.values())
 
 
 def find_mentions(
@@ -65,18 +63,18 @@ def find_mentions_in_str(text: str):
     return set([match.lower()[1:] for match in matches])
 
 
-def get_users_data(mentions):
-    User = get_user_model()
-    users_data = {}
+def find_mentions_in_texts(texts):
+    mentions = set()
+    for text in texts:
+        if "@" in text:
+            mentions.update(find_mentions_in_str(text) or ())
+    return mentions
 
-    queryset = User.objects.filter(slug__in=mentions).values_list(
-        "id", "username", "slug"
-    )
 
-    for user_id, username, slug in queryset:
-        users_data[slug] = (user_id, username)
+def get_users_data(mentions):
+    from ..users.mentions import resolve_mentions
 
-    return users_data
+    return resolve_mentions(mentions)
 
 
 def add_mentions_to_node(node, users_data):
@@ -93,27 +91,20 @@ def add_mentions_to_node(node, users_data):
 
 def add_mentions_to_text(text: str, users_data):
     nodes = []
+    position = 0
 
-    while True:
-        match = USERNAME_RE.search(text)
-        if not match:
-            if text:
-                nodes.append(TextNode(text=text))
-            return nodes
-
+    for match in USERNAME_RE.finditer(text):
         start, end = match.span()
         user_slug = text[start + 1 : end].lower()
 
-        # Append text between 0 and start to nodes
-        if start > 0:
-            nodes.append(TextNode(text=text[:start]))
-
-        # Append match string to nodes and keep scanning
+        # Leave mentions of users that don't exist in the text
         if user_slug not in users_data:
-            nodes.append(TextNode(text=text[:end]))
-            text = text[end:]
             continue
 
+        # Append text between previous mention and this one to nodes
+        if start > position:
+            nodes.append(TextNode(text=text[position:start]))
+
         user_id, username = users_data[user_slug]
         nodes.append(
             ElementNode(
@@ -126,4 +117,9 @@ def add_mentions_to_text(text: str, users_data):
             )
         )
 
-        text = text[end:]
+        position = end
+
+    if position < len(text):
+        nodes.append(TextNode(text=text[position:]))
+
+    return nodes
@@ -1,3 +1,6 @@
+from contextlib import contextmanager
+from threading import local
+
 import markdown
 from markdown.extensions.fenced_code import FencedCodeExtension
 
@@ -7,12 +10,13 @@ from .bbcode.inline import bold, image, italics, underline, url
 from .bbcode.quote import QuoteExtension
 from .bbcode.spoiler import SpoilerExtension
 from .htmlparser import parse_html_string, print_html_string
-from .links import clean_links, linkify_texts
+from .htmlprocessor import process_html_tree
 from .md.shortimgs import ShortImagesExtension
 from .md.strikethrough import StrikethroughExtension
-from .mentions import add_mentions
 from .pipeline import pipeline
 
+_markdown_pool = local()
+
 
 def parse(
     text,
@@ -32,47 +36,97 @@ def parse(
     Breaks text into paragraphs, supports code, spoiler and quote blocks,
     headers, lists, images, spoilers, text styles
 
-    Returns dict object
+    Returns dict object. Its "markdown" key is None, because markdown object used
+    to parse text is only available to result processors.
     """
-    md = md_factory(
+    with pooled_markdown(
         allow_links=allow_links, allow_images=allow_images, allow_blocks=allow_blocks
-    )
+    ) as md:
+        parsing_result = {
+            "original_text": text,
+            "parsed_text": "",
+            "markdown": md,
+            "mentions": [],
+            "images": [],
+            "internal_links": [],
+            "outgoing_links": [],
+        }
+
+        # Parse text
+        parsed_text = md.convert(text)
+
+        # Clean and store parsed text
+        parsing_result["parsed_text"] = parsed_text.strip()
+
+        # Run additional operations and let plugins do their magic
+        if (
+            allow_mentions
+            or allow_links
+            or allow_images
+            or pipeline.has_result_processors()
+        ):
+            root_node = parse_html_string(parsing_result["parsed_text"])
+
+            process_html_tree(
+                request,
+                parsing_result,
+                root_node,
+                allow_mentions=allow_mentions,
+                allow_links=allow_links,
+                allow_images=allow_images,
+                force_shva=force_shva,
+            )
+
+            parsing_result = pipeline.process_result(parsing_result, root_node)
+            parsing_result["parsed_text"] = print_html_string(root_node)
+
+    # Markdown object is reset and reused by next parse() call after it's
+    # returned to the pool, so it's only available to result processors
+    parsing_result["markdown"] = None
 
-    parsing_result = {
-        "original_text": text,
-        "parsed_text": "",
-        "markdown": md,
-        "mentions": [],
-        "images": [],
-        "internal_links": [],
-        "outgoing_links": [],
-    }
+    return parsing_result
 
-    # Parse text
-    parsed_text = md.convert(text)
 
-    # Clean and store parsed text
-    parsing_result["parsed_text"] = parsed_text.strip()
+@contextmanager
+def pooled_markdown(allow_links=True, allow_images=True, allow_blocks=True):
+    """
+    Borrows configured markdown object from current thread's pool
 
-    # Run additional operations
-    if allow_mentions or allow_links or allow_images:
-        root_node = parse_html_string(parsing_result["parsed_text"])
+    Markdown object is taken out of the pool for the time it's used, so nested
+    parse() calls get their own objects. Objects are reset and returned to the
+    pool only if they were used without errors.
+    """
+    pool = get_markdown_pool()
+    key = (allow_links, allow_images, allow_blocks)
 
-        if allow_links:
-            linkify_texts(root_node)
+    if pool.get(key):
+        md = pool[key].pop()
+    else:
+        md = md_factory(
+            allow_links=allow_links,
+            allow_images=allow_images,
+            allow_blocks=allow_blocks,
+        )
 
-        if allow_mentions:
-            add_mentions(parsing_result, root_node)
+    yield md
 
-        if allow_links or allow_images:
-            clean_links(request, parsing_result, root_node, force_shva)
+    md.reset()
+    pool.setdefault(key, []).append(md)
 
-        parsing_result["parsed_text"] = print_html_string(root_node)
 
-    # Let plugins do their magic
-    parsing_result = pipeline.process_result(parsing_result)
+def get_markdown_pool():
+    """returns current thread's pool, emptying it if markup extensions changed"""
+    extensions = pipeline.get_extensions()
+    if getattr(_markdown_pool, "extensions", None) != extensions:
+        _markdown_pool.extensions = extensions
+        _markdown_pool.engines = {}
 
-    return parsing_result
+    return _markdown_pool.engines
+
+
+def clear_markdown_pool():
+    _markdown_pool.extensions = None
+    _markdown_pool.engines = {}
 
 
 def md_factory(allow_links=True, allow_images=True, allow_blocks=True):
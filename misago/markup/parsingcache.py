@@ -0,0 +1,127 @@
+from collections import OrderedDict
+from hashlib import sha256
+from threading import Lock
+
+from ..conf import settings
+from .mentions import find_mentions_in_str, get_users_data
+from .parser import parse
+from .pipeline import pipeline
+
+
+class ParsingCache:
+    """
+    Bounded process-local cache for parsing results
+
+    Results are stored under hash of parsed text, parsing options and extensions
+    that can change parsing result. Because parsed links depend only on the
+    site's host that is part of the key, only mentions are revalidated when
+    result is read from cache, using single query for mentioned users.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.results = OrderedDict()
+        self.extensions = None
+
+    def get(self, key):
+        extensions = pipeline.get_extensions()
+        with self.lock:
+            if self.extensions != extensions:
+                self.extensions = extensions
+                self.results.clear()
+                return None
+
+            entry = self.results.get(key)
+            if entry:
+                self.results.move_to_end(key)
+
+        if entry and entry["mentions"] is not None:
+            mentions, users_data = entry["mentions"]
+            if get_users_data(mentions) != users_data:
+                return None  # Mentioned users have changed
+
+        return entry
+
+    def set(self, key, entry):
+        size = settings.MISAGO_MARKUP_PARSING_CACHE_SIZE
+        with self.lock:
+            self.results[key] = entry
+            self.results.move_to_end(key)
+            while len(self.results) > size:
+                self.results.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.results.clear()
+
+
+parsing_cache = ParsingCache()
+
+
+def parse_with_cache(
+    text,
+    request,
+    poster,
+    allow_mentions=True,
+    allow_links=True,
+    allow_images=True,
+    allow_blocks=True,
+    force_shva=False,
+):
+    """
+    Returns cached parse() result for text, parsing it only on cache miss
+    """
+    options = {
+        "allow_mentions": allow_mentions,
+        "allow_links": allow_links,
+        "allow_images": allow_images,
+        "allow_blocks": allow_blocks,
+        "force_shva": force_shva,
+    }
+
+    if not settings.MISAGO_MARKUP_PARSING_CACHE_SIZE:
+        return parse(text, request, poster, **options)
+
+    key = get_parsing_cache_key(text, request, options)
+    entry = parsing_cache.get(key)
+    if entry:
+        return copy_parsing_result(entry["result"])
+
+    result = parse(text, request, poster, **options)
+    parsing_cache.set(
+        key,
+        {
+            "result": copy_parsing_result(result),
+            "mentions": get_mentions_state(text) if allow_mentions else None,
+        },
+    )
+
+    return result
+
+
+def get_parsing_cache_key(text, request, options):
+    if options["allow_links"] or options["allow_images"]:
+        host = request.get_host()
+    else:
+        host = None
+
+    key = "%s:%s:%s" % (sorted(options.items()), host, text)
+    return sha256(key.encode("utf-8")).hexdigest()
+
+
+def get_mentions_state(text):
+    if "@" not in text:
+        return None
+
+    mentions = find_mentions_in_str(text)
+    if not mentions:
+        return None
+
+    return mentions, get_users_data(mentions)
+
+
+def copy_parsing_result(result):
+    return {
+        key: list(value) if isinstance(value, list) else value
+        for key, value in result.items()
+    }
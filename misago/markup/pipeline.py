@@ -20,14 +20,33 @@ class MarkupPipeline:
 
         return md
 
-    def process_result(self, result):
-        if (
-            not settings.MISAGO_MARKUP_EXTENSIONS
-            and not hooks.parsing_result_processors
-        ):
+    def get_extensions(self):
+        """returns extensions that may change parsing results"""
+        return (
+            tuple(settings.MISAGO_MARKUP_EXTENSIONS),
+            tuple(hooks.markdown_extensions),
+            tuple(hooks.parsing_result_processors),
+        )
+
+    def has_result_processors(self):
+        return bool(
+            settings.MISAGO_MARKUP_EXTENSIONS or hooks.parsing_result_processors
+        )
+
+    def process_result(self, result, html_tree=None):
+        """
+        Runs plugins on parsing result
+
+        If html_tree is passed, plugins change it in place and caller is
+        responsible for printing it to result's parsed_text.
+        """
+        if not self.has_result_processors():
             return result
 
-        html_tree = parse_html_string(result["parsed_text"])
+        print_html_tree = html_tree is None
+        if print_html_tree:
+            html_tree = parse_html_string(result["parsed_text"])
+
         for extension in settings.MISAGO_MARKUP_EXTENSIONS:
             module = import_module(extension)
             if hasattr(module, "clean_parsed"):
@@ -37,7 +56,8 @@ class MarkupPipeline:
         for extension in hooks.parsing_result_processors:
             extension(result, html_tree)
 
-        result["parsed_text"] = print_html_string(html_tree)
+        if print_html_tree:
+            result["parsed_text"] = print_html_string(html_tree)
         return result
 
 
@@ -1,4 +1,20 @@
-from ..htmlparser import parse_html_string, print_html_string
+import pytest
+from django.test import override_settings
+
+from ..htmlparser import (
+    ElementNode,
+    RootNode,
+    TextNode,
+    parse_html_string,
+    print_html_string,
+)
+from ..parser import parse
+
+
+@pytest.fixture(autouse=True, params=["html5lib", "html.parser"])
+def html_parser(request):
+    with override_settings(MISAGO_MARKUP_HTML_PARSER=request.param):
+        yield request.param
 
 
 def test_parser_handles_simple_html():
@@ -67,3 +83,46 @@ def test_parser_escapes_quotes_in_attributes_values():
 def test_parser_handles_bool_attributes():
     root_node = parse_html_string("<button disabled>Hello World!</button>")
     assert print_html_string(root_node) == "<button disabled>Hello World!</button>"
+
+
+def test_parser_closes_paragraph_before_block_element():
+    root_node = parse_html_string("<p>Hello<pre>World!</pre></p>")
+    assert print_html_string(root_node) == "<p>Hello</p><pre>World!</pre><p></p>"
+
+
+def test_parser_handles_deeply_nested_elements():
+    html = "<blockquote>" * 2000 + "Hello!" + "</blockquote>" * 2000
+    root_node = parse_html_string(html)
+    assert print_html_string(root_node) == html
+
+
+def test_nodes_dont_have_instance_dict():
+    text_node = TextNode(text="Hello!")
+    element_node = ElementNode(tag="p", attrs={}, children=[text_node])
+    root_node = RootNode(children=[element_node])
+
+    for node in (root_node, element_node, text_node):
+        assert not hasattr(node, "__dict__")
+
+
+def test_node_is_printed_to_html():
+    node = ElementNode(tag="a", attrs={"href": "/"}, children=[TextNode(text="<Home>")])
+    assert str(node) == '<a href="/">&lt;Home&gt;</a>'
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Hello [b]World[/b]!\n\n* Item\n* Other item",
+        "Lorem ipsum [code]http://test.com[/code] dolor",
+        '[quote="Bob"]Hello\n\n[quote]Nested[/quote][/quote]',
+        "```python\nprint('<Hello>')\n```\n\n---\n\n![img](http://test.com/a.png)",
+    ],
+)
+def test_html_parsers_build_same_tree_for_parsed_markup(request_mock, user, text):
+    with override_settings(MISAGO_MARKUP_HTML_PARSER="html5lib"):
+        html5lib_result = parse(text, request_mock, user)
+    with override_settings(MISAGO_MARKUP_HTML_PARSER="html.parser"):
+        html_parser_result = parse(text, request_mock, user)
+
+    assert html5lib_result["parsed_text"] == html_parser_result["parsed_text"]
@@ -0,0 +1,87 @@
+from ..htmlparser import ElementNode, TextNode, parse_html_string, print_html_string
+from ..htmlprocessor import process_html_tree
+from ..parser import parse
+
+
+def process_html(request, user, html, **kwargs):
+    result = {
+        "parsed_text": html,
+        "mentions": [],
+        "images": [],
+        "internal_links": [],
+        "outgoing_links": [],
+    }
+    root_node = parse_html_string(html)
+    process_html_tree(request, result, root_node, **kwargs)
+    result["parsed_text"] = print_html_string(root_node)
+    return result
+
+
+def test_processor_linkifies_text_and_cleans_created_link(request_mock, user):
+    result = process_html(request_mock, user, "<p>See other.com/page/</p>")
+    assert result["parsed_text"] == (
+        '<p>See <a href="http://other.com/page/" rel="external nofollow noopener" '
+        'target="_blank">other.com/page/</a></p>'
+    )
+    assert result["outgoing_links"] == ["other.com/page/"]
+
+
+def test_processor_adds_mentions_and_cleans_their_links(request_mock, user):
+    result = process_html(request_mock, user, f"<p>Hello @{user.username}!</p>")
+    assert result["parsed_text"] == (
+        f'<p>Hello <a href="{user.get_absolute_url()}" '
+        f'data-quote="@{user.username}" target="_blank">@{user.username}</a>!</p>'
+    )
+    assert result["mentions"] == [user.id]
+    assert result["internal_links"] == [user.get_absolute_url()]
+
+
+def test_processor_skips_linkifying_and_mentions_in_code(request_mock, user):
+    html = f"<pre><code>other.com @{user.username}</code></pre>"
+    result = process_html(request_mock, user, html)
+    assert result["parsed_text"] == html
+    assert result["mentions"] == []
+
+
+def test_processor_cleans_links_in_code(request_mock, user):
+    result = process_html(
+        request_mock, user, '<code><a href="http://example.com/t/">link</a></code>'
+    )
+    assert result["parsed_text"] == (
+        '<code><a href="/t/" target="_blank">link</a></code>'
+    )
+
+
+def test_processor_only_finds_mentions_if_links_are_disabled(request_mock, user):
+    html = f"<p>other.com @{user.username}</p>"
+    result = process_html(
+        request_mock, user, html, allow_links=False, allow_images=False
+    )
+    assert result["parsed_text"] == (
+        f'<p>other.com <a href="{user.get_absolute_url()}" '
+        f'data-quote="@{user.username}">@{user.username}</a></p>'
+    )
+
+
+def test_parser_passes_its_html_tree_to_result_processors(mocker, request_mock, user):
+    plugin = mocker.Mock()
+    mocker.patch("misago.markup.pipeline.hooks.parsing_result_processors", [plugin])
+    pipeline_parse_html = mocker.patch("misago.markup.pipeline.parse_html_string")
+
+    parse("Hello other.com!", request_mock, user)
+
+    pipeline_parse_html.assert_not_called()
+    plugin.assert_called_once()
+
+
+def test_parsing_result_processor_changes_are_included_in_parsed_text(
+    mocker, request_mock, user
+):
+    def plugin(result, html_tree):
+        html_tree.children.append(
+            ElementNode(tag="p", attrs={}, children=[TextNode(text="Plugin")])
+        )
+
+    mocker.patch("misago.markup.pipeline.hooks.parsing_result_processors", [plugin])
+    result = parse("Hello!", request_mock, user, allow_links=False)
+    assert result["parsed_text"] == "<p>Hello!</p><p>Plugin</p>"
@@ -1,3 +1,6 @@
+from django.urls import resolve as links_resolve
+
+from ..links import clean_attachment_link, get_link_url_name
 from ..parser import parse
 
 
@@ -153,3 +156,20 @@ def test_parser_skips_shva_in_attachment_link_querystring_if_force_option_is_omi
     text = "clean_links step cleans ![3.png](http://example.com/a/thumb/test/43/)"
     result = parse(text, request_mock, user)
     assert "?shva=1" not in result["parsed_text"]
+
+
+def test_attachment_link_view_name_is_resolved_once(mocker):
+    get_link_url_name.cache_clear()
+    resolve = mocker.patch("misago.markup.links.resolve", wraps=links_resolve)
+
+    assert clean_attachment_link("/a/thumb/test/43/", True) == (
+        "/a/thumb/test/43/?shva=1"
+    )
+    assert clean_attachment_link("/a/thumb/test/43/", True) == (
+        "/a/thumb/test/43/?shva=1"
+    )
+    resolve.assert_called_once()
+
+
+def test_unresolvable_link_is_not_changed():
+    assert clean_attachment_link("/not-existing/link/", True) == "/not-existing/link/"
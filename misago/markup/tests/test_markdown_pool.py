@@ -0,0 +1,122 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+
+from ..parser import clear_markdown_pool, md_factory, parse, pooled_markdown
+
+
+@pytest.fixture(autouse=True)
+def clear_pool():
+    clear_markdown_pool()
+    yield
+    clear_markdown_pool()
+
+
+def test_markdown_object_is_reused_for_same_flags():
+    with pooled_markdown() as md:
+        pass
+    with pooled_markdown() as other_md:
+        pass
+
+    assert md is other_md
+
+
+def test_different_markdown_objects_are_used_for_different_flags():
+    with pooled_markdown() as md:
+        pass
+    with pooled_markdown(allow_blocks=False) as other_md:
+        pass
+
+    assert md is not other_md
+
+
+def test_nested_parsing_uses_separate_markdown_object():
+    with pooled_markdown() as md:
+        with pooled_markdown() as other_md:
+            pass
+
+    assert md is not other_md
+
+
+def test_markdown_object_is_discarded_if_parsing_fails():
+    with pytest.raises(ValueError):
+        with pooled_markdown() as md:
+            raise ValueError()
+
+    with pooled_markdown() as other_md:
+        pass
+
+    assert md is not other_md
+
+
+def test_pool_is_emptied_when_markdown_extensions_hook_changes(mocker):
+    with pooled_markdown() as md:
+        pass
+
+    plugin = mocker.Mock()
+    mocker.patch("misago.markup.pipeline.hooks.markdown_extensions", [plugin])
+    with pooled_markdown() as other_md:
+        pass
+
+    assert md is not other_md
+    plugin.assert_called_once_with(other_md)
+
+
+def test_pool_is_emptied_when_markup_extensions_setting_changes():
+    with pooled_markdown() as md:
+        pass
+
+    with override_settings(MISAGO_MARKUP_EXTENSIONS=["misago.markup.tests"]):
+        with pooled_markdown() as other_md:
+            pass
+
+    assert md is not other_md
+
+
+def test_reused_markdown_object_produces_same_html_as_new_one():
+    text = (
+        "[quote]Hello **world**![/quote]\n\n[spoiler]Secret[/spoiler]\n\n```\ncode\n```"
+    )
+    for _ in range(2):
+        with pooled_markdown() as md:
+            assert md.convert(text) == md_factory().convert(text)
+
+
+def test_parser_returns_same_result_for_repeated_calls(request_mock, user):
+    text = "Hello [b]world[/b], see [url]http://example.com[/url]!"
+    result = parse(text, request_mock, user)
+    assert parse(text, request_mock, user)["parsed_text"] == result["parsed_text"]
+
+
+def test_parser_doesnt_return_pooled_markdown_object(request_mock, user):
+    assert parse("Hello!", request_mock, user)["markdown"] is None
+
+
+def test_result_processors_are_given_markdown_object_used_by_parser(
+    mocker, request_mock, user
+):
+    markdown_objects = []
+
+    def plugin(result, html_tree):
+        markdown_objects.append(result["markdown"])
+
+    mocker.patch("misago.markup.pipeline.hooks.parsing_result_processors", [plugin])
+    parse("Hello!", request_mock, user)
+
+    with pooled_markdown() as md:
+        pass
+
+    assert markdown_objects == [md]
+
+
+def test_benchmark_command_compares_new_and_pooled_engines(db):
+    stdout = StringIO()
+    stderr = StringIO()
+    call_command("benchmarkmarkup", posts=2, repeat=1, stdout=stdout, stderr=stderr)
+
+    output = stdout.getvalue()
+    assert "new-engine" in output
+    assert "pooled-engine" in output
+    assert not stderr.getvalue()
@@ -1,3 +1,6 @@
+from django.test import override_settings
+
+from ...users.mentions import mentions_resolver
 from ..htmlparser import parse_html_string, print_html_string
 from ..mentions import add_mentions
 
@@ -108,3 +111,33 @@ def test_util_handles_text_without_mentions(db):
     parsing_result["parsed_text"] = print_html_string(root_node)
     assert parsing_result["parsed_text"] == ("<p>Hello, world!</p>")
     assert parsing_result["mentions"] == []
+
+
+def test_util_keeps_text_around_mentions_of_nonexisting_users(user):
+    parsing_result = {
+        "parsed_text": f"<p>Hi @OtherUser and @{user.username}!</p>",
+        "mentions": [],
+    }
+    root_node = parse_html_string(parsing_result["parsed_text"])
+
+    add_mentions(parsing_result, root_node)
+
+    parsing_result["parsed_text"] = print_html_string(root_node)
+    assert parsing_result["parsed_text"] == (
+        f'<p>Hi @OtherUser and <a href="{user.get_absolute_url()}" '
+        f'data-quote="@{user.username}">@{user.username}</a>!</p>'
+    )
+
+
+@override_settings(MISAGO_MENTIONS_CACHE_SIZE=10)
+def test_mentions_are_added_to_parsing_result_in_order_of_users_ids(user, other_user):
+    mentions_resolver.clear()
+
+    # Resolve second user first so it's read from cache before first user
+    for mentioned_users in ([other_user], [user, other_user]):
+        text = " ".join(f"@{mentioned.username}" for mentioned in mentioned_users)
+        parsing_result = {"parsed_text": f"<p>{text}</p>", "mentions": []}
+        add_mentions(parsing_result, parse_html_string(parsing_result["parsed_text"]))
+
+    mentions_resolver.clear()
+    assert parsing_result["mentions"] == sorted([user.id, other_user.id])
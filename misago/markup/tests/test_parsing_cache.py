@@ -0,0 +1,124 @@
+import pytest
+from django.test import override_settings
+
+from ...users.test import create_test_user
+from ..flavours import common as common_flavour
+from ..parser import parse
+from ..parsingcache import parse_with_cache, parsing_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_parsing_cache():
+    parsing_cache.clear()
+    yield
+    parsing_cache.clear()
+
+
+@pytest.fixture
+def parse_mock(mocker):
+    return mocker.patch("misago.markup.parsingcache.parse", wraps=parse)
+
+
+def test_cache_is_not_used_if_its_size_is_zero(parse_mock, request_mock, user):
+    parse_with_cache("Hello!", request_mock, user)
+    parse_with_cache("Hello!", request_mock, user)
+    assert parse_mock.call_count == 2
+
+
+@override_settings(MISAGO_MARKUP_PARSING_CACHE_SIZE=10)
+def test_cached_result_is_returned_for_same_text(parse_mock, request_mock, user):
+    result = parse_with_cache("Hello **world**!", request_mock, user)
+    cached_result = parse_with_cache("Hello **world**!", request_mock, user)
+
+    parse_mock.assert_called_once()
+    assert cached_result["parsed_text"] == result["parsed_text"]
+    assert cached_result.keys() == result.keys()
+
+
+@override_settings(MISAGO_MARKUP_PARSING_CACHE_SIZE=10)
+def test_cached_result_is_copied(parse_mock, request_mock, user):
+    text = "Hello http://other.com"
+    parse_with_cache(text, request_mock, user)["outgoing_links"].append("test.com")
+    assert parse_with_cache(text, request_mock, user)["outgoing_links"] == ["other.com"]
+
+
+@override_settings(MISAGO_MARKUP_PARSING_CACHE_SIZE=10)
+def test_text_is_parsed_again_for_different_options(parse_mock, request_mock, user):
+    parse_with_cache("Hello!", request_mock, user)
+    parse_with_cache("Hello!", request_mock, user, allow_blocks=False)
+    assert parse_mock.call_count == 2
+
+
+@override_settings(MISAGO_MARKUP_PARSING_CACHE_SIZE=10)
+def test_text_is_parsed_again_for_different_host(
+    mocker, parse_mock, request_mock, user
+):
+    parse_with_cache("Hello!", request_mock, user)
+    request_mock.get_host = mocker.Mock(return_value="other.com")
+    parse_with_cache("Hello!", request_mock, user)
+    assert parse_mock.call_count == 2
+
+
+@override_settings(MISAGO_MARKUP_PARSING_CACHE_SIZE=10)
+def test_text_is_parsed_again_if_parsing_hooks_change(
+    mocker, parse_mock, request_mock, user
+):
+    parse_with_cache("Hello!", request_mock, user)
+    mocker.patch(
+        "misago.markup.pipeline.hooks.parsing_result_processors", [mocker.Mock()]
+    )
+    parse_with_cache("Hello!", request_mock, user)
+    assert parse_mock.call_count == 2
+
+
+@override_settings(MISAGO_MARKUP_PARSING_CACHE_SIZE=2)
+def test_cache_is_bounded(parse_mock, request_mock, user):
+    parse_with_cache("First", request_mock, user)
+    parse_with_cache("Second", request_mock, user)
+    parse_with_cache("Third", request_mock, user)
+    parse_with_cache("First", request_mock, user)
+    assert parse_mock.call_count == 4
+
+
+@override_settings(MISAGO_MARKUP_PARSING_CACHE_SIZE=10)
+def test_cached_result_with_mentions_is_used_if_users_didnt_change(
+    parse_mock, request_mock, user
+):
+    text = f"Hello @{user.username}!"
+    parse_with_cache(text, request_mock, user)
+    assert parse_with_cache(text, request_mock, user)["mentions"] == [user.id]
+    parse_mock.assert_called_once()
+
+
+@override_settings(MISAGO_MARKUP_PARSING_CACHE_SIZE=10)
+def test_text_is_parsed_again_if_mentioned_user_is_renamed(
+    parse_mock, request_mock, user
+):
+    text = f"Hello @{user.username}!"
+    parse_with_cache(text, request_mock, user)
+
+    user.set_username("Renamed")
+    user.save()
+
+    assert parse_with_cache(text, request_mock, user)["mentions"] == []
+    assert parse_mock.call_count == 2
+
+
+@override_settings(MISAGO_MARKUP_PARSING_CACHE_SIZE=10)
+def test_text_is_parsed_again_if_mentioned_user_is_created(
+    parse_mock, request_mock, user
+):
+    text = "Hello @NewUser!"
+    parse_with_cache(text, request_mock, user)
+
+    new_user = create_test_user("NewUser", "newuser@example.com")
+
+    assert parse_with_cache(text, request_mock, user)["mentions"] == [new_user.id]
+    assert parse_mock.call_count == 2
+
+
+@override_settings(MISAGO_MARKUP_PARSING_CACHE_SIZE=10)
+def test_common_flavour_uses_parsing_cache(parse_mock, request_mock, user):
+    common_flavour(request_mock, user, "Hello!")
+    common_flavour(request_mock, user, "Hello!")
+    parse_mock.assert_called_once()
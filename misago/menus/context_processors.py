@@ -1,8 +1,17 @@
+from ..core.lazycontext import lazy_context_value
 from .menuitems import get_footer_menu_items, get_navbar_menu_items
 
 
 def menus(request):
     return {
-        "navbar_menu": get_navbar_menu_items(request.cache_versions),
-        "footer_menu": get_footer_menu_items(request.cache_versions),
+        "navbar_menu": lazy_context_value(
+            request,
+            "navbar_menu",
+            lambda: get_navbar_menu_items(request.cache_versions),
+        ),
+        "footer_menu": lazy_context_value(
+            request,
+            "footer_menu",
+            lambda: get_footer_menu_items(request.cache_versions),
+        ),
     }
@@ -26,8 +26,8 @@ def get_items_from_db():
 
 
 def get_navbar_menu_items_from_db():
-    return MenuItem.objects.exclude(menu=MenuItem.MENU_FOOTER).values()
+    return list(MenuItem.objects.exclude(menu=MenuItem.MENU_FOOTER).values())
 
 
 def get_footer_menu_items_from_db():
-    return MenuItem.objects.exclude(menu=MenuItem.MENU_NAVBAR).values()
+    return list(MenuItem.objects.exclude(menu=MenuItem.MENU_NAVBAR).values())
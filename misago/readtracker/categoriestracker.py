@@ -1,6 +1,10 @@
+from django.db.models import Exists, OuterRef
+
+from ..categories.models import Category
 from ..threads.models import Post, Thread
 from ..threads.permissions import exclude_invisible_posts, exclude_invisible_threads
 from .cutoffdate import get_cutoff_date
+from .watermarks import exclude_read_posts
 
 
 def make_read_aware(request, categories):
@@ -18,20 +22,21 @@ def make_read_aware(request, categories):
     threads = Thread.objects.filter(category__in=categories)
     threads = exclude_invisible_threads(request.user_acl, categories, threads)
 
-    queryset = (
-        Post.objects.filter(
-            category__in=categories,
-            thread__in=threads,
-            posted_on__gt=get_cutoff_date(request.settings, request.user),
-        )
-        .values_list("category", flat=True)
-        .distinct()
+    queryset = Post.objects.filter(
+        category_id=OuterRef("id"),
+        thread__in=threads,
+        posted_on__gt=get_cutoff_date(request.settings, request.user),
     )
 
-    queryset = queryset.exclude(id__in=request.user.postread_set.values("post"))
+    queryset = exclude_read_posts(request.user, queryset)
     queryset = exclude_invisible_posts(request.user_acl, categories, queryset)
 
-    unread_categories = list(queryset)
+    # Exists stops at first unread post found in category
+    unread_categories = list(
+        Category.objects.filter(id__in=[c.pk for c in categories])
+        .filter(Exists(queryset))
+        .values_list("id", flat=True)
+    )
 
     for category in categories:
         if category.pk in unread_categories:
@@ -0,0 +1,206 @@
+"""
+Read tracker rows that no longer change read state are deleted in batches
+
+Threads and categories reads last updated before the cutoff date only cover
+posts that are read anyway, and so do reads of threads whose last posts are
+older than it. Threads reads in a category are collapsed into a single
+category read, marking posts up to the first one user hasn't read in the
+category as read, after which threads reads it covers are deleted.
+
+Every batch is deleted by a query repeating batch's conditions, so rows that
+users have updated in the meantime by reading threads are kept. Threads reads
+are collapsed in batches of users categories too, by fixed number of queries
+per batch.
+"""
+from functools import reduce
+from operator import or_
+
+from django.db.models import Case, F, Max, Min, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Greatest
+
+from ..categories import THREADS_ROOT_NAME
+from ..threads.models import Post
+from ..threads.threadtypes import trees_map
+from .cutoffdate import get_cutoff_date
+from .models import CategoryRead, ThreadRead
+from .watermarks import exclude_read_posts
+
+COMPACTION_BATCH_SIZE = 1000
+
+
+def delete_expired_reads(settings, batch_size=COMPACTION_BATCH_SIZE):
+    cutoff_date = get_cutoff_date(settings)
+
+    querysets = (
+        ThreadRead.objects.filter(last_read_on__lt=cutoff_date),
+        ThreadRead.objects.filter(thread__last_post_on__lt=cutoff_date),
+        CategoryRead.objects.filter(last_read_on__lt=cutoff_date),
+    )
+
+    deleted_count = 0
+    for queryset in querysets:
+        deleted_count += delete_in_batches(queryset, batch_size)
+    return deleted_count
+
+
+def delete_in_batches(queryset, batch_size=COMPACTION_BATCH_SIZE):
+    """Deletes rows from queryset in batches paginated by their ids"""
+    deleted_count = 0
+    last_id = 0
+
+    while True:
+        batch = list(
+            queryset.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not batch:
+            return deleted_count
+
+        last_id = batch[-1]
+        deleted_count += queryset.filter(id__in=batch).delete()[0]
+
+
+def get_categories_reads_to_compact(batch_size=COMPACTION_BATCH_SIZE):
+    """
+    Yields batches of ids of users threads reads, one read per user and category
+    """
+    tree_id = trees_map.get_tree_id_for_root(THREADS_ROOT_NAME)
+    queryset = (
+        ThreadRead.objects.filter(category__tree_id=tree_id)
+        .values("user_id", "category_id")
+        .annotate(read_id=Min("id"))
+        .order_by("user_id", "category_id")
+    )
+
+    batch = list(queryset[:batch_size])
+    while batch:
+        yield [row["read_id"] for row in batch]
+
+        user_id, category_id = batch[-1]["user_id"], batch[-1]["category_id"]
+        batch = list(
+            queryset.filter(
+                Q(user_id__gt=user_id) | Q(user_id=user_id, category_id__gt=category_id)
+            )[:batch_size]
+        )
+
+
+def compact_categories_reads(settings, reads_ids):
+    """
+    Collapses users threads reads in categories into categories reads
+
+    Takes ids of threads reads, one per user and category, and returns number
+    of deleted threads reads. Number of queries doesn't depend on the number
+    of reads, which are compacted together.
+    """
+    watermarks = get_categories_watermarks(settings, reads_ids)
+    if not watermarks:
+        return 0
+
+    covered_reads = ThreadRead.objects.filter(
+        reduce(
+            or_,
+            (
+                Q(
+                    user_id=user_id,
+                    category_id=category_id,
+                    last_read_post_id__lte=last_read_post_id,
+                )
+                for (user_id, category_id), last_read_post_id in watermarks.items()
+            ),
+        )
+    )
+
+    last_reads = (
+        covered_reads.values("user_id", "category_id")
+        .annotate(last_read_on=Max("last_read_on"))
+        .values_list("user_id", "category_id", "last_read_on")
+        .order_by()
+    )
+    categories_reads = [
+        CategoryRead(
+            user_id=user_id,
+            category_id=category_id,
+            last_read_post_id=watermarks[user_id, category_id],
+            last_read_on=last_read_on,
+        )
+        for user_id, category_id, last_read_on in last_reads
+    ]
+    if not categories_reads:
+        return 0
+
+    # categories reads are saved before threads reads they cover are deleted,
+    # so posts are never unread in between
+    CategoryRead.objects.bulk_create(categories_reads, ignore_conflicts=True)
+    CategoryRead.objects.filter(
+        reduce(
+            or_,
+            (
+                Q(user_id=read.user_id, category_id=read.category_id)
+                for read in categories_reads
+            ),
+        )
+    ).update(
+        last_read_post_id=Greatest(
+            F("last_read_post_id"),
+            get_categories_reads_case(categories_reads, "last_read_post_id"),
+        ),
+        last_read_on=Greatest(
+            F("last_read_on"),
+            get_categories_reads_case(categories_reads, "last_read_on"),
+        ),
+    )
+
+    return covered_reads.delete()[0]
+
+
+def get_categories_watermarks(settings, reads_ids):
+    """
+    Returns dict of ids of last posts users have read in categories
+
+    Post is read in category if user has read it and all posts before it.
+    Dict is keyed with (user id, category id) tuples.
+    """
+    posts = Post.objects.filter(category_id=OuterRef("category_id"))
+    unread_posts = exclude_read_posts(
+        OuterRef(OuterRef("user_id")),
+        posts.filter(posted_on__gt=get_cutoff_date(settings)),
+    )
+
+    # both ids are selected by same query, so post posted after it has
+    # greater id than last post's and stays unread
+    queryset = (
+        ThreadRead.objects.filter(id__in=reads_ids)
+        .annotate(
+            last_post_id=Subquery(posts.order_by("-id").values("id")[:1]),
+            first_unread_post_id=Subquery(unread_posts.order_by("id").values("id")[:1]),
+        )
+        .values_list("user_id", "category_id", "last_post_id", "first_unread_post_id")
+    )
+
+    watermarks = {}
+    for user_id, category_id, last_post_id, first_unread_post_id in queryset:
+        if first_unread_post_id:
+            last_read_post_id = first_unread_post_id - 1
+        else:
+            last_read_post_id = last_post_id
+
+        if last_read_post_id:
+            watermarks[user_id, category_id] = last_read_post_id
+
+    return watermarks
+
+
+def get_categories_reads_case(categories_reads, field_name):
+    field = CategoryRead._meta.get_field(field_name)
+    return Case(
+        *(
+            When(
+                user_id=read.user_id,
+                category_id=read.category_id,
+                then=Value(getattr(read, field_name), output_field=field),
+            )
+            for read in categories_reads
+        ),
+        output_field=field,
+    )
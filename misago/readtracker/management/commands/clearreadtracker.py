@@ -2,7 +2,8 @@ from django.core.management.base import BaseCommand
 
 from ....conf.shortcuts import get_dynamic_settings
 from ...cutoffdate import get_cutoff_date
-from ...models import PostRead
+from ...models import CategoryRead, ThreadRead
+from ...unreadthreads import delete_expired_unread_threads_indexes
 
 
 class Command(BaseCommand):
@@ -10,11 +11,16 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         settings = get_dynamic_settings()
-        queryset = PostRead.objects.filter(last_read_on__lt=get_cutoff_date(settings))
-        deleted_count = queryset.count()
+        cutoff_date = get_cutoff_date(settings)
+
+        deleted_count = 0
+        for model in (ThreadRead, CategoryRead):
+            queryset = model.objects.filter(last_read_on__lt=cutoff_date)
+            deleted_count += queryset.delete()[0]
+
+        deleted_count += delete_expired_unread_threads_indexes()
 
         if deleted_count:
-            queryset.delete()
             message = "\n\nDeleted %s expired entries" % deleted_count
         else:
             message = "\n\nNo expired entries were found"
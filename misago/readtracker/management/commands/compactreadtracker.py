@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ....conf.shortcuts import get_dynamic_settings
+from ...compaction import (
+    COMPACTION_BATCH_SIZE,
+    compact_categories_reads,
+    delete_expired_reads,
+    get_categories_reads_to_compact,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes expired records from readtracker and collapses threads reads "
+        "into categories reads"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            default=COMPACTION_BATCH_SIZE,
+            type=int,
+            help="Number of rows deleted by single query.",
+        )
+
+    def handle(self, *args, **options):
+        settings = get_dynamic_settings()
+        batch_size = options["batch_size"]
+        start_time = time.time()
+
+        deleted_count = delete_expired_reads(settings, batch_size)
+        self.stdout.write("Deleted %s expired entries" % deleted_count)
+
+        collapsed_count = 0
+        for reads_ids in get_categories_reads_to_compact(batch_size):
+            collapsed_count += compact_categories_reads(settings, reads_ids)
+
+        self.stdout.write("Collapsed %s threads reads" % collapsed_count)
+        deleted_count += collapsed_count
+
+        duration = time.time() - start_time
+        self.stdout.write(
+            "\n\nRemoved %s entries in %.2fs (%d entries/s)"
+            % (deleted_count, duration, deleted_count / max(duration, 0.001))
+        )
@@ -0,0 +1,44 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from ....conf.shortcuts import get_dynamic_settings
+from ....core.pgutils import chunk_queryset
+from ...privatethreads import count_unread_private_threads
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Recounts unread private threads of users, fixing counts that drifted"
+
+    def handle(self, *args, **options):
+        settings = get_dynamic_settings()
+
+        queryset = User.objects.filter(
+            Q(threadparticipant__isnull=False)
+            | Q(unread_private_threads__gt=0)
+            | Q(sync_unread_private_threads=True)
+        ).distinct()
+
+        synchronized_count = 0
+        fixed_count = 0
+
+        for user in chunk_queryset(queryset):
+            synchronized_count += 1
+
+            unread_private_threads = count_unread_private_threads(settings, user)
+            if user.unread_private_threads != unread_private_threads:
+                fixed_count += 1
+            elif not user.sync_unread_private_threads:
+                continue
+
+            User.objects.filter(id=user.id).update(
+                unread_private_threads=unread_private_threads,
+                sync_unread_private_threads=False,
+            )
+
+        self.stdout.write(
+            "\n\nSynchronized %s users, fixed %s counts"
+            % (synchronized_count, fixed_count)
+        )
@@ -0,0 +1,116 @@
+# Generated by Django 3.2.15 on 2026-10-18 20:26
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+# Watermark of thread read by user is the newest post user has read in it
+CONVERT_POSTREADS_SQL = """
+INSERT INTO misago_readtracker_threadread
+    (user_id, category_id, thread_id, last_read_post_id, last_read_on)
+SELECT r.user_id, t.category_id, r.thread_id, MAX(r.post_id), MAX(r.last_read_on)
+FROM misago_readtracker_postread r
+JOIN misago_threads_thread t ON t.id = r.thread_id
+GROUP BY r.user_id, r.thread_id, t.category_id;
+"""
+
+REVERSE_POSTREADS_SQL = """
+INSERT INTO misago_readtracker_postread
+    (user_id, category_id, thread_id, post_id, last_read_on)
+SELECT r.user_id, p.category_id, p.thread_id, p.id, r.last_read_on
+FROM misago_readtracker_threadread r
+JOIN misago_threads_post p
+    ON p.thread_id = r.thread_id AND p.id <= r.last_read_post_id;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("misago_categories", "0010_cache_version"),
+        ("misago_threads", "0012_set_dj_partial_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("misago_readtracker", "0004_auto_20171015_2010"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CategoryRead",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("last_read_post_id", models.PositiveIntegerField()),
+                (
+                    "last_read_on",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="misago_categories.category",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("user", "category")},
+            },
+        ),
+        migrations.CreateModel(
+            name="ThreadRead",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("last_read_post_id", models.PositiveIntegerField()),
+                (
+                    "last_read_on",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="misago_categories.category",
+                    ),
+                ),
+                (
+                    "thread",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="misago_threads.thread",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("user", "thread")},
+            },
+        ),
+        migrations.RunSQL(CONVERT_POSTREADS_SQL, REVERSE_POSTREADS_SQL),
+    ]
@@ -0,0 +1,8 @@
+# Generated by Django 3.2.15 on 2026-10-18 20:26
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [("misago_readtracker", "0005_threadread_categoryread")]
+
+    operations = [migrations.DeleteModel(name="PostRead")]
@@ -0,0 +1,64 @@
+# Generated by Django 3.2.15 on 2026-10-18 21:27
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("misago_threads", "0012_set_dj_partial_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("misago_readtracker", "0006_delete_postread"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UnreadThreadsIndex",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("is_ready", models.BooleanField(default=False)),
+                ("created_on", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="UnreadThread",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "index",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="misago_readtracker.unreadthreadsindex",
+                    ),
+                ),
+                (
+                    "thread",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="misago_threads.thread",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("index", "thread")},
+            },
+        ),
+    ]
@@ -3,9 +3,44 @@ from django.db import models
 from django.utils import timezone
 
 
-class PostRead(models.Model):
+class ThreadRead(models.Model):
+    """User has read thread's posts up to post with last_read_post_id"""
+
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     category = models.ForeignKey("misago_categories.Category", on_delete=models.CASCADE)
     thread = models.ForeignKey("misago_threads.Thread", on_delete=models.CASCADE)
-    post = models.ForeignKey("misago_threads.Post", on_delete=models.CASCADE)
+    last_read_post_id = models.PositiveIntegerField()
+    last_read_on = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = [("user", "thread")]
+
+
+class CategoryRead(models.Model):
+    """User has read category's posts up to post with last_read_post_id"""
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    category = models.ForeignKey("misago_categories.Category", on_delete=models.CASCADE)
+    last_read_post_id = models.PositiveIntegerField()
     last_read_on = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = [("user", "category")]
+
+
+class UnreadThreadsIndex(models.Model):
+    """Index of threads with posts user has not read, used by threads lists"""
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, primary_key=True, on_delete=models.CASCADE
+    )
+    is_ready = models.BooleanField(default=False)
+    created_on = models.DateTimeField(default=timezone.now)
+
+
+class UnreadThread(models.Model):
+    index = models.ForeignKey(UnreadThreadsIndex, on_delete=models.CASCADE)
+    thread = models.ForeignKey("misago_threads.Thread", on_delete=models.CASCADE)
+
+    class Meta:
+        unique_together = [("index", "thread")]
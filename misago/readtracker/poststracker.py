@@ -1,4 +1,11 @@
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
 from .cutoffdate import get_cutoff_date
+from .models import ThreadRead
+from .unreadthreads import remove_read_thread
+from .watermarks import get_threads_watermarks
 
 
 def make_read_aware(request, posts):
@@ -14,19 +21,22 @@ def make_read_aware(request, posts):
         return
 
     cutoff_date = get_cutoff_date(request.settings, request.user)
-    unresolved_posts = {}
+    unresolved_posts = []
 
     for post in posts:
         if post.posted_on > cutoff_date:
             post.is_read = False
             post.is_new = True
-            unresolved_posts[post.pk] = post
+            unresolved_posts.append(post)
 
     if unresolved_posts:
-        queryset = request.user.postread_set.filter(post__in=unresolved_posts)
-        for post_id in queryset.values_list("post_id", flat=True):
-            unresolved_posts[post_id].is_read = True
-            unresolved_posts[post_id].is_new = False
+        watermarks = get_threads_watermarks(
+            request.user, [(p.thread_id, p.category_id) for p in unresolved_posts]
+        )
+        for post in unresolved_posts:
+            if post.id <= watermarks[post.thread_id]:
+                post.is_read = True
+                post.is_new = False
 
 
 def make_read(posts):
@@ -36,4 +46,46 @@ def make_read(posts):
 
 
 def save_read(user, post):
-    user.postread_set.create(category=post.category, thread=post.thread, post=post)
+    queryset = ThreadRead.objects.filter(user=user, thread_id=post.thread_id)
+    update = {
+        "category_id": post.category_id,
+        "last_read_post_id": Greatest(F("last_read_post_id"), post.id),
+        "last_read_on": timezone.now(),
+    }
+
+    if not queryset.update(**update):
+        # Posts are read in parallel requests, so other request may create
+        # thread's read after it was updated by this one
+        ThreadRead.objects.bulk_create(
+            [
+                ThreadRead(
+                    user=user,
+                    category_id=post.category_id,
+                    thread_id=post.thread_id,
+                    last_read_post_id=post.id,
+                )
+            ],
+            ignore_conflicts=True,
+        )
+        queryset.update(**update)
+
+    remove_read_thread(user, post)
+
+
+def save_event_read(user, event, last_post_id):
+    """Marks event as read if user has read thread's posts before it"""
+    if last_post_id:
+        watermarks = get_threads_watermarks(
+            user, [(event.thread_id, event.category_id)]
+        )
+        if watermarks[event.thread_id] < last_post_id:
+            return
+
+    save_read(user, event)
+
+
+def delete_reads(post):
+    """Makes post and posts following it in its thread unread for all users"""
+    ThreadRead.objects.filter(
+        thread_id=post.thread_id, last_read_post_id__gte=post.id
+    ).update(last_read_post_id=post.id - 1)
@@ -0,0 +1,88 @@
+"""
+Users have count of private threads they participate in that have unread posts
+
+This count is updated by comparing sets of participants that have unread posts
+in thread before and after change to it, so it's not recounted from scratch
+when thread is replied to or read.
+
+Unlike threads lists, this count doesn't check user's permissions to see posts:
+participant's unread posts are approved posts of other users that aren't hidden
+events, so posting in thread never makes it unread for poster.
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db.models import DateTimeField, Exists, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from ..threads.models import Post, ThreadParticipant
+from .models import CategoryRead, ThreadRead
+
+User = get_user_model()
+
+
+def get_unread_participants(settings, thread, users=None):
+    """Returns set of ids of thread's participants that have unread posts in it"""
+    queryset = get_unread_participants_queryset(settings).filter(thread=thread)
+    if users is not None:
+        queryset = queryset.filter(user__in=users)
+    return set(queryset.values_list("user_id", flat=True))
+
+
+def count_unread_private_threads(settings, user):
+    return get_unread_participants_queryset(settings).filter(user=user).count()
+
+
+def get_unread_participants_queryset(settings):
+    cutoff_date = timezone.now() - timedelta(days=settings.readtracker_cutoff)
+
+    read_in_thread = ThreadRead.objects.filter(
+        user_id=OuterRef("user_id"), thread_id=OuterRef("thread_id")
+    ).values("last_read_post_id")
+    read_in_category = CategoryRead.objects.filter(
+        user_id=OuterRef("user_id"), category_id=OuterRef("thread__category_id")
+    ).values("last_read_post_id")
+
+    unread_posts = (
+        Post.objects.filter(
+            thread_id=OuterRef("thread_id"),
+            id__gt=OuterRef("last_read_post_id"),
+            posted_on__gt=Greatest(
+                Value(cutoff_date, output_field=DateTimeField()),
+                OuterRef("user__joined_on"),
+            ),
+        )
+        .exclude(poster_id=OuterRef("user_id"))
+        .exclude(is_unapproved=True)
+        .exclude(is_event=True, is_hidden=True)
+    )
+
+    return (
+        ThreadParticipant.objects.annotate(
+            last_read_post_id=Greatest(
+                Coalesce(Subquery(read_in_thread), 0),
+                Coalesce(Subquery(read_in_category), 0),
+            )
+        )
+        .filter(Exists(unread_posts))
+        .order_by()
+    )
+
+
+def update_unread_private_threads(unread_participants, new_unread_participants):
+    """
+    Updates unread private threads counts of participants for whom thread
+    became unread or read
+    """
+    increased = new_unread_participants - unread_participants
+    if increased:
+        User.objects.filter(id__in=increased).update(
+            unread_private_threads=F("unread_private_threads") + 1
+        )
+
+    decreased = unread_participants - new_unread_participants
+    if decreased:
+        User.objects.filter(id__in=decreased, unread_private_threads__gt=0).update(
+            unread_private_threads=F("unread_private_threads") - 1
+        )
@@ -1,51 +1,98 @@
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Least
 from django.dispatch import Signal, receiver
 
 from ..categories import PRIVATE_THREADS_ROOT_NAME
 from ..categories.signals import delete_category_content, move_category_content
-from ..threads.signals import merge_post, merge_thread, move_post, move_thread
+from ..conf.shortcuts import get_dynamic_settings
+from ..threads.signals import delete_thread, merge_thread, move_post, move_thread
+from .cutoffdate import get_cutoff_date
+from .poststracker import delete_reads
+from .privatethreads import get_unread_participants, update_unread_private_threads
+from .watermarks import lower_category_reads
 
 thread_read = Signal()
 
 
 @receiver(delete_category_content)
 def delete_category_threads(sender, **kwargs):
-    sender.postread_set.all().delete()
+    sender.threadread_set.all().delete()
+    sender.categoryread_set.all().delete()
 
 
 @receiver(move_category_content)
 def move_category_tracker(sender, **kwargs):
-    sender.postread_set.update(category=kwargs["new_category"])
+    new_category = kwargs["new_category"]
+
+    # moved posts are only read in new category if they were read in old one
+    category_reads = sender.categoryread_set.filter(user_id=OuterRef("user_id")).values(
+        "last_read_post_id"
+    )
+    new_category.categoryread_set.update(
+        last_read_post_id=Least(
+            F("last_read_post_id"), Coalesce(Subquery(category_reads), 0)
+        )
+    )
+
+    sender.threadread_set.update(category=new_category)
 
 
 @receiver(merge_thread)
 def merge_thread_tracker(sender, **kwargs):
     other_thread = kwargs["other_thread"]
-    other_thread.postread_set.update(category=sender.category, thread=sender)
+    lower_moved_thread_reads(sender.category, other_thread)
+
+    # Merged thread is read up to older of posts user has read in both threads,
+    # so posts user hasn't read in either of them are not marked as read
+    other_thread_reads = other_thread.threadread_set.filter(
+        user_id=OuterRef("user_id")
+    ).values("last_read_post_id")
+    sender.threadread_set.update(
+        last_read_post_id=Least(
+            F("last_read_post_id"),
+            Coalesce(Subquery(other_thread_reads), other_thread.first_post_id - 1),
+        )
+    )
+
+    moved_reads = other_thread.threadread_set.exclude(
+        user_id__in=sender.threadread_set.values("user_id")
+    )
+    if sender.first_post_id:
+        moved_reads.filter(last_read_post_id__gte=sender.first_post_id).update(
+            last_read_post_id=sender.first_post_id - 1
+        )
+    moved_reads.update(category=sender.category, thread=sender)
+
+    other_thread.threadread_set.all().delete()
 
 
 @receiver(move_thread)
 def move_thread_tracker(sender, **kwargs):
-    sender.postread_set.update(category=sender.category, thread=sender)
-
-
-@receiver(merge_post)
-def merge_post_delete_tracker(sender, **kwargs):
-    sender.postread_set.all().delete()
+    lower_moved_thread_reads(sender.category, sender)
+    sender.threadread_set.update(category=sender.category)
 
 
 @receiver(move_post)
 def move_post_delete_tracker(sender, **kwargs):
-    sender.postread_set.all().delete()
+    delete_reads(sender)
+
+    cutoff_date = get_cutoff_date(get_dynamic_settings())
+    if sender.posted_on > cutoff_date:
+        lower_category_reads(sender.category, sender.thread, sender.id, sender.id)
+
 
+def lower_moved_thread_reads(category, thread):
+    cutoff_date = get_cutoff_date(get_dynamic_settings())
+    if thread.last_post_on > cutoff_date:
+        lower_category_reads(
+            category, thread, thread.first_post_id, thread.last_post_id
+        )
 
-@receiver(thread_read)
-def decrease_unread_private_count(sender, **kwargs):
-    user = sender
-    thread = kwargs["thread"]
 
-    if thread.category.thread_type.root_name != PRIVATE_THREADS_ROOT_NAME:
+@receiver(delete_thread)
+def decrease_unread_private_threads(sender, **kwargs):
+    if sender.thread_type.root_name != PRIVATE_THREADS_ROOT_NAME:
         return
 
-    if user.unread_private_threads:
-        user.unread_private_threads -= 1
-        user.save(update_fields=["unread_private_threads"])
+    settings = get_dynamic_settings()
+    update_unread_private_threads(get_unread_participants(settings, sender), set())
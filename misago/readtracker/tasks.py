@@ -0,0 +1,22 @@
+from celery import shared_task
+from django.contrib.auth import get_user_model
+
+from ..acl.useracl import get_user_acl
+from ..cache.versions import get_cache_versions
+from ..conf.dynamicsettings import DynamicSettings
+from .unreadthreads import rebuild_unread_threads_index
+
+User = get_user_model()
+
+
+@shared_task
+def build_unread_threads_index(user_id):
+    user = User.objects.filter(id=user_id).first()
+    if not user:
+        return
+
+    cache_versions = get_cache_versions()
+    settings = DynamicSettings(cache_versions)
+    user_acl = get_user_acl(user, cache_versions)
+
+    rebuild_unread_threads_index(settings, user, user_acl)
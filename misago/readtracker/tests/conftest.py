@@ -2,6 +2,9 @@ from unittest.mock import Mock
 
 import pytest
 
+from ...categories.models import Category
+from ...threads.models import ThreadParticipant
+from ...threads.test import post_thread
 from ..poststracker import save_read
 
 
@@ -11,6 +14,14 @@ def read_thread(user, thread):
     return thread
 
 
+@pytest.fixture
+def private_thread(user, other_user):
+    thread = post_thread(Category.objects.private_threads(), poster=other_user)
+    ThreadParticipant.objects.set_owner(thread, other_user)
+    ThreadParticipant.objects.add_participants(thread, [user])
+    return thread
+
+
 @pytest.fixture
 def anonymous_request_mock(dynamic_settings, anonymous_user, anonymous_user_acl):
     return Mock(
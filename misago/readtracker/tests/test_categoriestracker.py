@@ -6,6 +6,7 @@ from django.utils import timezone
 from ...conf.test import override_dynamic_settings
 from ...threads.test import reply_thread
 from ..categoriestracker import make_read_aware
+from ..models import CategoryRead
 from ..poststracker import save_read
 
 
@@ -181,3 +182,34 @@ def test_category_with_non_tracked_thread_is_marked_as_read_for_anonymous_user(
     make_read_aware(anonymous_request_mock, default_category)
     assert default_category.is_read
     assert not default_category.is_new
+
+
+def test_category_with_read_thread_is_marked_as_read(
+    request_mock, user, thread, default_category
+):
+    reply = reply_thread(thread)
+    save_read(user, reply)
+    make_read_aware(request_mock, default_category)
+    assert default_category.is_read
+    assert not default_category.is_new
+
+
+def test_read_category_is_marked_as_read(request_mock, user, thread, default_category):
+    CategoryRead.objects.create(
+        user=user, category=default_category, last_read_post_id=thread.last_post_id
+    )
+    make_read_aware(request_mock, default_category)
+    assert default_category.is_read
+    assert not default_category.is_new
+
+
+def test_read_category_with_new_post_is_marked_as_unread(
+    request_mock, user, thread, default_category
+):
+    CategoryRead.objects.create(
+        user=user, category=default_category, last_read_post_id=thread.last_post_id
+    )
+    reply_thread(thread)
+    make_read_aware(request_mock, default_category)
+    assert not default_category.is_read
+    assert default_category.is_new
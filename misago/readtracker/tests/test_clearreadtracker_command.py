@@ -6,7 +6,7 @@ from django.utils import timezone
 
 from ...conf.test import override_dynamic_settings
 from ..management.commands import clearreadtracker
-from ..models import PostRead
+from ..models import CategoryRead, ThreadRead
 
 
 def call_command():
@@ -24,29 +24,43 @@ def test_command_works_if_there_are_no_read_tracker_entries(db):
 
 @override_dynamic_settings(readtracker_cutoff=5)
 def test_recent_read_tracker_entry_is_not_cleared(user, post):
-    existing = PostRead.objects.create(
+    ThreadRead.objects.create(
         user=user,
         category=post.category,
         thread=post.thread,
-        post=post,
+        last_read_post_id=post.id,
         last_read_on=timezone.now(),
     )
 
     command_output = call_command()
     assert command_output == "No expired entries were found"
-    assert PostRead.objects.exists()
+    assert ThreadRead.objects.exists()
 
 
 @override_dynamic_settings(readtracker_cutoff=5)
 def test_old_read_tracker_entry_is_cleared(user, post):
-    existing = PostRead.objects.create(
+    ThreadRead.objects.create(
         user=user,
         category=post.category,
         thread=post.thread,
-        post=post,
+        last_read_post_id=post.id,
         last_read_on=timezone.now() - timedelta(days=10),
     )
 
     command_output = call_command()
     assert command_output == "Deleted 1 expired entries"
-    assert not PostRead.objects.exists()
+    assert not ThreadRead.objects.exists()
+
+
+@override_dynamic_settings(readtracker_cutoff=5)
+def test_old_category_read_tracker_entry_is_cleared(user, post):
+    CategoryRead.objects.create(
+        user=user,
+        category=post.category,
+        last_read_post_id=post.id,
+        last_read_on=timezone.now() - timedelta(days=10),
+    )
+
+    command_output = call_command()
+    assert command_output == "Deleted 1 expired entries"
+    assert not CategoryRead.objects.exists()
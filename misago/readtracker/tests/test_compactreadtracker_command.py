@@ -0,0 +1,162 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core import management
+from django.urls import reverse
+from django.utils import timezone
+
+from ...conf.test import override_dynamic_settings
+from ...threads.test import post_thread, reply_thread
+from ..management.commands import compactreadtracker
+from ..models import CategoryRead, ThreadRead
+from ..poststracker import save_read
+from ..watermarks import get_threads_watermarks
+
+
+def call_command(*args):
+    command = compactreadtracker.Command()
+
+    out = StringIO()
+    management.call_command(command, *args, stdout=out)
+    return out.getvalue().strip().splitlines()
+
+
+def get_watermark(user, thread):
+    watermarks = get_threads_watermarks(user, [(thread.id, thread.category_id)])
+    return watermarks[thread.id]
+
+
+def get_threads_list(client, list_type):
+    response = client.get(reverse("misago:api:thread-list") + "?list=" + list_type)
+    assert response.status_code == 200
+    return [thread["id"] for thread in response.json()["results"]]
+
+
+def test_command_works_if_there_are_no_read_tracker_entries(db):
+    command_output = call_command()
+    assert command_output[0] == "Deleted 0 expired entries"
+    assert command_output[1] == "Collapsed 0 threads reads"
+    assert command_output[-1].startswith("Removed 0 entries in ")
+    assert command_output[-1].endswith(" entries/s)")
+
+
+@override_dynamic_settings(readtracker_cutoff=5)
+def test_command_deletes_expired_entries_in_batches(user, default_category):
+    for _ in range(3):
+        thread = post_thread(default_category)
+        save_read(user, thread.first_post)
+    ThreadRead.objects.update(last_read_on=timezone.now() - timedelta(days=10))
+
+    command_output = call_command("--batch-size=2")
+    assert command_output[0] == "Deleted 3 expired entries"
+    assert command_output[-1].startswith("Removed 3 entries in ")
+    assert not ThreadRead.objects.exists()
+
+
+@override_dynamic_settings(readtracker_cutoff=5)
+def test_command_deletes_reads_of_threads_older_than_cutoff(user, thread):
+    save_read(user, thread.first_post)
+    thread.last_post_on = timezone.now() - timedelta(days=10)
+    thread.save()
+
+    command_output = call_command()
+    assert command_output[0] == "Deleted 1 expired entries"
+    assert not ThreadRead.objects.exists()
+
+
+def test_command_collapses_read_threads_into_category_read(
+    user, thread, default_category
+):
+    other_thread = post_thread(default_category)
+    for read_thread in (thread, other_thread):
+        save_read(user, read_thread.first_post)
+
+    command_output = call_command()
+    assert command_output[1] == "Collapsed 2 threads reads"
+    assert not ThreadRead.objects.exists()
+
+    category_read = CategoryRead.objects.get(user=user)
+    assert category_read.category == default_category
+    assert category_read.last_read_post_id == other_thread.last_post_id
+
+
+def test_command_keeps_posts_user_hasnt_read_unread(user, thread, default_category):
+    unread_thread = post_thread(default_category)
+    read_thread = post_thread(default_category)
+    save_read(user, thread.first_post)
+    save_read(user, read_thread.first_post)
+
+    command_output = call_command()
+    assert command_output[1] == "Collapsed 1 threads reads"
+
+    category_read = CategoryRead.objects.get(user=user)
+    assert category_read.last_read_post_id == unread_thread.first_post_id - 1
+    assert ThreadRead.objects.get(user=user).thread == read_thread
+
+    assert get_watermark(user, thread) == thread.last_post_id
+    assert get_watermark(user, unread_thread) < unread_thread.first_post_id
+    assert get_watermark(user, read_thread) == read_thread.last_post_id
+
+
+def test_command_keeps_unread_replies_unread(user, thread):
+    save_read(user, thread.first_post)
+    reply = reply_thread(thread)
+
+    call_command()
+
+    assert not ThreadRead.objects.exists()
+    assert get_watermark(user, thread) == reply.id - 1
+
+
+def test_collapsed_thread_with_new_reply_is_listed_as_unread(user, user_client, thread):
+    save_read(user, thread.first_post)
+    call_command()
+    assert not ThreadRead.objects.exists()
+
+    reply_thread(thread, posted_on=timezone.now())
+
+    assert get_threads_list(user_client, "unread") == [thread.id]
+    assert get_threads_list(user_client, "new") == []
+
+
+def test_command_collapses_reads_of_many_users_in_single_batch(
+    django_assert_max_num_queries, user, other_user, thread, default_category
+):
+    other_thread = post_thread(default_category)
+    for reader in (user, other_user):
+        for read_thread in (thread, other_thread):
+            save_read(reader, read_thread.first_post)
+
+    # cache versions, settings, expired reads, threads tree, two batches
+    # of reads, watermarks, last reads, categories reads insert and update,
+    # and threads reads delete
+    with django_assert_max_num_queries(13):
+        command_output = call_command()
+
+    assert command_output[1] == "Collapsed 4 threads reads"
+    assert CategoryRead.objects.count() == 2
+
+
+def test_command_doesnt_collapse_reads_of_other_users(
+    user, other_user, thread, default_category
+):
+    save_read(user, thread.first_post)
+    CategoryRead.objects.create(
+        user=other_user,
+        category=default_category,
+        last_read_post_id=thread.first_post_id - 1,
+    )
+
+    call_command()
+
+    category_read = CategoryRead.objects.get(user=other_user)
+    assert category_read.last_read_post_id == thread.first_post_id - 1
+    assert CategoryRead.objects.get(user=user).last_read_post_id == thread.first_post_id
+
+
+def test_command_skips_private_threads(user, private_thread):
+    save_read(user, private_thread.first_post)
+
+    command_output = call_command()
+    assert command_output[1] == "Collapsed 0 threads reads"
+    assert ThreadRead.objects.exists()
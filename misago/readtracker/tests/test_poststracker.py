@@ -4,7 +4,9 @@ import pytest
 from django.utils import timezone
 
 from ...conf.test import override_dynamic_settings
-from ..poststracker import make_read_aware, save_read
+from ...threads.test import reply_thread
+from ..models import CategoryRead
+from ..poststracker import delete_reads, make_read_aware, save_event_read, save_read
 
 
 def test_falsy_value_can_be_made_read_aware(request_mock):
@@ -87,3 +89,76 @@ def test_not_tracked_post_is_marked_as_read_and_not_new_for_anonymous_user(
     make_read_aware(anonymous_request_mock, post)
     assert post.is_read
     assert not post.is_new
+
+
+def test_post_before_read_post_is_marked_as_read(request_mock, user, thread):
+    reply = reply_thread(thread)
+    save_read(user, reply)
+
+    make_read_aware(request_mock, thread.first_post)
+    assert thread.first_post.is_read
+    assert not thread.first_post.is_new
+
+
+def test_post_after_read_post_is_marked_as_not_read(request_mock, user, thread):
+    save_read(user, thread.first_post)
+    reply = reply_thread(thread)
+
+    make_read_aware(request_mock, reply)
+    assert not reply.is_read
+    assert reply.is_new
+
+
+def test_post_in_read_category_is_marked_as_read(request_mock, user, post):
+    CategoryRead.objects.create(
+        user=user, category=post.category, last_read_post_id=post.id
+    )
+
+    make_read_aware(request_mock, post)
+    assert post.is_read
+    assert not post.is_new
+
+
+def test_saving_read_of_older_post_keeps_newer_post_read(user, thread):
+    reply = reply_thread(thread)
+    save_read(user, reply)
+    save_read(user, thread.first_post)
+
+    thread_read = user.threadread_set.get()
+    assert thread_read.last_read_post_id == reply.id
+
+
+def test_deleting_reads_makes_post_and_posts_after_it_unread(user, thread):
+    reply = reply_thread(thread)
+    save_read(user, reply)
+    delete_reads(thread.first_post)
+
+    thread_read = user.threadread_set.get()
+    assert thread_read.last_read_post_id == thread.first_post.id - 1
+
+
+def test_event_is_read_if_user_has_read_posts_before_it(user, thread):
+    save_read(user, thread.first_post)
+    event = reply_thread(thread, is_event=True)
+    save_event_read(user, event, thread.first_post.id)
+
+    thread_read = user.threadread_set.get()
+    assert thread_read.last_read_post_id == event.id
+
+
+def test_event_is_not_read_if_user_has_not_read_posts_before_it(user, thread):
+    reply = reply_thread(thread)
+    save_read(user, thread.first_post)
+    event = reply_thread(thread, is_event=True)
+    save_event_read(user, event, reply.id)
+
+    thread_read = user.threadread_set.get()
+    assert thread_read.last_read_post_id == thread.first_post.id
+
+
+def test_post_in_new_thread_can_be_saved_as_read_twice(user, thread):
+    save_read(user, thread.first_post)
+    save_read(user, thread.first_post)
+
+    thread_read = user.threadread_set.get()
+    assert thread_read.last_read_post_id == thread.first_post_id
@@ -0,0 +1,212 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from ...conf.test import override_dynamic_settings
+from ...threads.test import reply_thread
+from ...users.test import create_test_user
+from ..models import CategoryRead
+from ..poststracker import save_read
+from ..privatethreads import (
+    count_unread_private_threads,
+    get_unread_participants,
+    update_unread_private_threads,
+)
+
+
+def test_private_thread_is_unread_for_participants_other_than_starter(
+    dynamic_settings, user, private_thread
+):
+    unread_participants = get_unread_participants(dynamic_settings, private_thread)
+    assert unread_participants == {user.id}
+
+
+def test_private_thread_read_by_participant_is_not_unread_for_them(
+    dynamic_settings, user, private_thread
+):
+    save_read(user, private_thread.first_post)
+    unread_participants = get_unread_participants(dynamic_settings, private_thread)
+    assert not unread_participants
+
+
+def test_private_thread_with_unread_reply_is_unread_for_participant(
+    dynamic_settings, user, private_thread
+):
+    save_read(user, private_thread.first_post)
+    reply_thread(private_thread)
+
+    unread_participants = get_unread_participants(
+        dynamic_settings, private_thread, [user]
+    )
+    assert unread_participants == {user.id}
+
+
+def test_private_thread_in_read_category_is_not_unread_for_participant(
+    dynamic_settings, user, private_thread
+):
+    CategoryRead.objects.create(
+        user=user,
+        category=private_thread.category,
+        last_read_post_id=private_thread.last_post_id,
+    )
+
+    unread_participants = get_unread_participants(
+        dynamic_settings, private_thread, [user]
+    )
+    assert not unread_participants
+
+
+def test_unread_participants_are_limited_to_given_users(
+    dynamic_settings, user, private_thread
+):
+    unread_participants = get_unread_participants(
+        dynamic_settings, private_thread, [user]
+    )
+    assert unread_participants == {user.id}
+
+
+def test_private_thread_posted_before_user_joined_is_not_unread_for_them(
+    dynamic_settings, private_thread
+):
+    new_user = create_test_user("NewUser", "newuser@example.com")
+    private_thread.threadparticipant_set.create(user=new_user)
+
+    unread_participants = get_unread_participants(
+        dynamic_settings, private_thread, [new_user]
+    )
+    assert not unread_participants
+
+
+@override_dynamic_settings(readtracker_cutoff=5)
+def test_private_thread_older_than_cutoff_is_not_unread(
+    dynamic_settings, user, private_thread
+):
+    private_thread.post_set.update(posted_on=timezone.now() - timedelta(days=10))
+    user.joined_on = timezone.now() - timedelta(days=20)
+    user.save()
+
+    unread_participants = get_unread_participants(
+        dynamic_settings, private_thread, [user]
+    )
+    assert not unread_participants
+
+
+def test_other_user_unapproved_reply_is_not_unread_for_participant(
+    dynamic_settings, user, private_thread
+):
+    save_read(user, private_thread.first_post)
+    reply_thread(private_thread, is_unapproved=True)
+
+    unread_participants = get_unread_participants(
+        dynamic_settings, private_thread, [user]
+    )
+    assert not unread_participants
+
+
+def test_participant_own_reply_is_not_unread_for_them(
+    dynamic_settings, user, other_user, private_thread
+):
+    save_read(user, private_thread.first_post)
+    save_read(other_user, private_thread.first_post)
+    reply_thread(private_thread, poster=user)
+
+    unread_participants = get_unread_participants(dynamic_settings, private_thread)
+    assert unread_participants == {other_user.id}
+
+
+def test_hidden_event_is_not_unread_for_participant(
+    dynamic_settings, user, private_thread
+):
+    save_read(user, private_thread.first_post)
+    reply_thread(private_thread, is_event=True, is_hidden=True)
+
+    unread_participants = get_unread_participants(
+        dynamic_settings, private_thread, [user]
+    )
+    assert not unread_participants
+
+
+def test_unread_private_threads_are_counted(dynamic_settings, user, private_thread):
+    assert count_unread_private_threads(dynamic_settings, user) == 1
+
+
+def test_read_private_threads_are_not_counted(dynamic_settings, user, private_thread):
+    save_read(user, private_thread.first_post)
+    assert count_unread_private_threads(dynamic_settings, user) == 0
+
+
+def test_update_increases_counts_of_participants_for_whom_thread_became_unread(
+    user, other_user
+):
+    update_unread_private_threads({other_user.id}, {user.id, other_user.id})
+
+    user.refresh_from_db()
+    assert user.unread_private_threads == 1
+
+    other_user.refresh_from_db()
+    assert other_user.unread_private_threads == 0
+
+
+def test_update_decreases_counts_of_participants_for_whom_thread_became_read(
+    user, other_user
+):
+    user.unread_private_threads = 2
+    user.save()
+
+    update_unread_private_threads({user.id, other_user.id}, {other_user.id})
+
+    user.refresh_from_db()
+    assert user.unread_private_threads == 1
+
+
+def test_update_doesnt_decrease_counts_below_zero(user):
+    update_unread_private_threads({user.id}, set())
+
+    user.refresh_from_db()
+    assert user.unread_private_threads == 0
+
+
+def test_deleting_private_thread_decreases_participants_counts(
+    user, other_user, private_thread
+):
+    save_read(other_user, private_thread.first_post)
+    for participant in (user, other_user):
+        participant.unread_private_threads = 1
+        participant.save()
+
+    private_thread.delete()
+
+    user.refresh_from_db()
+    assert user.unread_private_threads == 0
+
+    other_user.refresh_from_db()
+    assert other_user.unread_private_threads == 1
+
+
+def test_reading_private_thread_decreases_participant_count(
+    user, user_client, private_thread
+):
+    user.unread_private_threads = 1
+    user.save()
+
+    response = user_client.post(private_thread.first_post.get_read_api_url())
+    assert response.status_code == 200
+    assert response.json() == {"thread_is_read": True}
+
+    user.refresh_from_db()
+    assert user.unread_private_threads == 0
+
+
+def test_reading_private_thread_with_unread_reply_keeps_participant_count(
+    user, user_client, private_thread
+):
+    reply_thread(private_thread)
+    user.unread_private_threads = 1
+    user.save()
+
+    response = user_client.post(private_thread.first_post.get_read_api_url())
+    assert response.status_code == 200
+    assert response.json() == {"thread_is_read": False}
+
+    user.refresh_from_db()
+    assert user.unread_private_threads == 1
@@ -0,0 +1,68 @@
+from io import StringIO
+
+from django.core import management
+
+from ..management.commands import syncunreadprivatethreads
+from ..poststracker import save_read
+
+
+def call_command():
+    command = syncunreadprivatethreads.Command()
+
+    out = StringIO()
+    management.call_command(command, stdout=out)
+    return out.getvalue().strip().splitlines()[-1].strip()
+
+
+def test_command_works_if_there_are_no_private_threads(db):
+    command_output = call_command()
+    assert command_output == "Synchronized 0 users, fixed 0 counts"
+
+
+def test_command_fixes_count_of_unread_private_threads(user, private_thread):
+    command_output = call_command()
+    assert command_output == "Synchronized 2 users, fixed 1 counts"
+
+    user.refresh_from_db()
+    assert user.unread_private_threads == 1
+
+
+def test_command_fixes_count_of_read_private_threads(user, private_thread):
+    save_read(user, private_thread.first_post)
+    user.unread_private_threads = 3
+    user.save()
+
+    call_command()
+
+    user.refresh_from_db()
+    assert user.unread_private_threads == 0
+
+
+def test_command_keeps_valid_count(user, private_thread):
+    user.unread_private_threads = 1
+    user.save()
+
+    command_output = call_command()
+    assert command_output == "Synchronized 2 users, fixed 0 counts"
+
+
+def test_command_fixes_count_of_user_not_participating_in_private_threads(user):
+    user.unread_private_threads = 2
+    user.save()
+
+    call_command()
+
+    user.refresh_from_db()
+    assert user.unread_private_threads == 0
+
+
+def test_command_clears_users_sync_flag(user, private_thread):
+    user.unread_private_threads = 1
+    user.sync_unread_private_threads = True
+    user.save()
+
+    call_command()
+
+    user.refresh_from_db()
+    assert user.unread_private_threads == 1
+    assert not user.sync_unread_private_threads
@@ -3,7 +3,9 @@ from datetime import timedelta
 from django.utils import timezone
 
 from ...conf.test import override_dynamic_settings
-from ...threads.test import reply_thread
+from ...threads.test import post_thread, reply_thread
+from ..models import CategoryRead
+from ..poststracker import save_read
 from ..threadstracker import make_read_aware
 
 
@@ -122,3 +124,46 @@ def test_non_tracked_thread_is_marked_as_read_for_anonymous_user(
     make_read_aware(anonymous_request_mock, thread)
     assert thread.is_read
     assert not thread.is_new
+
+
+def test_thread_with_unread_post_before_read_post_is_marked_as_read(
+    request_mock, user, thread
+):
+    reply = reply_thread(thread)
+    save_read(user, reply)
+    make_read_aware(request_mock, thread)
+    assert thread.is_read
+    assert not thread.is_new
+
+
+def test_thread_in_read_category_is_marked_as_read(request_mock, user, thread):
+    CategoryRead.objects.create(
+        user=user, category=thread.category, last_read_post_id=thread.last_post_id
+    )
+    make_read_aware(request_mock, thread)
+    assert thread.is_read
+    assert not thread.is_new
+
+
+def test_thread_with_post_after_read_category_is_marked_as_unread(
+    request_mock, user, thread
+):
+    CategoryRead.objects.create(
+        user=user, category=thread.category, last_read_post_id=thread.last_post_id
+    )
+    reply_thread(thread)
+    make_read_aware(request_mock, thread)
+    assert not thread.is_read
+    assert thread.is_new
+
+
+def test_threads_are_made_read_aware_with_constant_number_of_queries(
+    django_assert_num_queries, request_mock, user, thread, default_category
+):
+    other_thread = post_thread(default_category)
+    save_read(user, thread.first_post)
+    with django_assert_num_queries(3):
+        make_read_aware(request_mock, [thread, other_thread])
+
+    assert thread.is_read
+    assert not other_thread.is_read
@@ -0,0 +1,259 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import Mock
+
+import pytest
+from django.core import management
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ...threads.models import Post, Thread
+from ...threads.test import post_thread, reply_thread
+from ...threads.viewmodels.threads import filter_read_threads_queryset
+from ..management.commands import clearreadtracker
+from ..models import UnreadThread, UnreadThreadsIndex
+from ..poststracker import save_read
+from ..tasks import build_unread_threads_index
+from ..unreadthreads import get_unread_threads_index, rebuild_unread_threads_index
+
+index_enabled = override_settings(MISAGO_UNREAD_THREADS_INDEX_TTL=24)
+
+
+@pytest.fixture
+def index(user):
+    return UnreadThreadsIndex.objects.create(user=user, is_ready=True)
+
+
+@pytest.fixture
+def build_delay(mocker):
+    return mocker.patch("misago.readtracker.tasks.build_unread_threads_index.delay")
+
+
+def get_indexed_threads(user):
+    return set(
+        UnreadThread.objects.filter(index_id=user.id).values_list(
+            "thread_id", flat=True
+        )
+    )
+
+
+def build_index(index, *threads):
+    index.created_on = timezone.now()
+    index.save()
+    for thread in threads:
+        index.unreadthread_set.create(thread=thread)
+
+
+def get_threads_list(client, list_type):
+    response = client.get(reverse("misago:api:thread-list") + "?list=" + list_type)
+    assert response.status_code == 200
+    return [thread["id"] for thread in response.json()["results"]]
+
+
+def test_index_is_not_used_if_its_disabled(user, build_delay):
+    assert get_unread_threads_index(user) is None
+    assert not UnreadThreadsIndex.objects.exists()
+    build_delay.assert_not_called()
+
+
+@index_enabled
+def test_missing_index_build_is_scheduled(
+    user, build_delay, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        assert get_unread_threads_index(user) is None
+
+    build_delay.assert_called_once_with(user.pk)
+    assert not UnreadThreadsIndex.objects.get(user=user).is_ready
+
+
+@index_enabled
+def test_index_that_is_not_ready_is_not_used(
+    user, build_delay, django_capture_on_commit_callbacks
+):
+    UnreadThreadsIndex.objects.create(user=user)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert get_unread_threads_index(user) is None
+
+    build_delay.assert_not_called()
+
+
+@index_enabled
+def test_ready_index_is_used(user, index, build_delay):
+    assert get_unread_threads_index(user) == index
+    build_delay.assert_not_called()
+
+
+@index_enabled
+def test_expired_index_rebuild_is_scheduled(
+    user, index, build_delay, django_capture_on_commit_callbacks
+):
+    index.created_on = timezone.now() - timedelta(hours=25)
+    index.save()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert get_unread_threads_index(user) is None
+
+    build_delay.assert_called_once_with(user.pk)
+
+    index.refresh_from_db()
+    assert not index.is_ready
+    assert index.created_on > timezone.now() - timedelta(hours=1)
+
+
+def test_built_index_contains_unread_threads(
+    dynamic_settings, user, user_acl, thread, default_category
+):
+    read_thread = post_thread(default_category)
+    save_read(user, read_thread.first_post)
+
+    rebuild_unread_threads_index(dynamic_settings, user, user_acl)
+
+    assert UnreadThreadsIndex.objects.get(user=user).is_ready
+    assert get_indexed_threads(user) == {thread.id}
+
+
+def test_rebuilt_index_removes_threads_that_are_no_longer_unread(
+    dynamic_settings, user, user_acl, index, thread
+):
+    index.unreadthread_set.create(thread=thread)
+    save_read(user, thread.first_post)
+
+    rebuild_unread_threads_index(dynamic_settings, user, user_acl)
+    assert not get_indexed_threads(user)
+
+
+def test_index_build_task_builds_user_index(user, thread):
+    build_unread_threads_index(user.id)
+    assert get_indexed_threads(user) == {thread.id}
+
+
+@index_enabled
+def test_reading_last_post_removes_thread_from_index(user, index, thread):
+    index.unreadthread_set.create(thread=thread)
+    save_read(user, thread.first_post)
+    assert not get_indexed_threads(user)
+
+
+@index_enabled
+def test_reading_older_post_keeps_thread_in_index(user, index, thread):
+    reply_thread(thread)
+    index.unreadthread_set.create(thread=thread)
+
+    save_read(user, thread.first_post)
+    assert get_indexed_threads(user) == {thread.id}
+
+
+@index_enabled
+def test_new_threads_list_uses_index(
+    user, index, thread, default_category, user_client
+):
+    post_thread(default_category)
+    build_index(index, thread)
+
+    assert get_threads_list(user_client, "new") == [thread.id]
+
+
+@index_enabled
+def test_unread_threads_list_uses_index(
+    user, index, thread, default_category, user_client
+):
+    other_thread = post_thread(default_category)
+    for unread_thread in (thread, other_thread):
+        save_read(user, unread_thread.first_post)
+        reply_thread(unread_thread, posted_on=timezone.now())
+
+    build_index(index, thread)
+
+    assert get_threads_list(user_client, "unread") == [thread.id]
+    assert get_threads_list(user_client, "new") == []
+
+
+@index_enabled
+def test_threads_list_excludes_indexed_thread_that_was_read(
+    user, index, thread, user_client
+):
+    save_read(user, thread.first_post)
+    index.unreadthread_set.create(thread=thread)
+
+    assert get_threads_list(user_client, "new") == []
+    assert get_threads_list(user_client, "unread") == []
+
+
+@index_enabled
+def test_threads_list_includes_thread_posted_in_after_index_was_built(
+    user, index, thread, default_category, user_client
+):
+    index.created_on = timezone.now() - timedelta(hours=1)
+    index.save()
+
+    other_thread = post_thread(default_category)
+    other_thread.last_post_on = index.created_on - timedelta(minutes=1)
+    other_thread.save()
+
+    assert get_threads_list(user_client, "new") == [thread.id]
+
+
+@index_enabled
+def test_threads_list_excludes_indexed_thread_with_last_post_invisible_to_user(
+    user, index, thread, user_client
+):
+    save_read(user, thread.first_post)
+    event = reply_thread(thread, is_event=True, is_hidden=True)
+    assert thread.last_post_id == event.id
+
+    index.unreadthread_set.create(thread=thread)
+
+    assert get_threads_list(user_client, "new") == []
+    assert get_threads_list(user_client, "unread") == []
+
+
+@index_enabled
+def test_indexed_threads_are_checked_for_posts_invisible_to_user(
+    dynamic_settings, user, user_acl, index, thread, default_category
+):
+    build_index(index, thread)
+    request = Mock(settings=dynamic_settings, user=user, user_acl=user_acl)
+
+    queryset = filter_read_threads_queryset(
+        request, [default_category], "new", Thread.objects.all()
+    )
+    assert Post._meta.db_table in str(queryset.query)
+    assert list(queryset) == [thread]
+
+
+@index_enabled
+def test_indexed_threads_posts_are_not_checked_if_user_can_see_all_posts(
+    dynamic_settings, superuser, superuser_acl, thread, default_category
+):
+    index = UnreadThreadsIndex.objects.create(user=superuser, is_ready=True)
+    build_index(index, thread)
+    request = Mock(settings=dynamic_settings, user=superuser, user_acl=superuser_acl)
+
+    queryset = filter_read_threads_queryset(
+        request, [default_category], "new", Thread.objects.all()
+    )
+    assert Post._meta.db_table not in str(queryset.query)
+    assert list(queryset) == [thread]
+
+
+@index_enabled
+def test_threads_list_falls_back_to_posts_if_index_is_not_ready(
+    user, thread, user_client, build_delay
+):
+    UnreadThreadsIndex.objects.create(user=user)
+    assert get_threads_list(user_client, "new") == [thread.id]
+
+
+@index_enabled
+def test_clearreadtracker_deletes_expired_indexes(user, index, thread):
+    index.unreadthread_set.create(thread=thread)
+    index.created_on = timezone.now() - timedelta(hours=25)
+    index.save()
+
+    management.call_command(clearreadtracker.Command(), stdout=StringIO())
+
+    assert not UnreadThreadsIndex.objects.exists()
+    assert not UnreadThread.objects.exists()
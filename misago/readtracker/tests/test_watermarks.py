@@ -0,0 +1,151 @@
+import pytest
+
+from ...categories.models import Category
+from ...threads.models import Post
+from ...threads.test import post_thread, reply_thread
+from ..models import CategoryRead
+from ..poststracker import save_read
+from ..watermarks import exclude_read_posts, get_threads_watermarks
+
+
+@pytest.fixture
+def other_category(default_category):
+    category = Category(name="Other Category", slug="other-category")
+    category.insert_at(default_category, position="last-child", save=True)
+    return category
+
+
+def test_watermark_of_not_read_thread_is_zero(user, thread):
+    watermarks = get_threads_watermarks(user, [(thread.id, thread.category_id)])
+    assert watermarks == {thread.id: 0}
+
+
+def test_watermark_of_read_thread_is_id_of_last_read_post(user, thread):
+    save_read(user, thread.first_post)
+    watermarks = get_threads_watermarks(user, [(thread.id, thread.category_id)])
+    assert watermarks == {thread.id: thread.first_post_id}
+
+
+def test_watermark_of_thread_read_by_other_user_is_zero(user, other_user, thread):
+    save_read(other_user, thread.first_post)
+    watermarks = get_threads_watermarks(user, [(thread.id, thread.category_id)])
+    assert watermarks == {thread.id: 0}
+
+
+def test_watermark_of_thread_in_read_category_is_category_watermark(
+    user, thread, default_category
+):
+    CategoryRead.objects.create(
+        user=user, category=default_category, last_read_post_id=thread.first_post_id
+    )
+    watermarks = get_threads_watermarks(user, [(thread.id, thread.category_id)])
+    assert watermarks == {thread.id: thread.first_post_id}
+
+
+def test_newer_of_thread_and_category_watermarks_is_used(
+    user, thread, default_category
+):
+    reply = reply_thread(thread)
+    save_read(user, reply)
+    CategoryRead.objects.create(
+        user=user, category=default_category, last_read_post_id=thread.first_post_id
+    )
+    watermarks = get_threads_watermarks(user, [(thread.id, thread.category_id)])
+    assert watermarks == {thread.id: reply.id}
+
+
+def test_read_posts_are_excluded_from_queryset(user, thread, default_category):
+    other_thread = post_thread(default_category)
+    reply = reply_thread(thread)
+    save_read(user, thread.first_post)
+
+    queryset = exclude_read_posts(user, Post.objects.order_by("id"))
+    assert list(queryset) == [other_thread.first_post, reply]
+
+
+def test_posts_in_read_category_are_excluded_from_queryset(
+    user, thread, default_category
+):
+    CategoryRead.objects.create(
+        user=user, category=default_category, last_read_post_id=thread.first_post_id
+    )
+    reply = reply_thread(thread)
+
+    queryset = exclude_read_posts(user, Post.objects.order_by("id"))
+    assert list(queryset) == [reply]
+
+
+def test_merged_thread_is_read_up_to_older_of_read_posts(
+    user, thread, default_category
+):
+    other_thread = post_thread(default_category)
+    reply = reply_thread(other_thread)
+    save_read(user, thread.first_post)
+    save_read(user, reply)
+
+    thread.merge(other_thread)
+    other_thread.delete()
+
+    thread_read = user.threadread_set.get()
+    assert thread_read.thread_id == thread.id
+    assert thread_read.last_read_post_id == thread.first_post_id
+
+
+def test_merged_thread_is_read_up_to_post_before_not_read_thread(
+    user, thread, default_category
+):
+    other_thread = post_thread(default_category)
+    save_read(user, other_thread.first_post)
+
+    thread.merge(other_thread)
+    other_thread.delete()
+
+    thread_read = user.threadread_set.get()
+    assert thread_read.thread_id == thread.id
+    assert thread_read.last_read_post_id == thread.first_post_id - 1
+
+
+def test_category_watermark_is_lowered_below_thread_moved_to_category(
+    user, default_category, other_category
+):
+    moved_thread = post_thread(other_category)
+    thread = post_thread(default_category)
+    category_read = CategoryRead.objects.create(
+        user=user, category=default_category, last_read_post_id=thread.last_post_id
+    )
+
+    moved_thread.move(default_category)
+
+    category_read.refresh_from_db()
+    assert category_read.last_read_post_id == moved_thread.first_post_id - 1
+
+
+def test_category_watermark_is_not_lowered_below_read_thread_moved_to_category(
+    user, default_category, other_category
+):
+    moved_thread = post_thread(other_category)
+    save_read(user, moved_thread.first_post)
+    thread = post_thread(default_category)
+    category_read = CategoryRead.objects.create(
+        user=user, category=default_category, last_read_post_id=thread.last_post_id
+    )
+
+    moved_thread.move(default_category)
+
+    category_read.refresh_from_db()
+    assert category_read.last_read_post_id == thread.last_post_id
+
+
+def test_category_watermark_is_lowered_below_post_moved_to_category(
+    user, thread, default_category, other_category
+):
+    other_thread = post_thread(other_category)
+    moved_post = reply_thread(other_thread)
+    category_read = CategoryRead.objects.create(
+        user=user, category=default_category, last_read_post_id=moved_post.id + 10
+    )
+
+    moved_post.move(thread)
+
+    category_read.refresh_from_db()
+    assert category_read.last_read_post_id == moved_post.id - 1
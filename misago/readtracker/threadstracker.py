@@ -1,6 +1,9 @@
+from django.db.models import Q
+
 from ..threads.models import Post
 from ..threads.permissions import exclude_invisible_posts
 from .cutoffdate import get_cutoff_date
+from .watermarks import get_threads_watermarks
 
 
 def make_read_aware(request, threads):
@@ -17,14 +20,20 @@ def make_read_aware(request, threads):
 
     categories = [t.category for t in threads]
     cutoff_date = get_cutoff_date(request.settings, request.user)
+    watermarks = get_threads_watermarks(
+        request.user, [(t.id, t.category_id) for t in threads]
+    )
+
+    unread_posts = Q()
+    for thread in threads:
+        unread_posts |= Q(thread_id=thread.id, id__gt=watermarks[thread.id])
 
     queryset = (
-        Post.objects.filter(thread__in=threads, posted_on__gt=cutoff_date)
+        Post.objects.filter(unread_posts, posted_on__gt=cutoff_date)
         .values_list("thread", flat=True)
         .distinct()
     )
 
-    queryset = queryset.exclude(id__in=request.user.postread_set.values("post"))
     queryset = exclude_invisible_posts(request.user_acl, categories, queryset)
 
     unread_threads = list(queryset)
@@ -0,0 +1,125 @@
+"""
+Users have indexes of threads with posts they haven't read
+
+"New" and "unread" threads lists use those indexes instead of looking for
+unread posts in all threads. Index is built in background when user opens one
+of those lists, and until it's ready lists keep querying posts. Threads are
+removed from index when they are read, and threads posted in after index was
+built are included by lists without adding them to indexes. Indexes expire and
+are rebuilt after MISAGO_UNREAD_THREADS_INDEX_TTL hours, so threads that got
+unread posts by other means, like approved or moved posts, are eventually
+included in them.
+
+Index may contain threads that were read by other means or which posts were
+deleted, so lists still check threads for unread posts.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from ..categories.models import Category
+from ..conf import settings
+from ..threads.models import Post
+from ..threads.permissions import exclude_invisible_posts
+from .cutoffdate import get_cutoff_date
+from .models import UnreadThread, UnreadThreadsIndex
+from .watermarks import exclude_read_posts
+
+UNREAD_THREADS_INDEX_BATCH_SIZE = 500
+
+
+def get_unread_threads_index(user):
+    """Returns user's ready index, scheduling its build if it's missing or expired"""
+    if not settings.MISAGO_UNREAD_THREADS_INDEX_TTL:
+        return None
+
+    index = UnreadThreadsIndex.objects.filter(user=user).first()
+    if not index:
+        index, created = UnreadThreadsIndex.objects.get_or_create(user=user)
+        if created:
+            schedule_unread_threads_index_build(user)
+        return None
+
+    if index.created_on < get_index_expiration_date():
+        # only one request should schedule rebuild of expired index
+        updated = UnreadThreadsIndex.objects.filter(
+            user=user, created_on=index.created_on
+        ).update(is_ready=False, created_on=timezone.now())
+        if updated:
+            schedule_unread_threads_index_build(user)
+        return None
+
+    if index.is_ready:
+        return index
+
+    return None
+
+
+def get_index_expiration_date():
+    hours = settings.MISAGO_UNREAD_THREADS_INDEX_TTL
+    return timezone.now() - timedelta(hours=hours)
+
+
+def delete_expired_unread_threads_indexes():
+    if not settings.MISAGO_UNREAD_THREADS_INDEX_TTL:
+        return 0
+
+    queryset = UnreadThreadsIndex.objects.filter(
+        created_on__lt=get_index_expiration_date()
+    )
+    return queryset.delete()[0]
+
+
+def schedule_unread_threads_index_build(user):
+    from .tasks import build_unread_threads_index
+
+    transaction.on_commit(lambda: build_unread_threads_index.delay(user.pk))
+
+
+def rebuild_unread_threads_index(settings, user, user_acl):
+    index, _ = UnreadThreadsIndex.objects.get_or_create(user=user)
+    index.unreadthread_set.all().delete()
+
+    categories = Category.objects.all_categories().filter(
+        id__in=user_acl["visible_categories"]
+    )
+
+    cutoff_date = get_cutoff_date(settings, user)
+    visible_posts = Post.objects.filter(posted_on__gt=cutoff_date)
+    visible_posts = exclude_invisible_posts(user_acl, categories, visible_posts)
+    unread_posts = exclude_read_posts(user, visible_posts)
+
+    threads = unread_posts.order_by().values_list("thread_id", flat=True).distinct()
+    UnreadThread.objects.bulk_create(
+        [UnreadThread(index=index, thread_id=thread_id) for thread_id in threads],
+        batch_size=UNREAD_THREADS_INDEX_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+    index.is_ready = True
+    index.save(update_fields=["is_ready"])
+
+
+def filter_unread_threads(index, queryset):
+    """
+    Limits threads queryset to threads in user's unread threads index or
+    posted in after index was built
+    """
+    unread_threads = UnreadThread.objects.filter(index=index, thread_id=OuterRef("id"))
+    return queryset.filter(
+        Exists(unread_threads) | Q(last_post_on__gt=index.created_on)
+    )
+
+
+def remove_read_thread(user, post):
+    """Removes thread from user's unread threads index if post was its last one"""
+    if not settings.MISAGO_UNREAD_THREADS_INDEX_TTL:
+        return
+
+    UnreadThread.objects.filter(
+        index_id=user.pk,
+        thread_id=post.thread_id,
+        thread__last_post_id__lte=post.id,
+    ).delete()
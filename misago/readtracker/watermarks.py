@@ -0,0 +1,118 @@
+"""
+Read tracker stores ids of last posts read by users in threads and categories
+
+User has read post if its id is lower or equal to the id stored for its thread
+or category, so read state of page of threads or posts is resolved by looking
+up few rows by their thread and category ids.
+"""
+from django.db.models import Exists, F, OuterRef, PositiveIntegerField, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest, Least
+
+from .models import CategoryRead, ThreadRead
+
+
+def get_threads_watermarks(user, threads):
+    """
+    Returns dict of threads ids and ids of last posts user has read in them
+
+    Takes iterable of (thread id, category id) tuples.
+    """
+    threads = set(threads)
+    if not threads:
+        return {}
+
+    threads_reads = dict(
+        ThreadRead.objects.filter(
+            user=user, thread_id__in={thread_id for thread_id, _ in threads}
+        ).values_list("thread_id", "last_read_post_id")
+    )
+    categories_reads = dict(
+        CategoryRead.objects.filter(
+            user=user, category_id__in={category_id for _, category_id in threads}
+        ).values_list("category_id", "last_read_post_id")
+    )
+
+    return {
+        thread_id: max(
+            threads_reads.get(thread_id, 0), categories_reads.get(category_id, 0)
+        )
+        for thread_id, category_id in threads
+    }
+
+
+def get_thread_watermark(user, thread):
+    watermarks = get_threads_watermarks(user, [(thread.id, thread.category_id)])
+    return watermarks[thread.id]
+
+
+def exclude_read_posts(user, queryset):
+    """Excludes posts user has read from posts queryset"""
+    read_in_thread = ThreadRead.objects.filter(
+        user=user,
+        thread_id=OuterRef("thread_id"),
+        last_read_post_id__gte=OuterRef("id"),
+    )
+    read_in_category = CategoryRead.objects.filter(
+        user=user,
+        category_id=OuterRef("category_id"),
+        last_read_post_id__gte=OuterRef("id"),
+    )
+
+    return queryset.exclude(Exists(read_in_thread)).exclude(Exists(read_in_category))
+
+
+def exclude_read_threads(user, queryset):
+    """Excludes threads which last posts user has read from threads queryset"""
+    read_in_thread = ThreadRead.objects.filter(
+        user=user,
+        thread_id=OuterRef("id"),
+        last_read_post_id__gte=OuterRef("last_post_id"),
+    )
+    read_in_category = CategoryRead.objects.filter(
+        user=user,
+        category_id=OuterRef("category_id"),
+        last_read_post_id__gte=OuterRef("last_post_id"),
+    )
+
+    return queryset.exclude(Exists(read_in_thread)).exclude(Exists(read_in_category))
+
+
+def get_visited_threads_condition(user):
+    """
+    Returns condition matching threads user has read before
+
+    User has read thread before if they have its thread read, or if category
+    read covers thread's first post, like when threads reads were collapsed
+    into it.
+    """
+    read_in_thread = ThreadRead.objects.filter(user=user, thread_id=OuterRef("id"))
+    read_in_category = CategoryRead.objects.filter(
+        user=user,
+        category_id=OuterRef("category_id"),
+        last_read_post_id__gte=OuterRef("first_post_id"),
+    )
+
+    return Q(Exists(read_in_thread)) | Q(Exists(read_in_category))
+
+
+def lower_category_reads(category, thread, first_post_id, last_post_id):
+    """
+    Lowers users watermarks in category below posts moved to it from thread
+
+    Moved posts may be older than category's watermark, which would mark them
+    as read for users who haven't read them in thread. Lowered watermark makes
+    category's posts following them unread again, which is preferred to hiding
+    posts that users haven't read.
+    """
+    thread_reads = ThreadRead.objects.filter(user_id=OuterRef("user_id"), thread=thread)
+    last_read_post_id = Greatest(
+        Coalesce(Subquery(thread_reads.values("last_read_post_id")), 0),
+        first_post_id - 1,
+        output_field=PositiveIntegerField(),
+    )
+
+    CategoryRead.objects.filter(
+        category=category, last_read_post_id__gte=first_post_id
+    ).exclude(Exists(thread_reads.filter(last_read_post_id__gte=last_post_id))).update(
+        last_read_post_id=Least(F("last_read_post_id"), last_read_post_id)
+    )
@@ -1,14 +1,12 @@
 from django.urls import reverse
 
+from ..core.frontendcontext import update_frontend_context_lazily
 from .searchproviders import searchproviders
 
 
 def search_providers(request):
-    allowed_providers = []
-
     try:
-        if request.user_acl["can_search"]:
-            allowed_providers = searchproviders.get_allowed_providers(request)
+        request.user_acl
     except AttributeError:
         # is user has no acl_cache attribute, cease entire middleware
         # this is edge case that occurs when debug toolbar intercepts
@@ -16,12 +14,26 @@ def search_providers(request):
         # with non-misago's anonymous user model that has no acl support
         return {}
 
-    request.frontend_context["SEARCH_URL"] = reverse("misago:search")
-    request.frontend_context["SEARCH_API"] = reverse("misago:api:search")
-    request.frontend_context["SEARCH_PROVIDERS"] = []
+    update_frontend_context_lazily(
+        request,
+        "search_providers",
+        lambda frontend_context: add_search_providers(request, frontend_context),
+    )
+
+    return {}
+
+
+def add_search_providers(request, frontend_context):
+    allowed_providers = []
+    if request.user_acl["can_search"]:
+        allowed_providers = searchproviders.get_allowed_providers(request)
+
+    frontend_context["SEARCH_URL"] = reverse("misago:search")
+    frontend_context["SEARCH_API"] = reverse("misago:api:search")
+    frontend_context["SEARCH_PROVIDERS"] = []
 
     for provider in allowed_providers:
-        request.frontend_context["SEARCH_PROVIDERS"].append(
+        frontend_context["SEARCH_PROVIDERS"].append(
             {
                 "id": provider.url,
                 "name": str(provider.name),
@@ -36,5 +48,3 @@ def search_providers(request):
                 "time": None,
             }
         )
-
-    return {}
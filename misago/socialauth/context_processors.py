@@ -1,9 +1,15 @@
 from django.urls import reverse
 
+from ..core.frontendcontext import update_frontend_context
+from .cache import socialauth_cache
+
 
 def preload_socialauth_json(request):
-    request.frontend_context.update(
-        {"SOCIAL_AUTH": list_enabled_social_auth_providers(request.socialauth)}
+    update_frontend_context(
+        request,
+        socialauth_cache,
+        "socialauth",
+        lambda: {"SOCIAL_AUTH": list_enabled_social_auth_providers(request.socialauth)},
     )
 
     return {}
@@ -3,7 +3,7 @@ from unittest.mock import Mock
 from ..context_processors import preload_socialauth_json
 
 
-def test_context_processor_sets_socialauth_entry_in_frontend_context():
-    request = Mock(frontend_context={}, socialauth={})
+def test_context_processor_sets_socialauth_entry_in_frontend_context(cache_versions):
+    request = Mock(frontend_context={}, socialauth={}, cache_versions=cache_versions)
     preload_socialauth_json(request)
     assert "SOCIAL_AUTH" in request.frontend_context
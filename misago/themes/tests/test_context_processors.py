@@ -11,6 +11,10 @@ def mock_request(cache_versions):
     return Mock(cache_versions=cache_versions)
 
 
+def load_theme(request):
+    return dict(context_processor(request)["theme"])
+
+
 def test_theme_data_is_included_in_template_context(db, mock_request):
     assert context_processor(mock_request)["theme"]
 
@@ -20,7 +24,7 @@ def test_theme_is_loaded_from_database_if_cache_is_not_available(
 ):
     mocker.patch("django.core.cache.cache.get", return_value=None)
     with django_assert_num_queries(3):
-        context_processor(mock_request)
+        load_theme(mock_request)
 
 
 def test_theme_is_loaded_from_cache_if_it_is_set(
@@ -28,7 +32,7 @@ def test_theme_is_loaded_from_cache_if_it_is_set(
 ):
     cache_get = mocker.patch("django.core.cache.cache.get", return_value={})
     with django_assert_num_queries(0):
-        context_processor(mock_request)
+        load_theme(mock_request)
     cache_get.assert_called_once()
 
 
@@ -36,7 +40,7 @@ def test_theme_cache_is_set_if_none_exists(db, mocker, mock_request):
     cache_set = mocker.patch("django.core.cache.cache.set")
     mocker.patch("django.core.cache.cache.get", return_value=None)
 
-    context_processor(mock_request)
+    load_theme(mock_request)
     cache_set.assert_called_once()
 
 
@@ -46,7 +50,7 @@ def test_theme_cache_is_not_set_if_it_already_exists(
     cache_set = mocker.patch("django.core.cache.cache.set")
     mocker.patch("django.core.cache.cache.get", return_value={})
     with django_assert_num_queries(0):
-        context_processor(mock_request)
+        load_theme(mock_request)
     cache_set.assert_not_called()
 
 
@@ -55,7 +59,16 @@ def test_theme_cache_key_includes_cache_name_and_version(
 ):
     cache_set = mocker.patch("django.core.cache.cache.set")
     mocker.patch("django.core.cache.cache.get", return_value=None)
-    context_processor(mock_request)
+    load_theme(mock_request)
     cache_key = cache_set.call_args[0][0]
     assert THEME_CACHE in cache_key
     assert cache_versions[THEME_CACHE] in cache_key
+
+
+def test_theme_is_not_loaded_until_template_reads_it(
+    db, mocker, mock_request, django_assert_num_queries
+):
+    cache_get = mocker.patch("django.core.cache.cache.get", return_value=None)
+    with django_assert_num_queries(0):
+        context_processor(mock_request)
+    cache_get.assert_not_called()
@@ -8,6 +8,7 @@ from .views.attachmenttypes import (
     EditAttachmentType,
     NewAttachmentType,
 )
+from .views.checksums import audit_checksums
 
 
 class MisagoAdminExtension:
@@ -21,6 +22,13 @@ class MisagoAdminExtension:
             path("delete/<int:pk>/", DeleteAttachment.as_view(), name="delete"),
         )
 
+        # Posts checksums
+        urlpatterns.namespace("posts-checksums/", "posts-checksums")
+        urlpatterns.patterns(
+            "posts-checksums",
+            path("audit/", audit_checksums, name="audit"),
+        )
+
         # AttachmentType
         urlpatterns.namespace("attachment-types/", "attachment-types", "settings")
         urlpatterns.patterns(
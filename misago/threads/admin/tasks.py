@@ -0,0 +1,67 @@
+from celery import shared_task
+from django.core.cache import cache
+from django.utils import timezone
+
+from ..checksums import verify_posts
+from ..models import Post
+
+POSTS_CHECKSUMS_AUDIT_CACHE_KEY = "misago_posts_checksums_audit"
+POSTS_CHECKSUMS_AUDIT_CHUNK_SIZE = 500
+POSTS_CHECKSUMS_AUDIT_REPORTED_POSTS = 100
+
+
+@shared_task
+def audit_posts_checksums():
+    """Verifies checksums of all posts, reporting posts that have invalid ones"""
+    report = {
+        "is_completed": False,
+        "started_on": timezone.now(),
+        "completed_on": None,
+        "checked": 0,
+        "invalid": 0,
+        "invalid_posts": [],
+    }
+
+    set_posts_checksums_audit(report)
+
+    # Posts are read in short queries of id-ordered chunks, so audit doesn't
+    # keep long-running transaction open and doesn't lock rows it reads
+    for posts in get_posts_chunks():
+        invalid_posts = verify_posts(posts, use_cache=False)
+
+        report["checked"] += len(posts)
+        report["invalid"] += len(invalid_posts)
+        for post in invalid_posts:
+            if len(report["invalid_posts"]) < POSTS_CHECKSUMS_AUDIT_REPORTED_POSTS:
+                report["invalid_posts"].append(post.id)
+
+        set_posts_checksums_audit(report)
+
+    report["is_completed"] = True
+    report["completed_on"] = timezone.now()
+    set_posts_checksums_audit(report)
+
+
+def get_posts_chunks():
+    queryset = (
+        Post.objects.filter(is_event=False)
+        .only("id", "parsed", "checksum", "posted_on")
+        .order_by("id")
+    )
+
+    last_id = 0
+    while True:
+        posts = list(queryset.filter(id__gt=last_id)[:POSTS_CHECKSUMS_AUDIT_CHUNK_SIZE])
+        if not posts:
+            break
+
+        yield posts
+        last_id = posts[-1].id
+
+
+def get_posts_checksums_audit():
+    return cache.get(POSTS_CHECKSUMS_AUDIT_CACHE_KEY)
+
+
+def set_posts_checksums_audit(report):
+    cache.set(POSTS_CHECKSUMS_AUDIT_CACHE_KEY, report, None)
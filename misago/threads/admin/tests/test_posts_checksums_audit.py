@@ -0,0 +1,111 @@
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+
+from ....test import assert_contains
+from ...test import reply_thread
+from ..tasks import audit_posts_checksums, get_posts_checksums_audit
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+admin_link = reverse("misago:admin:index")
+audit_link = reverse("misago:admin:posts-checksums:audit")
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache():
+    # Audit report is stored in cache, which is disabled in tests
+    with override_settings(CACHES=LOCMEM_CACHES):
+        yield
+        cache.clear()
+
+
+@pytest.fixture
+def invalid_post(thread):
+    post = reply_thread(thread)
+    post.parsed = "<p>Injected!</p>"
+    post.save()
+    return post
+
+
+@pytest.fixture
+def mock_audit_posts_checksums(mocker):
+    delay = mocker.Mock()
+    mocker.patch(
+        "misago.threads.admin.views.checksums.audit_posts_checksums",
+        mocker.Mock(delay=delay),
+    )
+    return delay
+
+
+def test_audit_reports_checked_posts(thread):
+    reply_thread(thread)
+    audit_posts_checksums()
+
+    audit = get_posts_checksums_audit()
+    assert audit["is_completed"]
+    assert audit["completed_on"]
+    assert audit["checked"] == 2
+    assert audit["invalid"] == 0
+    assert audit["invalid_posts"] == []
+
+
+def test_audit_reports_posts_with_invalid_checksums(thread, invalid_post):
+    audit_posts_checksums()
+
+    audit = get_posts_checksums_audit()
+    assert audit["checked"] == 2
+    assert audit["invalid"] == 1
+    assert audit["invalid_posts"] == [invalid_post.id]
+
+
+def test_audit_reads_posts_in_chunks(mocker, thread):
+    mocker.patch("misago.threads.admin.tasks.POSTS_CHECKSUMS_AUDIT_CHUNK_SIZE", 1)
+    reply_thread(thread)
+    reply_thread(thread)
+    audit_posts_checksums()
+
+    audit = get_posts_checksums_audit()
+    assert audit["checked"] == 3
+
+
+def test_audit_skips_events(thread):
+    reply_thread(thread, is_event=True)
+    audit_posts_checksums()
+
+    audit = get_posts_checksums_audit()
+    assert audit["checked"] == 1
+
+
+def test_audit_is_started_by_admin(admin_client, mock_audit_posts_checksums):
+    response = admin_client.post(audit_link)
+    assert response.status_code == 302
+    mock_audit_posts_checksums.assert_called_once()
+
+
+def test_audit_is_not_started_by_get_request(admin_client, mock_audit_posts_checksums):
+    response = admin_client.get(audit_link)
+    assert response.status_code == 302
+    mock_audit_posts_checksums.assert_not_called()
+
+
+def test_dashboard_displays_audit_button_if_audit_was_not_run(admin_client):
+    response = admin_client.get(admin_link)
+    assert_contains(response, "Posts checksums were not audited.")
+    assert_contains(response, audit_link)
+
+
+def test_dashboard_displays_audit_result(admin_client, thread):
+    audit_posts_checksums()
+    response = admin_client.get(admin_link)
+    assert_contains(response, "Posts checksums are valid.")
+
+
+def test_dashboard_displays_posts_with_invalid_checksums(admin_client, invalid_post):
+    audit_posts_checksums()
+    response = admin_client.get(admin_link)
+    assert_contains(response, "There is 1 post with invalid checksum.")
+    assert_contains(response, "<code>%s</code>" % invalid_post.id)
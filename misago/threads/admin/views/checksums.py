@@ -0,0 +1,13 @@
+from django.contrib import messages
+from django.shortcuts import redirect
+from django.utils.translation import gettext as _
+
+from ..tasks import audit_posts_checksums
+
+
+def audit_checksums(request):
+    if request.method == "POST":
+        audit_posts_checksums.delay()
+        messages.success(request, _("Posts checksums audit has been started."))
+
+    return redirect("misago:admin:index")
@@ -3,6 +3,7 @@ from django.utils.translation import gettext as _
 from rest_framework.response import Response
 
 from ....acl.objectacl import add_acl_to_obj
+from ....readtracker.poststracker import delete_reads
 from ...serializers import MergePostsSerializer, PostSerializer
 
 
@@ -44,7 +45,7 @@ def posts_merge_endpoint(request, thread):
     first_post.update_search_vector()
     first_post.save(update_fields=["search_vector"])
 
-    first_post.postread_set.all().delete()
+    delete_reads(first_post)
 
     thread.synchronize()
     thread.save()
@@ -1,13 +1,18 @@
 from rest_framework.response import Response
 
+from ....categories import PRIVATE_THREADS_ROOT_NAME
 from ....readtracker import poststracker, threadstracker
+from ....readtracker.privatethreads import (
+    get_unread_participants,
+    update_unread_private_threads,
+)
 from ....readtracker.signals import thread_read
 
 
 def post_read_endpoint(request, thread, post):
     poststracker.make_read_aware(request, post)
     if post.is_new:
-        poststracker.save_read(request.user, post)
+        save_read(request, thread, post)
         if thread.subscription and thread.subscription.last_read_on < post.posted_on:
             thread.subscription.last_read_on = post.posted_on
             thread.subscription.save()
@@ -20,3 +25,16 @@ def post_read_endpoint(request, thread, post):
         thread_read.send(request.user, thread=thread)
 
     return Response({"thread_is_read": thread.is_read})
+
+
+def save_read(request, thread, post):
+    if thread.thread_type.root_name != PRIVATE_THREADS_ROOT_NAME:
+        poststracker.save_read(request.user, post)
+        return
+
+    users = [request.user]
+    unread_participants = get_unread_participants(request.settings, thread, users)
+    poststracker.save_read(request.user, post)
+    update_unread_private_threads(
+        unread_participants, get_unread_participants(request.settings, thread, users)
+    )
@@ -1,17 +1,26 @@
 from . import PostingEndpoint, PostingMiddleware
 from ....categories import PRIVATE_THREADS_ROOT_NAME
-from ...participants import set_users_unread_private_threads_sync
+from ....readtracker.privatethreads import (
+    get_unread_participants,
+    update_unread_private_threads,
+)
 
 
 class SyncPrivateThreadsMiddleware(PostingMiddleware):
-    """middleware that sets private thread participants to sync unread threads"""
+    """middleware that updates participants unread private threads counts"""
 
     def use_this_middleware(self):
+        # new thread's participants are counted when they are added to it,
+        # and its starter's own post is never unread for them
         if self.mode == PostingEndpoint.REPLY:
             return self.thread.thread_type.root_name == PRIVATE_THREADS_ROOT_NAME
         return False
 
+    def pre_save(self, serializer):
+        self.unread_participants = get_unread_participants(self.settings, self.thread)
+
     def post_save(self, serializer):
-        set_users_unread_private_threads_sync(
-            participants=self.thread.participants_list, exclude_user=self.user
+        update_unread_private_threads(
+            self.unread_participants,
+            get_unread_participants(self.settings, self.thread),
         )
@@ -1,9 +1,93 @@
+from collections import OrderedDict
+from threading import Lock
+
+from ..conf import settings
 from ..markup import checksums
 
 
+class PostsChecksumsCache:
+    """
+    Bounded process-local cache of posts with verified checksums
+
+    Entries are stored under post's id and checksum, but they also keep values
+    that checksum was made from. Post is only considered valid if those values
+    are same as post's, so tampering with post's parsed text is still detected
+    after its checksum was verified.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.posts = OrderedDict()
+
+    def get_valid(self, posts):
+        """returns set of ids of posts found valid in cache"""
+        valid = set()
+        with self.lock:
+            for post in posts:
+                key = (post.id, post.checksum)
+                values = self.posts.get(key)
+                if values and values == get_post_checksum_values(post):
+                    self.posts.move_to_end(key)
+                    valid.add(post.id)
+        return valid
+
+    def set_valid(self, posts):
+        size = settings.MISAGO_POSTS_CHECKSUMS_CACHE_SIZE
+        with self.lock:
+            for post in posts:
+                key = (post.id, post.checksum)
+                self.posts[key] = get_post_checksum_values(post)
+                self.posts.move_to_end(key)
+            while len(self.posts) > size:
+                self.posts.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.posts.clear()
+
+
+posts_checksums_cache = PostsChecksumsCache()
+
+
 def is_post_valid(post):
-    valid_checksum = make_post_checksum(post)
-    return post.checksum == valid_checksum
+    verified = getattr(post, "_verified_checksum", None)
+    if verified and verified == (post.checksum, *get_post_checksum_values(post)):
+        return True
+
+    return not verify_posts([post])
+
+
+def verify_posts(posts, use_cache=True):
+    """
+    Verifies checksums of posts, returning list of posts with invalid ones
+
+    Valid posts are marked as verified, so reading their is_valid attribute
+    doesn't compute their checksums again.
+    """
+    use_cache = use_cache and settings.MISAGO_POSTS_CHECKSUMS_CACHE_SIZE
+    if use_cache:
+        cached_posts = posts_checksums_cache.get_valid(posts)
+    else:
+        cached_posts = ()
+
+    valid_posts = []
+    invalid_posts = []
+    for post in posts:
+        if post.id in cached_posts or post.checksum == make_post_checksum(post):
+            post._verified_checksum = (post.checksum, *get_post_checksum_values(post))
+            if post.id not in cached_posts:
+                valid_posts.append(post)
+        else:
+            invalid_posts.append(post)
+
+    if use_cache and valid_posts:
+        posts_checksums_cache.set_valid(valid_posts)
+
+    return invalid_posts
+
+
+def get_post_checksum_values(post):
+    return post.parsed, post.posted_on.date()
 
 
 def make_post_checksum(post):
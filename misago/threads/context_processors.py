@@ -1,15 +1,22 @@
 from django.urls import reverse
 
+from ..conf.cache import settings_cache
+from ..core.frontendcontext import update_frontend_context
+
 
 def preload_threads_urls(request):
-    request.frontend_context.update(
-        {
-            "ATTACHMENTS_API": reverse("misago:api:attachment-list"),
-            "THREAD_EDITOR_API": reverse("misago:api:thread-editor"),
-            "THREADS_API": reverse("misago:api:thread-list"),
-            "PRIVATE_THREADS_API": reverse("misago:api:private-thread-list"),
-            "PRIVATE_THREADS_URL": reverse("misago:private-threads"),
-        }
+    update_frontend_context(
+        request, settings_cache, "threads_urls", get_threads_urls_frontend_context
     )
 
     return {}
+
+
+def get_threads_urls_frontend_context():
+    return {
+        "ATTACHMENTS_API": reverse("misago:api:attachment-list"),
+        "THREAD_EDITOR_API": reverse("misago:api:thread-editor"),
+        "THREADS_API": reverse("misago:api:thread-list"),
+        "PRIVATE_THREADS_API": reverse("misago:api:private-thread-list"),
+        "PRIVATE_THREADS_URL": reverse("misago:private-threads"),
+    }
@@ -1,11 +1,21 @@
 from django.utils import timezone
 
+from ..categories import PRIVATE_THREADS_ROOT_NAME
 from ..readtracker import poststracker
+from ..readtracker.privatethreads import (
+    get_unread_participants,
+    update_unread_private_threads,
+)
 from .models import Post
 
 
 def record_event(request, thread, event_type, context=None, commit=True):
     time_now = timezone.now()
+    last_post_id = thread.last_post_id
+
+    is_private = thread.thread_type.root_name == PRIVATE_THREADS_ROOT_NAME
+    if is_private:
+        unread_participants = get_unread_participants(request.settings, thread)
 
     event = Post.objects.create(
         category=thread.category,
@@ -31,6 +41,11 @@ def record_event(request, thread, event_type, context=None, commit=True):
         if commit:
             thread.category.save()
 
-    poststracker.save_read(request.user, event)
+    poststracker.save_event_read(request.user, event, last_post_id)
+
+    if is_private:
+        update_unread_private_threads(
+            unread_participants, get_unread_participants(request.settings, thread)
+        )
 
     return event
@@ -0,0 +1,260 @@
+import multiprocessing
+import os
+import time
+from argparse import ArgumentTypeError
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from django.contrib.postgres.search import SearchVector
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+from ....conf import settings
+from ....conf.shortcuts import get_dynamic_settings
+from ....core.management.progressbar import show_progress
+from ....core.utils import get_host_from_address
+from ....markup.mentions import find_mentions_in_texts
+from ....markup.parser import parse
+from ....users.mentions import resolve_mentions_in_bulk
+from ...checksums import update_post_checksum
+from ...models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        "Parses posts again, updating their parsed text, checksums, mentions and "
+        "search documents. Use it after changing markup extensions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            dest="processes",
+            default=os.cpu_count() or 1,
+            type=int,
+            help="Number of worker processes parsing posts.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            dest="chunk_size",
+            default=500,
+            type=int,
+            help="Number of posts parsed by worker process at once.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            dest="checkpoint",
+            default=0,
+            type=int,
+            help="Id of last reparsed post. Only posts with greater ids are parsed.",
+        )
+        parser.add_argument(
+            "--category",
+            dest="categories",
+            action="append",
+            type=int,
+            help="Id of category to reparse posts in. Can be used multiple times.",
+        )
+        parser.add_argument(
+            "--since",
+            dest="since",
+            type=parse_date,
+            help="Only reparse posts posted on or after this date (YYYY-MM-DD).",
+        )
+        parser.add_argument(
+            "--until",
+            dest="until",
+            type=parse_date,
+            help="Only reparse posts posted before this date (YYYY-MM-DD).",
+        )
+        parser.add_argument(
+            "--host",
+            dest="host",
+            help=(
+                "Forum's host used to tell internal links from outgoing ones. "
+                "Defaults to host from forum address setting."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        host = options["host"] or get_forum_host()
+        if not host:
+            raise CommandError(
+                "Forum address setting is not set. Set it or use --host option."
+            )
+
+        filters = {
+            "checkpoint": options["checkpoint"],
+            "categories": options["categories"],
+            "since": options["since"],
+            "until": options["until"],
+        }
+
+        queryset = get_posts_queryset(filters)
+        posts_to_reparse = queryset.count()
+        if not posts_to_reparse:
+            self.stdout.write("\n\nNo posts were found")
+            return
+
+        self.stdout.write("Reparsing %s posts...\n" % posts_to_reparse)
+
+        chunks = get_ids_chunks(queryset, options["chunk_size"])
+
+        reparsed_count = 0
+        checkpoint = filters["checkpoint"]
+        show_progress(self, reparsed_count, posts_to_reparse)
+        start_time = time.time()
+
+        # Checkpoint is written after every chunk and when command stops, so
+        # interrupted or crashed run can be resumed from it
+        try:
+            for count, last_id in self.reparse_chunks(
+                chunks, host, filters, options["processes"]
+            ):
+                reparsed_count += count
+                checkpoint = last_id
+                show_progress(self, reparsed_count, posts_to_reparse, start_time)
+                self.stdout.write(" checkpoint: %s" % checkpoint, ending="")
+
+            duration = max(time.time() - start_time, 0.001)
+            self.stdout.write(
+                "\n\nReparsed %s posts in %.2fs (%.1f posts/s)"
+                % (reparsed_count, duration, reparsed_count / duration)
+            )
+        finally:
+            self.stdout.write("\nLast checkpoint: %s" % checkpoint)
+
+    def reparse_chunks(self, chunks, host, filters, processes):
+        """Yields results in order of chunks, so checkpoint is never ahead"""
+        if processes < 2:
+            for chunk in chunks:
+                yield reparse_posts(chunk, host, filters)
+            return
+
+        first_chunk = next(chunks, None)
+        if not first_chunk:
+            return
+
+        # Workers are forked because they need Django to be set up, and they
+        # can't share database connections with this process. Forking pool
+        # starts all workers when first chunk is submitted, so connections are
+        # closed only until then and next chunks are read while workers run.
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=processes, mp_context=multiprocessing.get_context("fork")
+        ) as executor:
+            futures = deque()
+            futures.append(executor.submit(reparse_posts, first_chunk, host, filters))
+            for chunk in chunks:
+                futures.append(executor.submit(reparse_posts, chunk, host, filters))
+                if len(futures) >= processes * 2:
+                    yield futures.popleft().result()
+
+            while futures:
+                yield futures.popleft().result()
+
+
+class ReparseRequest:
+    """Request stand-in that provides forum's host to the parser"""
+
+    def __init__(self, host):
+        self.host = host
+
+    def get_host(self):
+        return self.host
+
+
+def parse_date(value):
+    try:
+        date = datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise ArgumentTypeError("'%s' is not a valid YYYY-MM-DD date." % value)
+
+    return timezone.make_aware(date)
+
+
+def get_forum_host():
+    return get_host_from_address(get_dynamic_settings().forum_address)
+
+
+def get_posts_queryset(filters):
+    queryset = Post.objects.filter(is_event=False, id__gt=filters["checkpoint"])
+    if filters["categories"]:
+        queryset = queryset.filter(category_id__in=filters["categories"])
+    if filters["since"]:
+        queryset = queryset.filter(posted_on__gte=filters["since"])
+    if filters["until"]:
+        queryset = queryset.filter(posted_on__lt=filters["until"])
+    return queryset
+
+
+def get_ids_chunks(queryset, chunk_size):
+    """
+    Yields (after id, last id) ranges containing chunk_size posts
+
+    Ranges are read from the database one at a time, when next one is needed.
+    """
+    queryset = queryset.order_by("id").values_list("id", flat=True)
+
+    last_id = 0
+    while True:
+        ids = list(queryset.filter(id__gt=last_id)[:chunk_size])
+        if not ids:
+            return
+
+        yield last_id, ids[-1]
+        last_id = ids[-1]
+
+
+def reparse_posts(ids_range, host, filters):
+    """Reparses posts with ids in range, returning their number and last id"""
+    after_id, last_id = ids_range
+    queryset = (
+        get_posts_queryset(filters)
+        .filter(id__gt=after_id, id__lte=last_id)
+        .select_related("thread")
+        .only(
+            "id",
+            "original",
+            "posted_on",
+            "thread",
+            "thread__title",
+            "thread__first_post_id",
+        )
+        .order_by("id")
+    )
+
+    posts = list(queryset)
+    if not posts:
+        return 0, last_id
+
+    request = ReparseRequest(host)
+    mentions = []
+    with resolve_mentions_in_bulk(find_mentions_in_texts(p.original for p in posts)):
+        for post in posts:
+            parsing_result = parse(post.original, request, None)
+            post.parsed = parsing_result["parsed_text"]
+            update_post_checksum(post)
+
+            if post.id == post.thread.first_post_id:
+                post.set_search_document(post.thread.title)
+            else:
+                post.set_search_document()
+
+            for user_id in parsing_result["mentions"]:
+                mentions.append(Post.mentions.through(post=post, user_id=user_id))
+
+    Post.objects.bulk_update(posts, ["parsed", "checksum", "search_document"])
+    Post.objects.filter(id__in=[post.id for post in posts]).update(
+        search_vector=SearchVector(
+            "search_document", config=settings.MISAGO_SEARCH_CONFIG
+        )
+    )
+
+    # Like editing post, reparsing only adds new mentions
+    if mentions:
+        Post.mentions.through.objects.bulk_create(mentions, ignore_conflicts=True)
+
+    return len(posts), last_id
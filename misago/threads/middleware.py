@@ -1,36 +1,20 @@
-from django.utils.deprecation import MiddlewareMixin
+from django.core.exceptions import MiddlewareNotUsed
 
-from ..categories.models import Category
-from .models import Thread
-from .viewmodels import filter_read_threads_queryset
+from ..core.deprecations import warn
 
 
-class UnreadThreadsCountMiddleware(MiddlewareMixin):
-    def process_request(self, request):
-        if request.user.is_anonymous:
-            return
+class UnreadThreadsCountMiddleware:
+    """
+    Deprecated middleware that used to recount user's unread private threads
 
-        if not request.user_acl["can_use_private_threads"]:
-            return
+    Unread private threads counts are now updated when private threads change
+    or are read, so this middleware removes itself from the middleware chain.
+    """
 
-        if not request.user.sync_unread_private_threads:
-            return
-
-        participated_threads = request.user.threadparticipant_set.values("thread_id")
-
-        category = Category.objects.private_threads()
-        threads = Thread.objects.filter(category=category, id__in=participated_threads)
-
-        new_threads = filter_read_threads_queryset(request, [category], "new", threads)
-        unread_threads = filter_read_threads_queryset(
-            request, [category], "unread", threads
-        )
-
-        request.user.unread_private_threads = (
-            new_threads.count() + unread_threads.count()
-        )
-        request.user.sync_unread_private_threads = False
-
-        request.user.save(
-            update_fields=["unread_private_threads", "sync_unread_private_threads"]
+    def __init__(self, get_response):
+        warn(
+            "UnreadThreadsCountMiddleware is deprecated and does nothing. "
+            "Remove 'misago.threads.middleware.UnreadThreadsCountMiddleware' "
+            "from MIDDLEWARE setting."
         )
+        raise MiddlewareNotUsed()
@@ -8,9 +8,9 @@ from django.utils import timezone
 
 from ...conf import settings
 from ...core.utils import parse_iso8601_string
-from ...markup import finalize_markup
 from ..checksums import is_post_valid, update_post_checksum
 from ..filtersearch import filter_search
+from ..postcontent import get_post_content
 
 
 class Post(models.Model):
@@ -175,7 +175,7 @@ class Post(models.Model):
     @property
     def content(self):
         if not hasattr(self, "_finalised_parsed"):
-            self._finalised_parsed = finalize_markup(self.parsed)
+            self._finalised_parsed = get_post_content(self)
         return self._finalised_parsed
 
     @property
@@ -1,12 +1,13 @@
-from django.contrib.auth import get_user_model
 from django.utils.translation import gettext as _
 
 from ..core.mail import build_mail, send_messages
+from ..readtracker.privatethreads import (
+    get_unread_participants,
+    update_unread_private_threads,
+)
 from .events import record_event
 from .models import ThreadParticipant
 
-User = get_user_model()
-
 
 def has_participants(thread):
     return thread.threadparticipant_set.exists()
@@ -48,32 +49,12 @@ def make_thread_participants_aware(user, thread):
     return thread.participants_list
 
 
-def set_users_unread_private_threads_sync(
-    users=None, participants=None, exclude_user=None
-):
-    users_ids = []
-    if users:
-        users_ids += [u.pk for u in users]
-    if participants:
-        users_ids += [p.user_id for p in participants]
-    if exclude_user:
-        users_ids = filter(lambda u: u != exclude_user.pk, users_ids)
-
-    if not users_ids:
-        return
-
-    User.objects.filter(id__in=set(users_ids)).update(sync_unread_private_threads=True)
-
-
 def set_owner(thread, user):
     ThreadParticipant.objects.set_owner(thread, user)
 
 
 def change_owner(request, thread, new_owner):
     ThreadParticipant.objects.set_owner(thread, new_owner)
-    set_users_unread_private_threads_sync(
-        participants=thread.participants_list, exclude_user=request.user
-    )
 
     if thread.participant and thread.participant.is_owner:
         record_event(
@@ -115,18 +96,13 @@ def add_participant(request, thread, new_participant):
 
 def add_participants(request, thread, users):
     """
-    Add multiple participants to thread, set "recound private threads" flag on them
+    Add multiple participants to thread, update their unread private threads counts
     notify them about being added to thread.
     """
     ThreadParticipant.objects.add_participants(thread, users)
 
-    try:
-        thread_participants = thread.participants_list
-    except AttributeError:
-        thread_participants = []
-
-    set_users_unread_private_threads_sync(
-        users=users, participants=thread_participants, exclude_user=request.user
+    update_unread_private_threads(
+        set(), get_unread_participants(request.settings, thread, users)
     )
 
     emails = []
@@ -153,7 +129,7 @@ def build_noticiation_email(request, thread, user):
 
 
 def remove_participant(request, thread, user):
-    """remove thread participant, set "recound private threads" flag on user"""
+    """remove thread participant, update user's unread private threads count"""
     removed_owner = False
     remaining_participants = []
 
@@ -163,11 +139,13 @@ def remove_participant(request, thread, user):
         else:
             remaining_participants.append(participant.user)
 
-    set_users_unread_private_threads_sync(participants=thread.participants_list)
-
     if not remaining_participants:
         thread.delete()
     else:
+        update_unread_private_threads(
+            get_unread_participants(request.settings, thread, [user]), set()
+        )
+
         thread.threadparticipant_set.filter(user=user).delete()
         thread.subscription_set.filter(user=user).delete()
 
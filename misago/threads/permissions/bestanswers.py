@@ -7,7 +7,7 @@ from django.utils.translation import ngettext
 from ...acl import algebra
 from ...acl.decorators import return_boolean
 from ...categories.models import Category, CategoryRole
-from ...categories.permissions import get_categories_roles
+from ...categories.permissions import get_categories, get_categories_roles
 from ..models import Post, Thread
 
 __all__nope = [
@@ -59,7 +59,7 @@ def change_permissions_form(role):
 
 def build_acl(acl, roles, key_name):
     categories_roles = get_categories_roles(roles)
-    categories = list(Category.objects.all_categories(include_root=True))
+    categories = get_categories()
 
     for category in categories:
         category_acl = acl["categories"].get(category.pk, {"can_browse": 0})
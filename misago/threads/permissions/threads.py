@@ -1,3 +1,5 @@
+from hashlib import md5
+
 from django import forms
 from django.core.exceptions import PermissionDenied
 from django.db.models import Q
@@ -6,13 +8,14 @@ from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import ngettext
 
-from ...acl import algebra
+from ...acl import ACL_CACHE, algebra
 from ...acl.decorators import return_boolean
 from ...acl.models import Role
 from ...acl.objectacl import add_acl_to_obj
 from ...admin.forms import YesNoSwitch
+from ...cache.versionedcache import VersionedCache
 from ...categories.models import Category, CategoryRole
-from ...categories.permissions import get_categories_roles
+from ...categories.permissions import get_categories, get_categories_roles
 from ..models import Post, Thread
 
 __all__ = [
@@ -66,9 +69,13 @@ __all__ = [
     "can_delete_event",
     "exclude_invisible_threads",
     "exclude_invisible_posts",
+    "can_see_all_posts",
 ]
 
 
+visibility_cache = VersionedCache(ACL_CACHE)
+
+
 class RolePermissionsForm(forms.Form):
     legend = _("Threads")
 
@@ -251,7 +258,7 @@ def build_acl(acl, roles, key_name):
     )
 
     categories_roles = get_categories_roles(roles)
-    categories = list(Category.objects.all_categories(include_root=True))
+    categories = get_categories()
 
     for category in categories:
         category_acl = acl["categories"].get(category.pk, {"can_browse": 0})
@@ -425,84 +432,223 @@ def add_acl_to_category(user_acl, category):
 
 
 def add_acl_to_thread(user_acl, thread):
-    category_acl = user_acl["categories"].get(thread.category_id, {})
+    add_acl_to_threads(user_acl, [thread])
 
-    thread.acl.update(
-        {
-            "can_reply": can_reply_thread(user_acl, thread),
-            "can_edit": can_edit_thread(user_acl, thread),
-            "can_pin": can_pin_thread(user_acl, thread),
-            "can_pin_globally": False,
-            "can_hide": can_hide_thread(user_acl, thread),
-            "can_unhide": can_unhide_thread(user_acl, thread),
-            "can_delete": can_delete_thread(user_acl, thread),
-            "can_close": category_acl.get("can_close_threads", False),
-            "can_move": can_move_thread(user_acl, thread),
-            "can_merge": can_merge_thread(user_acl, thread),
-            "can_move_posts": category_acl.get("can_move_posts", False),
-            "can_merge_posts": category_acl.get("can_merge_posts", False),
-            "can_approve": can_approve_thread(user_acl, thread),
-            "can_see_reports": category_acl.get("can_see_reports", False),
-        }
-    )
 
-    if thread.acl["can_pin"] and category_acl.get("can_pin_threads") == 2:
-        thread.acl["can_pin_globally"] = True
+def add_acl_to_threads(user_acl, threads):
+    categories_acls = {}
+    for thread in threads:
+        if thread.category_id not in categories_acls:
+            categories_acls[thread.category_id] = get_threads_category_acl(
+                user_acl, thread.category_id
+            )
+
+        category_acl = categories_acls[thread.category_id]
+        thread.acl.update(
+            {
+                "can_reply": check_acl(user_acl, thread, category_acl["can_reply"]),
+                "can_edit": check_acl(user_acl, thread, category_acl["can_edit"]),
+                "can_pin": check_acl(user_acl, thread, category_acl["can_pin"]),
+                "can_pin_globally": False,
+                "can_hide": check_acl(user_acl, thread, category_acl["can_hide"]),
+                "can_unhide": check_acl(user_acl, thread, category_acl["can_unhide"]),
+                "can_delete": check_acl(user_acl, thread, category_acl["can_delete"]),
+                "can_close": category_acl["can_close"],
+                "can_move": check_acl(user_acl, thread, category_acl["can_move"]),
+                "can_merge": check_acl(user_acl, thread, category_acl["can_merge"]),
+                "can_move_posts": category_acl["can_move_posts"],
+                "can_merge_posts": category_acl["can_merge_posts"],
+                "can_approve": check_acl(user_acl, thread, category_acl["can_approve"]),
+                "can_see_reports": category_acl["can_see_reports"],
+            }
+        )
+
+        if thread.acl["can_pin"] and category_acl["can_pin_globally"]:
+            thread.acl["can_pin_globally"] = True
+
+
+def get_threads_category_acl(user_acl, category_id):
+    """Returns threads ACL shared by all threads in category.
+
+    Permissions denied for all threads in category are set to False, remaining
+    ones are set to functions checking permission for thread.
+    """
+    category_acl = user_acl["categories"].get(category_id, {})
+    is_user = not user_acl["is_anonymous"]
+
+    can_hide_threads = category_acl.get("can_hide_threads", 0)
+    can_hide_own_threads = category_acl.get("can_hide_own_threads", 0)
+
+    return {
+        "can_reply": check_if(
+            is_user and category_acl.get("can_reply_threads"), can_reply_thread
+        ),
+        "can_edit": check_if(
+            is_user and category_acl.get("can_edit_threads"), can_edit_thread
+        ),
+        "can_pin": check_if(
+            is_user and category_acl.get("can_pin_threads"), can_pin_thread
+        ),
+        "can_pin_globally": category_acl.get("can_pin_threads") == 2,
+        "can_hide": check_if(
+            is_user and (can_hide_threads or can_hide_own_threads), can_hide_thread
+        ),
+        "can_unhide": check_if(is_user, can_unhide_thread),
+        "can_delete": check_if(
+            is_user and 2 in (can_hide_threads, can_hide_own_threads),
+            can_delete_thread,
+        ),
+        "can_close": category_acl.get("can_close_threads", False),
+        "can_move": check_if(
+            is_user and category_acl.get("can_move_threads"), can_move_thread
+        ),
+        "can_merge": check_if(
+            is_user and category_acl.get("can_merge_threads"), can_merge_thread
+        ),
+        "can_move_posts": category_acl.get("can_move_posts", False),
+        "can_merge_posts": category_acl.get("can_merge_posts", False),
+        "can_approve": check_if(
+            is_user and category_acl.get("can_approve_content"), can_approve_thread
+        ),
+        "can_see_reports": category_acl.get("can_see_reports", False),
+    }
+
+
+def check_if(condition, check):
+    if condition:
+        return check
+    return False
+
+
+def check_acl(user_acl, target, check):
+    if check:
+        return check(user_acl, target)
+    return False
 
 
 def add_acl_to_post(user_acl, post):
-    if post.is_event:
-        add_acl_to_event(user_acl, post)
-    else:
-        add_acl_to_reply(user_acl, post)
+    add_acl_to_posts(user_acl, [post])
 
 
-def add_acl_to_event(user_acl, event):
-    can_hide_events = 0
+def add_acl_to_posts(user_acl, posts):
+    categories_acls = {}
+    threads_can_reply = {}
 
-    if user_acl["is_authenticated"]:
-        category_acl = user_acl["categories"].get(
-            event.category_id, {"can_hide_events": 0}
-        )
+    for post in posts:
+        if post.category_id not in categories_acls:
+            categories_acls[post.category_id] = get_posts_category_acl(
+                user_acl, post.category_id
+            )
+
+        category_acl = categories_acls[post.category_id]
+        if post.is_event:
+            add_category_acl_to_event(user_acl, post, category_acl)
+        else:
+            if post.thread_id not in threads_can_reply:
+                threads_can_reply[post.thread_id] = can_reply_thread(
+                    user_acl, post.thread
+                )
+
+            add_category_acl_to_reply(
+                user_acl, post, category_acl, threads_can_reply[post.thread_id]
+            )
+
+
+def get_posts_category_acl(user_acl, category_id):
+    """Returns posts ACL shared by all posts in category.
 
-        can_hide_events = category_acl["can_hide_events"]
+    Permissions denied for all posts in category are set to False, remaining
+    ones are set to functions checking permission for post.
+    """
+    category_acl = user_acl["categories"].get(category_id, {})
+    is_user = not user_acl["is_anonymous"]
 
+    can_hide_posts = category_acl.get("can_hide_posts", 0)
+    can_hide_own_posts = category_acl.get("can_hide_own_posts", 0)
+    can_hide_events = category_acl.get("can_hide_events", 0) if is_user else 0
+    can_see_likes = category_acl.get("can_see_posts_likes", 0)
+
+    return {
+        "can_edit": check_if(
+            is_user and category_acl.get("can_edit_posts"), can_edit_post
+        ),
+        "can_hide_posts": can_hide_posts,
+        "can_unhide": check_if(
+            is_user and (can_hide_posts or can_hide_own_posts), can_unhide_post
+        ),
+        "can_hide": check_if(
+            is_user and (can_hide_posts or can_hide_own_posts), can_hide_post
+        ),
+        "can_delete": check_if(
+            is_user and 2 in (can_hide_posts, can_hide_own_posts), can_delete_post
+        ),
+        "can_protect": check_if(
+            is_user and category_acl.get("can_protect_posts"), can_protect_post
+        ),
+        "can_approve": check_if(
+            is_user and category_acl.get("can_approve_content"), can_approve_post
+        ),
+        "can_move": check_if(
+            is_user and category_acl.get("can_move_posts"), can_move_post
+        ),
+        "can_merge": check_if(
+            is_user and category_acl.get("can_merge_posts"), can_merge_post
+        ),
+        "can_report": category_acl.get("can_report_content", False),
+        "can_see_reports": category_acl.get("can_see_reports", False),
+        "can_see_likes": can_see_likes,
+        "can_like": bool(is_user and can_see_likes)
+        and category_acl.get("can_like_posts", False),
+        "can_hide_events": can_hide_events,
+        "can_hide_event": check_if(can_hide_events, can_hide_event),
+        "can_delete_event": check_if(can_hide_events == 2, can_delete_event),
+    }
+
+
+def add_acl_to_event(user_acl, event):
+    category_acl = get_posts_category_acl(user_acl, event.category_id)
+    add_category_acl_to_event(user_acl, event, category_acl)
+
+
+def add_category_acl_to_event(user_acl, event, category_acl):
     event.acl.update(
         {
-            "can_see_hidden": can_hide_events > 0,
-            "can_hide": can_hide_event(user_acl, event),
-            "can_delete": can_delete_event(user_acl, event),
+            "can_see_hidden": category_acl["can_hide_events"] > 0,
+            "can_hide": check_acl(user_acl, event, category_acl["can_hide_event"]),
+            "can_delete": check_acl(user_acl, event, category_acl["can_delete_event"]),
         }
     )
 
 
 def add_acl_to_reply(user_acl, post):
-    category_acl = user_acl["categories"].get(post.category_id, {})
+    category_acl = get_posts_category_acl(user_acl, post.category_id)
+    can_reply = can_reply_thread(user_acl, post.thread)
+    add_category_acl_to_reply(user_acl, post, category_acl, can_reply)
+
 
+def add_category_acl_to_reply(user_acl, post, category_acl, can_reply):
     post.acl.update(
         {
-            "can_reply": can_reply_thread(user_acl, post.thread),
-            "can_edit": can_edit_post(user_acl, post),
-            "can_see_hidden": post.is_first_post or category_acl.get("can_hide_posts"),
-            "can_unhide": can_unhide_post(user_acl, post),
-            "can_hide": can_hide_post(user_acl, post),
-            "can_delete": can_delete_post(user_acl, post),
-            "can_protect": can_protect_post(user_acl, post),
-            "can_approve": can_approve_post(user_acl, post),
-            "can_move": can_move_post(user_acl, post),
-            "can_merge": can_merge_post(user_acl, post),
-            "can_report": category_acl.get("can_report_content", False),
-            "can_see_reports": category_acl.get("can_see_reports", False),
-            "can_see_likes": category_acl.get("can_see_posts_likes", 0),
-            "can_like": False,
+            "can_reply": can_reply,
+            "can_edit": check_acl(user_acl, post, category_acl["can_edit"]),
+            "can_see_hidden": post.is_first_post or category_acl["can_hide_posts"],
+            "can_unhide": check_acl(user_acl, post, category_acl["can_unhide"]),
+            "can_hide": check_acl(user_acl, post, category_acl["can_hide"]),
+            "can_delete": check_acl(user_acl, post, category_acl["can_delete"]),
+            "can_protect": check_acl(user_acl, post, category_acl["can_protect"]),
+            "can_approve": check_acl(user_acl, post, category_acl["can_approve"]),
+            "can_move": check_acl(user_acl, post, category_acl["can_move"]),
+            "can_merge": check_acl(user_acl, post, category_acl["can_merge"]),
+            "can_report": category_acl["can_report"],
+            "can_see_reports": category_acl["can_see_reports"],
+            "can_see_likes": category_acl["can_see_likes"],
+            "can_like": category_acl["can_like"],
             "can_see_protected": False,
         }
     )
 
     if not post.acl["can_see_hidden"]:
         post.acl["can_see_hidden"] = post.id == post.thread.first_post_id
-    if user_acl["is_authenticated"] and post.acl["can_see_likes"]:
-        post.acl["can_like"] = category_acl.get("can_like_posts", False)
     if user_acl["is_authenticated"]:
         post.acl["can_see_protected"] = (
             post.acl["can_protect"] or user_acl["user_id"] == post.poster_id
@@ -511,8 +657,8 @@ def add_acl_to_reply(user_acl, post):
 
 def register_with(registry):
     registry.acl_annotator(Category, add_acl_to_category)
-    registry.acl_annotator(Thread, add_acl_to_thread)
-    registry.acl_annotator(Post, add_acl_to_post)
+    registry.batch_acl_annotator(Thread, add_acl_to_threads)
+    registry.batch_acl_annotator(Post, add_acl_to_posts)
 
 
 def allow_see_thread(user_acl, target):
@@ -1307,9 +1453,26 @@ def has_time_to_edit_post(user_acl, target):
     return True
 
 
-def exclude_invisible_threads(
-    user_acl, categories, queryset
-):  # pylint: disable=too-many-branches
+def exclude_invisible_threads(user_acl, categories, queryset):
+    visibility = get_categories_visibility(
+        user_acl, categories, "threads", get_threads_visibility
+    )
+
+    conditions = None
+    for bucket, categories_ids in visibility.items():
+        condition = THREADS_VISIBILITY_CONDITIONS[bucket](user_acl, categories_ids)
+        if conditions:
+            conditions = conditions | condition
+        else:
+            conditions = condition
+
+    if not conditions:
+        return Thread.objects.none()
+
+    return queryset.filter(conditions)
+
+
+def get_threads_visibility(user_acl, categories):
     show_all = []
     show_accepted_visible = []
     show_accepted = []
@@ -1318,8 +1481,6 @@ def exclude_invisible_threads(
     show_owned_visible = []
 
     for category in categories:
-        add_acl_to_obj(user_acl, category)
-
         if not (category.acl["can_see"] and category.acl["can_browse"]):
             continue
 
@@ -1328,75 +1489,91 @@ def exclude_invisible_threads(
             can_mod = category.acl["can_approve_content"]
 
             if can_mod and can_hide:
-                show_all.append(category)
+                show_all.append(category.pk)
             elif user_acl["is_authenticated"]:
                 if not can_mod and not can_hide:
-                    show_accepted_visible.append(category)
+                    show_accepted_visible.append(category.pk)
                 elif not can_mod:
-                    show_accepted.append(category)
+                    show_accepted.append(category.pk)
                 elif not can_hide:
-                    show_visible.append(category)
+                    show_visible.append(category.pk)
             else:
-                show_accepted_visible.append(category)
+                show_accepted_visible.append(category.pk)
         elif user_acl["is_authenticated"]:
             if can_hide:
-                show_owned.append(category)
+                show_owned.append(category.pk)
             else:
-                show_owned_visible.append(category)
-
-    conditions = None
-    if show_all:
-        conditions = Q(category__in=show_all)
-
-    if show_accepted_visible:
-        if user_acl["is_authenticated"]:
-            condition = Q(
-                Q(starter_id=user_acl["user_id"]) | Q(is_unapproved=False),
-                category__in=show_accepted_visible,
-                is_hidden=False,
-            )
-        else:
-            condition = Q(
-                category__in=show_accepted_visible, is_hidden=False, is_unapproved=False
-            )
+                show_owned_visible.append(category.pk)
+
+    return get_visibility_buckets(
+        show_all=show_all,
+        show_accepted_visible=show_accepted_visible,
+        show_accepted=show_accepted,
+        show_visible=show_visible,
+        show_owned=show_owned,
+        show_owned_visible=show_owned_visible,
+    )
 
-        if conditions:
-            conditions = conditions | condition
-        else:
-            conditions = condition
 
-    if show_accepted:
-        condition = Q(
+def show_accepted_visible_threads(user_acl, categories_ids):
+    if user_acl["is_authenticated"]:
+        return Q(
             Q(starter_id=user_acl["user_id"]) | Q(is_unapproved=False),
-            category__in=show_accepted,
+            category_id__in=categories_ids,
+            is_hidden=False,
         )
 
-        if conditions:
-            conditions = conditions | condition
-        else:
-            conditions = condition
+    return Q(category_id__in=categories_ids, is_hidden=False, is_unapproved=False)
+
+
+THREADS_VISIBILITY_CONDITIONS = {
+    "show_all": lambda user_acl, categories_ids: Q(category_id__in=categories_ids),
+    "show_accepted_visible": show_accepted_visible_threads,
+    "show_accepted": lambda user_acl, categories_ids: Q(
+        Q(starter_id=user_acl["user_id"]) | Q(is_unapproved=False),
+        category_id__in=categories_ids,
+    ),
+    "show_visible": lambda user_acl, categories_ids: Q(
+        category_id__in=categories_ids, is_hidden=False
+    ),
+    "show_owned": lambda user_acl, categories_ids: Q(
+        category_id__in=categories_ids, starter_id=user_acl["user_id"]
+    ),
+    "show_owned_visible": lambda user_acl, categories_ids: Q(
+        category_id__in=categories_ids,
+        starter_id=user_acl["user_id"],
+        is_hidden=False,
+    ),
+}
 
-    if show_visible:
-        condition = Q(category__in=show_visible, is_hidden=False)
 
-        if conditions:
-            conditions = conditions | condition
-        else:
-            conditions = condition
+def exclude_invisible_posts(user_acl, categories, queryset):
+    if hasattr(categories, "__iter__"):
+        return exclude_invisible_posts_in_categories(user_acl, categories, queryset)
+    return exclude_invisible_posts_in_category(user_acl, categories, queryset)
+
 
-    if show_owned:
-        condition = Q(category__in=show_owned, starter_id=user_acl["user_id"])
+def exclude_invisible_posts_in_categories(user_acl, categories, queryset):
+    visibility = get_categories_visibility(
+        user_acl, categories, "posts", get_posts_visibility
+    )
+
+    conditions = None
+    if "show_all" in visibility:
+        conditions = Q(category_id__in=visibility["show_all"])
+
+    if "show_approved" in visibility:
+        condition = Q(category_id__in=visibility["show_approved"], is_unapproved=False)
 
         if conditions:
             conditions = conditions | condition
         else:
             conditions = condition
 
-    if show_owned_visible:
+    if "show_approved_owned" in visibility:
         condition = Q(
-            category__in=show_owned_visible,
-            starter_id=user_acl["user_id"],
-            is_hidden=False,
+            Q(poster_id=user_acl["user_id"]) | Q(is_unapproved=False),
+            category_id__in=visibility["show_approved_owned"],
         )
 
         if conditions:
@@ -1404,21 +1581,47 @@ def exclude_invisible_threads(
         else:
             conditions = condition
 
+    if "hide_invisible_events" in visibility:
+        queryset = queryset.exclude(
+            category_id__in=visibility["hide_invisible_events"],
+            is_event=True,
+            is_hidden=True,
+        )
+
     if not conditions:
-        return Thread.objects.none()
+        return Post.objects.none()
 
     return queryset.filter(conditions)
 
 
-def exclude_invisible_posts(user_acl, categories, queryset):
-    if hasattr(categories, "__iter__"):
-        return exclude_invisible_posts_in_categories(user_acl, categories, queryset)
-    return exclude_invisible_posts_in_category(user_acl, categories, queryset)
+def exclude_invisible_posts_in_category(user_acl, category, queryset):
+    visibility = get_categories_visibility(
+        user_acl, [category], "posts", get_posts_visibility
+    )
+
+    if "show_all" not in visibility:
+        if user_acl["is_authenticated"]:
+            queryset = queryset.filter(
+                Q(is_unapproved=False) | Q(poster_id=user_acl["user_id"])
+            )
+        else:
+            queryset = queryset.exclude(is_unapproved=True)
+
+    if "hide_invisible_events" in visibility:
+        queryset = queryset.exclude(is_event=True, is_hidden=True)
+
+    return queryset
 
 
-def exclude_invisible_posts_in_categories(
-    user_acl, categories, queryset
-):  # pylint: disable=too-many-branches
+def can_see_all_posts(user_acl, categories):
+    """Returns True if user can see unapproved posts and hidden events in categories"""
+    visibility = get_categories_visibility(
+        user_acl, categories, "posts", get_posts_visibility
+    )
+    return list(visibility) == ["show_all"]
+
+
+def get_posts_visibility(user_acl, categories):
     show_all = []
     show_approved = []
     show_approved_owned = []
@@ -1426,8 +1629,6 @@ def exclude_invisible_posts_in_categories(
     hide_invisible_events = []
 
     for category in categories:
-        add_acl_to_obj(user_acl, category)
-
         if category.acl["can_approve_content"]:
             show_all.append(category.pk)
         else:
@@ -1439,52 +1640,47 @@ def exclude_invisible_posts_in_categories(
         if not category.acl["can_hide_events"]:
             hide_invisible_events.append(category.pk)
 
-    conditions = None
-    if show_all:
-        conditions = Q(category__in=show_all)
-
-    if show_approved:
-        condition = Q(category__in=show_approved, is_unapproved=False)
-
-        if conditions:
-            conditions = conditions | condition
-        else:
-            conditions = condition
+    return get_visibility_buckets(
+        show_all=show_all,
+        show_approved=show_approved,
+        show_approved_owned=show_approved_owned,
+        hide_invisible_events=hide_invisible_events,
+    )
 
-    if show_approved_owned:
-        condition = Q(
-            Q(poster_id=user_acl["user_id"]) | Q(is_unapproved=False),
-            category__in=show_approved_owned,
-        )
 
-        if conditions:
-            conditions = conditions | condition
-        else:
-            conditions = condition
-
-    if hide_invisible_events:
-        queryset = queryset.exclude(
-            category__in=hide_invisible_events, is_event=True, is_hidden=True
-        )
+def get_visibility_buckets(**buckets):
+    return {
+        bucket: tuple(sorted(categories_ids))
+        for bucket, categories_ids in buckets.items()
+        if categories_ids
+    }
 
-    if not conditions:
-        return Post.objects.none()
 
-    return queryset.filter(conditions)
+def get_categories_visibility(user_acl, categories, content_type, get_visibility):
+    """Returns categories ids split into buckets by visibility of their content.
 
+    Buckets depend only on user's ACL, so they are cached for ACL key and set of
+    categories. Categories are annotated with ACL only when buckets are built.
+    """
+    categories = list(categories)
 
-def exclude_invisible_posts_in_category(user_acl, category, queryset):
-    add_acl_to_obj(user_acl, category)
+    acl_key = user_acl.get("acl_key")
+    if acl_key is None:
+        add_acl_to_obj(user_acl, categories)
+        return get_visibility(user_acl, categories)
 
-    if not category.acl["can_approve_content"]:
-        if user_acl["is_authenticated"]:
-            queryset = queryset.filter(
-                Q(is_unapproved=False) | Q(poster_id=user_acl["user_id"])
-            )
-        else:
-            queryset = queryset.exclude(is_unapproved=True)
+    categories_ids = sorted(category.pk for category in categories)
+    cache_key = "%s_%s_visibility_%s" % (
+        acl_key,
+        content_type,
+        md5(",".join(map(str, categories_ids)).encode()).hexdigest(),
+    )
 
-    if not category.acl["can_hide_events"]:
-        queryset = queryset.exclude(is_event=True, is_hidden=True)
+    cache_versions = user_acl["cache_versions"]
+    visibility = visibility_cache.get(cache_versions, cache_key)
+    if visibility is None:
+        add_acl_to_obj(user_acl, categories)
+        visibility = get_visibility(user_acl, categories)
+        visibility_cache.set(cache_versions, visibility, cache_key)
 
-    return queryset
+    return visibility
@@ -0,0 +1,57 @@
+from collections import OrderedDict
+from threading import Lock
+
+from django.utils.translation import get_language
+
+from ..conf import settings
+from ..markup import finalize_markup
+
+
+class PostsContentCache:
+    """
+    Bounded process-local cache of finalized posts HTML
+
+    Finalized HTML depends only on post's parsed text and active language, so
+    it's stored under post's id, checksum and language. Checksum changes when
+    post's parsed text changes, so entries for old versions of posts are never
+    read again and are pushed out of the cache by new ones.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.content = OrderedDict()
+
+    def get(self, key):
+        with self.lock:
+            content = self.content.get(key)
+            if content is not None:
+                self.content.move_to_end(key)
+            return content
+
+    def set(self, key, content):
+        size = settings.MISAGO_POSTS_CONTENT_CACHE_SIZE
+        with self.lock:
+            self.content[key] = content
+            self.content.move_to_end(key)
+            while len(self.content) > size:
+                self.content.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.content.clear()
+
+
+posts_content_cache = PostsContentCache()
+
+
+def get_post_content(post):
+    """returns post's finalized HTML, reading it from cache if possible"""
+    if not settings.MISAGO_POSTS_CONTENT_CACHE_SIZE or not post.pk:
+        return finalize_markup(post.parsed)
+
+    key = (post.pk, post.checksum, get_language())
+    content = posts_content_cache.get(key)
+    if content is None:
+        content = finalize_markup(post.parsed)
+        posts_content_cache.set(key, content)
+    return content
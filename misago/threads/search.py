@@ -4,6 +4,7 @@ from django.utils.translation import gettext_lazy as _
 from ..conf import settings
 from ..core.shortcuts import paginate, pagination_dict
 from ..search import SearchProvider
+from .checksums import verify_posts
 from .filtersearch import filter_search
 from .models import Post, Thread
 from .permissions import exclude_invisible_threads
@@ -52,6 +53,7 @@ class SearchThreads(SearchProvider):
             add_categories_to_items(
                 root_category.unwrap(), threads_categories, posts + threads
             )
+            verify_posts(posts)
 
         results = {
             "results": FeedSerializer(
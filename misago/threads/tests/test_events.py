@@ -60,6 +60,6 @@ class EventsApiTests(TestCase):
         request = Mock(user=self.user, user_ip="123.14.15.222")
         event = record_event(request, self.thread, "announcement")
 
-        self.user.postread_set.get(
-            category=self.category, thread=self.thread, post=event
+        self.user.threadread_set.get(
+            category=self.category, thread=self.thread, last_read_post_id=event.id
         )
@@ -4,12 +4,7 @@ from django.utils import timezone
 from ...categories.models import Category
 from ...users.test import create_test_user
 from ..models import Post, Thread, ThreadParticipant
-from ..participants import (
-    has_participants,
-    make_participants_aware,
-    set_owner,
-    set_users_unread_private_threads_sync,
-)
+from ..participants import has_participants, make_participants_aware, set_owner
 
 
 class ParticipantsTests(TestCase):
@@ -124,72 +119,3 @@ class ParticipantsTests(TestCase):
 
         owner = self.thread.threadparticipant_set.get(is_owner=True)
         self.assertEqual(user, owner.user)
-
-    def test_set_users_unread_private_threads_sync(self):
-        """
-        set_users_unread_private_threads_sync sets sync_unread_private_threads
-        flag on users provided to true
-        """
-        users = [
-            create_test_user("User", "user@example.com"),
-            create_test_user("OtherUser", "otheruser@example.com"),
-        ]
-
-        set_users_unread_private_threads_sync(users=users)
-        for user in users:
-            user.refresh_from_db()
-            assert user.sync_unread_private_threads
-
-    def test_set_participants_unread_private_threads_sync(self):
-        """
-        set_users_unread_private_threads_sync sets sync_unread_private_threads
-        flag on participants provided to true
-        """
-        users = [
-            create_test_user("User", "user@example.com"),
-            create_test_user("OtherUser", "otheruser@example.com"),
-        ]
-
-        participants = [ThreadParticipant(user=u) for u in users]
-
-        set_users_unread_private_threads_sync(participants=participants)
-        for user in users:
-            user.refresh_from_db()
-            assert user.sync_unread_private_threads
-
-    def test_set_participants_users_unread_private_threads_sync(self):
-        """
-        set_users_unread_private_threads_sync sets sync_unread_private_threads
-        flag on users and participants provided to true
-        """
-        users = [create_test_user("User", "user@example.com")]
-        participants = [ThreadParticipant(user=u) for u in users]
-        users.append(create_test_user("OtherUser", "otheruser@example.com"))
-
-        set_users_unread_private_threads_sync(users=users, participants=participants)
-        for user in users:
-            user.refresh_from_db()
-            assert user.sync_unread_private_threads
-
-    def test_set_users_unread_private_threads_sync_exclude_user(self):
-        """exclude_user kwarg works"""
-        users = [
-            create_test_user("User", "user@example.com"),
-            create_test_user("OtherUser", "otheruser@example.com"),
-        ]
-
-        set_users_unread_private_threads_sync(users=users, exclude_user=users[0])
-
-        [i.refresh_from_db() for i in users]
-        assert users[0].sync_unread_private_threads is False
-        assert users[1].sync_unread_private_threads
-
-    def test_set_users_unread_private_threads_sync_noop(self):
-        """excluding only user is noop"""
-        user = create_test_user("User", "user@example.com")
-
-        with self.assertNumQueries(0):
-            set_users_unread_private_threads_sync(users=[user], exclude_user=user)
-
-        user.refresh_from_db()
-        assert user.sync_unread_private_threads is False
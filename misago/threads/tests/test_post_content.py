@@ -0,0 +1,81 @@
+import pytest
+from django.test import override_settings
+from django.utils import translation
+
+from ...markup import finalize_markup
+from ..checksums import update_post_checksum
+from ..models import Post
+from ..postcontent import posts_content_cache
+from ..test import reply_thread
+
+QUOTE = '<aside class="quote-block"><div class="quote-heading"></div></aside>'
+
+
+@pytest.fixture(autouse=True)
+def clear_posts_content_cache():
+    posts_content_cache.clear()
+    yield
+    posts_content_cache.clear()
+
+
+@pytest.fixture
+def finalize_mock(mocker):
+    return mocker.patch(
+        "misago.threads.postcontent.finalize_markup", wraps=finalize_markup
+    )
+
+
+@pytest.fixture
+def quote_post(post):
+    post.parsed = QUOTE
+    post.save()
+    return post
+
+
+def test_post_content_is_finalized(quote_post):
+    assert "Quoted message:" in quote_post.content
+
+
+def test_post_content_is_not_cached_if_cache_size_is_zero(finalize_mock, quote_post):
+    Post.objects.get(id=quote_post.id).content
+    Post.objects.get(id=quote_post.id).content
+    assert finalize_mock.call_count == 2
+
+
+@override_settings(MISAGO_POSTS_CONTENT_CACHE_SIZE=10)
+def test_post_content_is_cached(finalize_mock, quote_post):
+    content = Post.objects.get(id=quote_post.id).content
+    assert Post.objects.get(id=quote_post.id).content == content
+    finalize_mock.assert_called_once()
+
+
+@override_settings(MISAGO_POSTS_CONTENT_CACHE_SIZE=10)
+def test_post_content_is_cached_per_language(finalize_mock, quote_post):
+    with translation.override("en"):
+        Post.objects.get(id=quote_post.id).content
+    with translation.override("pl"):
+        Post.objects.get(id=quote_post.id).content
+    assert finalize_mock.call_count == 2
+
+
+@override_settings(MISAGO_POSTS_CONTENT_CACHE_SIZE=10)
+def test_post_content_is_finalized_again_if_post_checksum_changes(
+    finalize_mock, quote_post
+):
+    Post.objects.get(id=quote_post.id).content
+
+    quote_post.parsed = "<p>Edited!</p>"
+    update_post_checksum(quote_post)
+    quote_post.save()
+
+    assert Post.objects.get(id=quote_post.id).content == "<p>Edited!</p>"
+    assert finalize_mock.call_count == 2
+
+
+@override_settings(MISAGO_POSTS_CONTENT_CACHE_SIZE=1)
+def test_posts_content_cache_is_bounded(finalize_mock, quote_post, thread):
+    other_post = reply_thread(thread)
+    Post.objects.get(id=quote_post.id).content
+    Post.objects.get(id=other_post.id).content
+    Post.objects.get(id=quote_post.id).content
+    assert finalize_mock.call_count == 3
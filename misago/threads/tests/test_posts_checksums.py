@@ -0,0 +1,129 @@
+import pytest
+from django.test import override_settings
+
+from ..checksums import (
+    is_post_valid,
+    make_post_checksum,
+    posts_checksums_cache,
+    update_post_checksum,
+    verify_posts,
+)
+from ..models import Post
+from ..test import reply_thread
+
+
+@pytest.fixture(autouse=True)
+def clear_posts_checksums_cache():
+    posts_checksums_cache.clear()
+    yield
+    posts_checksums_cache.clear()
+
+
+@pytest.fixture
+def make_checksum_mock(mocker):
+    return mocker.patch(
+        "misago.threads.checksums.make_post_checksum", wraps=make_post_checksum
+    )
+
+
+@pytest.fixture
+def posts(thread):
+    return [thread.first_post, reply_thread(thread), reply_thread(thread)]
+
+
+@pytest.fixture
+def invalid_post(thread):
+    post = reply_thread(thread)
+    post.parsed = "<p>Injected!</p>"
+    post.save()
+    return post
+
+
+def get_posts(posts):
+    return list(Post.objects.filter(id__in=[p.id for p in posts]).order_by("id"))
+
+
+def test_verify_posts_returns_empty_list_for_valid_posts(posts):
+    assert verify_posts(get_posts(posts)) == []
+
+
+def test_verify_posts_returns_posts_with_invalid_checksums(posts, invalid_post):
+    invalid_posts = verify_posts(get_posts(posts + [invalid_post]))
+    assert [post.id for post in invalid_posts] == [invalid_post.id]
+
+
+def test_verified_post_is_valid_without_computing_its_checksum_again(
+    post, make_checksum_mock
+):
+    posts = get_posts([post])
+    verify_posts(posts)
+    assert posts[0].is_valid
+    make_checksum_mock.assert_called_once()
+
+
+def test_verified_post_is_invalid_after_its_parsed_text_is_changed(post):
+    posts = get_posts([post])
+    verify_posts(posts)
+    posts[0].parsed = "<p>Injected!</p>"
+    assert not posts[0].is_valid
+
+
+def test_verified_post_is_valid_after_its_checksum_is_updated(post):
+    posts = get_posts([post])
+    verify_posts(posts)
+    posts[0].parsed = "<p>Edited!</p>"
+    update_post_checksum(posts[0])
+    assert posts[0].is_valid
+
+
+def test_post_with_invalid_checksum_is_invalid(invalid_post):
+    assert not is_post_valid(invalid_post)
+
+
+def test_posts_checksums_are_not_cached_if_cache_size_is_zero(
+    posts, make_checksum_mock
+):
+    verify_posts(get_posts(posts))
+    verify_posts(get_posts(posts))
+    assert make_checksum_mock.call_count == 6
+
+
+@override_settings(MISAGO_POSTS_CHECKSUMS_CACHE_SIZE=10)
+def test_posts_checksums_are_cached(posts, make_checksum_mock):
+    verify_posts(get_posts(posts))
+    assert verify_posts(get_posts(posts)) == []
+    assert make_checksum_mock.call_count == 3
+
+
+@override_settings(MISAGO_POSTS_CHECKSUMS_CACHE_SIZE=10)
+def test_posts_checksums_are_not_cached_if_they_are_invalid(
+    invalid_post, make_checksum_mock
+):
+    assert verify_posts(get_posts([invalid_post]))
+    assert verify_posts(get_posts([invalid_post]))
+    assert make_checksum_mock.call_count == 2
+
+
+@override_settings(MISAGO_POSTS_CHECKSUMS_CACHE_SIZE=10)
+def test_cached_post_is_invalid_after_its_parsed_text_is_changed(post):
+    verify_posts(get_posts([post]))
+
+    Post.objects.filter(id=post.id).update(parsed="<p>Injected!</p>")
+    invalid_posts = verify_posts(get_posts([post]))
+    assert [p.id for p in invalid_posts] == [post.id]
+
+
+@override_settings(MISAGO_POSTS_CHECKSUMS_CACHE_SIZE=10)
+def test_posts_checksums_are_not_cached_if_cache_is_disabled_for_verification(
+    posts, make_checksum_mock
+):
+    verify_posts(get_posts(posts), use_cache=False)
+    verify_posts(get_posts(posts))
+    assert make_checksum_mock.call_count == 6
+
+
+@override_settings(MISAGO_POSTS_CHECKSUMS_CACHE_SIZE=2)
+def test_posts_checksums_cache_is_bounded(posts, make_checksum_mock):
+    verify_posts(get_posts(posts))
+    verify_posts(get_posts(posts[:1]))
+    assert make_checksum_mock.call_count == 4
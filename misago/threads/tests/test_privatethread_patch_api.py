@@ -4,6 +4,7 @@ from django.core import mail
 
 from .. import test
 from ...acl.test import patch_user_acl
+from ...readtracker.poststracker import save_read
 from ...users.test import create_test_user
 from ..models import Thread, ThreadParticipant
 from ..test import other_user_cant_use_private_threads
@@ -24,6 +25,14 @@ class PrivateThreadPatchApiTestCase(PrivateThreadsTestCase):
             api_link, json.dumps(ops), content_type="application/json"
         )
 
+    def read_thread(self, *users):
+        for user in users:
+            save_read(user, self.thread.last_post)
+
+    def set_unread_private_threads(self, user, count):
+        user.unread_private_threads = count
+        user.save(update_fields=["unread_private_threads"])
+
 
 class PrivateThreadAddParticipantApiTests(PrivateThreadPatchApiTestCase):
     def test_add_participant_not_owner(self):
@@ -329,6 +338,10 @@ class PrivateThreadRemoveParticipantApiTests(PrivateThreadPatchApiTestCase):
 
         self.user.subscription_set.create(category=self.category, thread=self.thread)
 
+        test.reply_thread(self.thread, poster=self.other_user)
+        self.read_thread(self.other_user)
+        self.set_unread_private_threads(self.user, 1)
+
         response = self.patch(
             self.api_link,
             [{"op": "remove", "path": "participants", "value": self.user.pk}],
@@ -345,12 +358,12 @@ class PrivateThreadRemoveParticipantApiTests(PrivateThreadPatchApiTestCase):
         self.assertTrue(event.is_event)
         self.assertTrue(event.event_type, "participant_left")
 
-        # valid users were flagged for sync
+        # unread private threads counts were updated
         self.user.refresh_from_db()
-        self.assertTrue(self.user.sync_unread_private_threads)
+        self.assertEqual(self.user.unread_private_threads, 0)
 
         self.other_user.refresh_from_db()
-        self.assertTrue(self.other_user.sync_unread_private_threads)
+        self.assertEqual(self.other_user.unread_private_threads, 1)
 
         # user was removed from participation
         self.assertEqual(self.thread.participants.count(), 1)
@@ -367,6 +380,10 @@ class PrivateThreadRemoveParticipantApiTests(PrivateThreadPatchApiTestCase):
         self.thread.is_closed = True
         self.thread.save()
 
+        test.reply_thread(self.thread, poster=self.other_user)
+        self.read_thread(self.other_user)
+        self.set_unread_private_threads(self.user, 1)
+
         response = self.patch(
             self.api_link,
             [{"op": "remove", "path": "participants", "value": self.user.pk}],
@@ -383,12 +400,12 @@ class PrivateThreadRemoveParticipantApiTests(PrivateThreadPatchApiTestCase):
         self.assertTrue(event.is_event)
         self.assertTrue(event.event_type, "participant_left")
 
-        # valid users were flagged for sync
+        # unread private threads counts were updated
         self.user.refresh_from_db()
-        self.assertTrue(self.user.sync_unread_private_threads)
+        self.assertEqual(self.user.unread_private_threads, 0)
 
         self.other_user.refresh_from_db()
-        self.assertTrue(self.other_user.sync_unread_private_threads)
+        self.assertEqual(self.other_user.unread_private_threads, 1)
 
         # user was removed from participation
         self.assertEqual(self.thread.participants.count(), 1)
@@ -404,6 +421,10 @@ class PrivateThreadRemoveParticipantApiTests(PrivateThreadPatchApiTestCase):
             self.thread, [self.user, removed_user]
         )
 
+        test.reply_thread(self.thread)
+        self.read_thread(self.user, self.other_user)
+        self.set_unread_private_threads(removed_user, 1)
+
         response = self.patch(
             self.api_link,
             [{"op": "remove", "path": "participants", "value": removed_user.pk}],
@@ -420,15 +441,15 @@ class PrivateThreadRemoveParticipantApiTests(PrivateThreadPatchApiTestCase):
         self.assertTrue(event.is_event)
         self.assertTrue(event.event_type, "participant_removed")
 
-        # valid users were flagged for sync
+        # unread private threads counts were updated
         self.user.refresh_from_db()
-        self.assertTrue(self.user.sync_unread_private_threads)
+        self.assertEqual(self.user.unread_private_threads, 0)
 
         self.other_user.refresh_from_db()
-        self.assertTrue(self.other_user.sync_unread_private_threads)
+        self.assertEqual(self.other_user.unread_private_threads, 1)
 
         removed_user.refresh_from_db()
-        self.assertTrue(removed_user.sync_unread_private_threads)
+        self.assertEqual(removed_user.unread_private_threads, 0)
 
         # user was removed from participation
         self.assertEqual(self.thread.participants.count(), 2)
@@ -439,6 +460,10 @@ class PrivateThreadRemoveParticipantApiTests(PrivateThreadPatchApiTestCase):
         ThreadParticipant.objects.set_owner(self.thread, self.user)
         ThreadParticipant.objects.add_participants(self.thread, [self.other_user])
 
+        test.reply_thread(self.thread)
+        self.read_thread(self.user)
+        self.set_unread_private_threads(self.other_user, 1)
+
         response = self.patch(
             self.api_link,
             [{"op": "remove", "path": "participants", "value": self.other_user.pk}],
@@ -455,12 +480,12 @@ class PrivateThreadRemoveParticipantApiTests(PrivateThreadPatchApiTestCase):
         self.assertTrue(event.is_event)
         self.assertTrue(event.event_type, "participant_removed")
 
-        # valid users were flagged for sync
+        # unread private threads counts were updated
         self.user.refresh_from_db()
-        self.assertTrue(self.user.sync_unread_private_threads)
+        self.assertEqual(self.user.unread_private_threads, 0)
 
         self.other_user.refresh_from_db()
-        self.assertTrue(self.other_user.sync_unread_private_threads)
+        self.assertEqual(self.other_user.unread_private_threads, 0)
 
         # user was removed from participation
         self.assertEqual(self.thread.participants.count(), 1)
@@ -473,6 +498,10 @@ class PrivateThreadRemoveParticipantApiTests(PrivateThreadPatchApiTestCase):
         ThreadParticipant.objects.set_owner(self.thread, self.user)
         ThreadParticipant.objects.add_participants(self.thread, [self.other_user])
 
+        test.reply_thread(self.thread, poster=self.other_user)
+        self.read_thread(self.other_user)
+        self.set_unread_private_threads(self.user, 1)
+
         response = self.patch(
             self.api_link,
             [{"op": "remove", "path": "participants", "value": self.user.pk}],
@@ -489,12 +518,12 @@ class PrivateThreadRemoveParticipantApiTests(PrivateThreadPatchApiTestCase):
         self.assertTrue(event.is_event)
         self.assertTrue(event.event_type, "owner_left")
 
-        # valid users were flagged for sync
+        # unread private threads counts were updated
         self.user.refresh_from_db()
-        self.assertTrue(self.user.sync_unread_private_threads)
+        self.assertEqual(self.user.unread_private_threads, 0)
 
         self.other_user.refresh_from_db()
-        self.assertTrue(self.other_user.sync_unread_private_threads)
+        self.assertEqual(self.other_user.unread_private_threads, 1)
 
         # user was removed from participation
         self.assertEqual(self.thread.participants.count(), 1)
@@ -504,6 +533,9 @@ class PrivateThreadRemoveParticipantApiTests(PrivateThreadPatchApiTestCase):
         """api allows last user leave thread, causing thread to delete"""
         ThreadParticipant.objects.set_owner(self.thread, self.user)
 
+        test.reply_thread(self.thread, poster=self.other_user)
+        self.set_unread_private_threads(self.user, 1)
+
         response = self.patch(
             self.api_link,
             [{"op": "remove", "path": "participants", "value": self.user.pk}],
@@ -516,9 +548,9 @@ class PrivateThreadRemoveParticipantApiTests(PrivateThreadPatchApiTestCase):
         with self.assertRaises(Thread.DoesNotExist):
             Thread.objects.get(pk=self.thread.pk)
 
-        # valid users were flagged for sync
+        # unread private threads counts were updated
         self.user.refresh_from_db()
-        self.assertTrue(self.user.sync_unread_private_threads)
+        self.assertEqual(self.user.unread_private_threads, 0)
 
 
 class PrivateThreadTakeOverApiTests(PrivateThreadPatchApiTestCase):
@@ -621,6 +653,8 @@ class PrivateThreadTakeOverApiTests(PrivateThreadPatchApiTestCase):
         ThreadParticipant.objects.set_owner(self.thread, self.user)
         ThreadParticipant.objects.add_participants(self.thread, [self.other_user])
 
+        self.read_thread(self.user, self.other_user)
+
         response = self.patch(
             self.api_link,
             [{"op": "replace", "path": "owner", "value": self.other_user.pk}],
@@ -628,12 +662,12 @@ class PrivateThreadTakeOverApiTests(PrivateThreadPatchApiTestCase):
 
         self.assertEqual(response.status_code, 200)
 
-        # valid users were flagged for sync
+        # unread private threads counts were updated
         self.user.refresh_from_db()
-        self.assertFalse(self.user.sync_unread_private_threads)
+        self.assertEqual(self.user.unread_private_threads, 0)
 
         self.other_user.refresh_from_db()
-        self.assertTrue(self.other_user.sync_unread_private_threads)
+        self.assertEqual(self.other_user.unread_private_threads, 1)
 
         # ownership was transfered
         self.assertEqual(self.thread.participants.count(), 2)
@@ -653,21 +687,23 @@ class PrivateThreadTakeOverApiTests(PrivateThreadPatchApiTestCase):
         ThreadParticipant.objects.set_owner(self.thread, self.other_user)
         ThreadParticipant.objects.add_participants(self.thread, [self.user, new_owner])
 
+        self.read_thread(self.user, self.other_user, new_owner)
+
         response = self.patch(
             self.api_link, [{"op": "replace", "path": "owner", "value": new_owner.pk}]
         )
 
         self.assertEqual(response.status_code, 200)
 
-        # valid users were flagged for sync
+        # unread private threads counts were updated
         new_owner.refresh_from_db()
-        self.assertTrue(new_owner.sync_unread_private_threads)
+        self.assertEqual(new_owner.unread_private_threads, 1)
 
         self.user.refresh_from_db()
-        self.assertFalse(self.user.sync_unread_private_threads)
+        self.assertEqual(self.user.unread_private_threads, 0)
 
         self.other_user.refresh_from_db()
-        self.assertTrue(self.other_user.sync_unread_private_threads)
+        self.assertEqual(self.other_user.unread_private_threads, 1)
 
         # ownership was transferred
         self.assertEqual(self.thread.participants.count(), 3)
@@ -686,18 +722,20 @@ class PrivateThreadTakeOverApiTests(PrivateThreadPatchApiTestCase):
         ThreadParticipant.objects.set_owner(self.thread, self.other_user)
         ThreadParticipant.objects.add_participants(self.thread, [self.user])
 
+        self.read_thread(self.user, self.other_user)
+
         response = self.patch(
             self.api_link, [{"op": "replace", "path": "owner", "value": self.user.pk}]
         )
 
         self.assertEqual(response.status_code, 200)
 
-        # valid users were flagged for sync
+        # unread private threads counts were updated
         self.user.refresh_from_db()
-        self.assertFalse(self.user.sync_unread_private_threads)
+        self.assertEqual(self.user.unread_private_threads, 0)
 
         self.other_user.refresh_from_db()
-        self.assertTrue(self.other_user.sync_unread_private_threads)
+        self.assertEqual(self.other_user.unread_private_threads, 1)
 
         # ownership was transfered
         self.assertEqual(self.thread.participants.count(), 2)
@@ -718,18 +756,20 @@ class PrivateThreadTakeOverApiTests(PrivateThreadPatchApiTestCase):
         self.thread.is_closed = True
         self.thread.save()
 
+        self.read_thread(self.user, self.other_user)
+
         response = self.patch(
             self.api_link, [{"op": "replace", "path": "owner", "value": self.user.pk}]
         )
 
         self.assertEqual(response.status_code, 200)
 
-        # valid users were flagged for sync
+        # unread private threads counts were updated
         self.user.refresh_from_db()
-        self.assertFalse(self.user.sync_unread_private_threads)
+        self.assertEqual(self.user.unread_private_threads, 0)
 
         self.other_user.refresh_from_db()
-        self.assertTrue(self.other_user.sync_unread_private_threads)
+        self.assertEqual(self.other_user.unread_private_threads, 1)
 
         # ownership was transferred
         self.assertEqual(self.thread.participants.count(), 2)
@@ -1,4 +1,5 @@
 from .. import test
+from ...readtracker.poststracker import save_read
 from ...users.test import create_test_user
 from ..models import ThreadParticipant
 from .test_privatethreads import PrivateThreadsTestCase
@@ -14,9 +15,11 @@ class PrivateThreadReplyApiTestCase(PrivateThreadsTestCase):
         self.other_user = create_test_user("OtherUser", "otheruser@example.com")
 
     def test_reply_private_thread(self):
-        """api sets other private thread participants sync thread flag"""
+        """api updates other private thread participants unread threads counts"""
         ThreadParticipant.objects.set_owner(self.thread, self.user)
         ThreadParticipant.objects.add_participants(self.thread, [self.other_user])
+        save_read(self.user, self.thread.first_post)
+        save_read(self.other_user, self.thread.first_post)
 
         response = self.client.post(
             self.api_link, data={"post": "This is test response!"}
@@ -30,9 +33,9 @@ class PrivateThreadReplyApiTestCase(PrivateThreadsTestCase):
 
         self.assertEqual(self.user.audittrail_set.count(), 1)
 
-        # valid user was flagged to sync
-        self.user.refresh_from_db()
-        self.assertFalse(self.user.sync_unread_private_threads)
-
+        # reply made thread unread for other participant
         self.other_user.refresh_from_db()
-        self.assertTrue(self.other_user.sync_unread_private_threads)
+        self.assertEqual(self.other_user.unread_private_threads, 1)
+
+        # but not for us
+        self.assertEqual(self.user.unread_private_threads, 0)
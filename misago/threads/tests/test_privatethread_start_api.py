@@ -364,9 +364,13 @@ class StartPrivateThreadTests(AuthenticatedUserTestCase):
             thread=thread, user=self.other_user, is_owner=False
         )
 
-        # other user has sync_unread_private_threads flag
+        # thread was counted as unread for other user
         self.other_user.refresh_from_db()
-        self.assertTrue(self.other_user.sync_unread_private_threads)
+        self.assertEqual(self.other_user.unread_private_threads, 1)
+
+        # but not for us
+        self.reload_user()
+        self.assertEqual(self.user.unread_private_threads, 0)
 
         # notification about new private thread was sent to other user
         self.assertEqual(len(mail.outbox), 1)
@@ -0,0 +1,198 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from ...categories.models import Category
+from ..checksums import is_post_valid
+from ..management.commands.reparseposts import get_ids_chunks
+from ..models import Post
+from ..test import post_thread, reply_thread
+
+
+def call_reparseposts(**options):
+    options.setdefault("host", "example.com")
+    options.setdefault("processes", 1)
+
+    stdout = StringIO()
+    call_command("reparseposts", stdout=stdout, **options)
+    return stdout.getvalue()
+
+
+def break_post(post):
+    Post.objects.filter(id=post.id).update(
+        parsed="<p>Outdated</p>", search_document="outdated"
+    )
+
+
+@pytest.fixture
+def other_category(default_category):
+    category = Category(name="Other Category", slug="other-category")
+    category.insert_at(default_category.parent, position="last-child", save=True)
+    return category
+
+
+def test_command_handles_no_posts(db):
+    output = call_reparseposts()
+    assert output.strip() == "No posts were found"
+
+
+def test_command_requires_host_if_forum_address_is_not_set(db):
+    with pytest.raises(CommandError):
+        call_reparseposts(host=None)
+
+
+def test_command_reparses_posts(thread):
+    reply = reply_thread(thread, message="Hello **world**!")
+    break_post(thread.first_post)
+    break_post(reply)
+
+    output = call_reparseposts()
+    assert "Reparsed 2 posts in" in output
+    assert "posts/s" in output
+    assert "Last checkpoint: %s" % reply.id in output
+
+    reply.refresh_from_db()
+    assert reply.parsed == "<p>Hello <strong>world</strong>!</p>"
+    assert is_post_valid(reply)
+
+
+def test_command_updates_posts_search_documents(thread):
+    reply = reply_thread(thread, message="Hello world!")
+    break_post(thread.first_post)
+    break_post(reply)
+
+    call_reparseposts()
+
+    thread.first_post.refresh_from_db()
+    assert thread.title in thread.first_post.search_document
+    reply.refresh_from_db()
+    assert reply.search_document == "Hello world!"
+
+
+def test_command_adds_mentions_to_posts(thread, user, other_user):
+    reply = reply_thread(thread, message="Hello @%s!" % user.username)
+    other_reply = reply_thread(thread, message="Hello @%s!" % other_user.username)
+    other_reply.mentions.add(other_user)
+
+    call_reparseposts()
+
+    assert list(reply.mentions.all()) == [user]
+    assert list(other_reply.mentions.all()) == [other_user]
+
+
+def test_command_resolves_mentions_in_chunk_with_one_query(
+    django_assert_max_num_queries, thread, user
+):
+    for _ in range(5):
+        reply_thread(thread, message="Hello @%s!" % user.username)
+
+    # count, two ids chunks, posts, mentions, bulk update, search vector, mentions
+    with django_assert_max_num_queries(8):
+        call_reparseposts()
+
+
+def test_command_resumes_from_checkpoint(thread):
+    reply = reply_thread(thread)
+    break_post(thread.first_post)
+    break_post(reply)
+
+    output = call_reparseposts(checkpoint=thread.first_post.id)
+    assert "Reparsed 1 posts in" in output
+
+    thread.first_post.refresh_from_db()
+    assert thread.first_post.parsed == "<p>Outdated</p>"
+    reply.refresh_from_db()
+    assert reply.parsed != "<p>Outdated</p>"
+
+
+def test_command_prints_checkpoint_if_reparsing_fails(mocker, thread):
+    reply_thread(thread)
+    mocker.patch(
+        "misago.threads.management.commands.reparseposts.update_post_checksum",
+        side_effect=[None, ValueError("error")],
+    )
+
+    stdout = StringIO()
+    with pytest.raises(ValueError):
+        call_command(
+            "reparseposts",
+            "--host=example.com",
+            "--processes=1",
+            "--chunk-size=1",
+            stdout=stdout,
+        )
+
+    output = stdout.getvalue().strip()
+    assert output.endswith("Last checkpoint: %s" % thread.first_post.id)
+
+
+def test_sparse_posts_ids_are_split_into_chunks_of_same_size(thread, default_category):
+    for _ in range(3):
+        post_thread(default_category).delete()
+    reply = reply_thread(thread)
+    other_reply = reply_thread(thread)
+
+    chunks = get_ids_chunks(Post.objects.all(), 2)
+    assert list(chunks) == [(0, reply.id), (reply.id, other_reply.id)]
+
+
+def test_posts_ids_chunks_are_read_when_needed(django_assert_num_queries, thread):
+    first_post_id = thread.first_post.id
+    reply_thread(thread)
+
+    with django_assert_num_queries(0):
+        chunks = get_ids_chunks(Post.objects.all(), 1)
+    with django_assert_num_queries(1):
+        assert next(chunks) == (0, first_post_id)
+
+
+def test_command_filters_posts_by_category(thread, other_category):
+    other_thread = post_thread(other_category)
+    break_post(thread.first_post)
+    break_post(other_thread.first_post)
+
+    output = call_reparseposts(categories=[other_category.id])
+    assert "Reparsed 1 posts in" in output
+
+    thread.first_post.refresh_from_db()
+    assert thread.first_post.parsed == "<p>Outdated</p>"
+
+
+def test_command_filters_posts_by_date(thread):
+    old_reply = reply_thread(thread, posted_on=timezone.now() - timedelta(days=30))
+    break_post(thread.first_post)
+    break_post(old_reply)
+
+    since = (timezone.now() - timedelta(days=31)).strftime("%Y-%m-%d")
+    until = (timezone.now() - timedelta(days=2)).strftime("%Y-%m-%d")
+    call_command(
+        "reparseposts",
+        "--host=example.com",
+        "--processes=1",
+        "--since=%s" % since,
+        "--until=%s" % until,
+        stdout=StringIO(),
+    )
+
+    thread.first_post.refresh_from_db()
+    assert thread.first_post.parsed == "<p>Outdated</p>"
+    old_reply.refresh_from_db()
+    assert old_reply.parsed != "<p>Outdated</p>"
+
+
+@pytest.mark.django_db(transaction=True, serialized_rollback=True)
+def test_command_reparses_posts_in_worker_processes(thread):
+    replies = [reply_thread(thread) for _ in range(4)]
+    for reply in replies:
+        break_post(reply)
+
+    output = call_reparseposts(processes=2, chunk_size=1)
+    assert "Reparsed 5 posts in" in output
+
+    for reply in replies:
+        reply.refresh_from_db()
+        assert reply.parsed == "<p>I am test message</p>"
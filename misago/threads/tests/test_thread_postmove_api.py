@@ -529,11 +529,7 @@ class ThreadPostMoveApiTestCase(AuthenticatedUserTestCase):
 
         other_thread = Thread.objects.get(pk=other_thread.pk)
 
-        # postreads were removed
-        postreads = self.user.postread_set.order_by("id")
-
-        postreads_threads = list(postreads.values_list("thread_id", flat=True))
-        self.assertEqual(postreads_threads, [self.thread.pk])
-
-        postreads_categories = list(postreads.values_list("category_id", flat=True))
-        self.assertEqual(postreads_categories, [self.category.pk])
+        # moved posts are not read in other thread
+        thread_read = self.user.threadread_set.get()
+        self.assertEqual(thread_read.thread_id, self.thread.pk)
+        self.assertEqual(thread_read.category_id, self.category.pk)
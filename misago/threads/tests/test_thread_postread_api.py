@@ -30,16 +30,6 @@ class PostReadApiTests(ThreadsApiTestCase):
 
     def test_read_post(self):
         """api marks post as read"""
-        response = self.client.post(self.api_link)
-        self.assertEqual(response.status_code, 200)
-
-        self.assertEqual(self.user.postread_set.count(), 1)
-        self.user.postread_set.get(post=self.post)
-
-        # one post read, first post is still unread
-        self.assertFalse(response.json()["thread_is_read"])
-
-        # read second post
         response = self.client.post(
             reverse(
                 "misago:api:thread-post-read",
@@ -48,12 +38,32 @@ class PostReadApiTests(ThreadsApiTestCase):
         )
         self.assertEqual(response.status_code, 200)
 
-        self.assertEqual(self.user.postread_set.count(), 2)
-        self.user.postread_set.get(post=self.thread.first_post)
+        self.assertEqual(self.user.threadread_set.count(), 1)
+        self.user.threadread_set.get(last_read_post_id=self.thread.first_post.pk)
+
+        # first post read, second post is still unread
+        self.assertFalse(response.json()["thread_is_read"])
+
+        # read second post
+        response = self.client.post(self.api_link)
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.user.threadread_set.count(), 1)
+        self.user.threadread_set.get(last_read_post_id=self.post.pk)
 
         # both posts are read
         self.assertTrue(response.json()["thread_is_read"])
 
+    def test_read_post_reads_previous_posts(self):
+        """api marks post and posts before it as read"""
+        response = self.client.post(self.api_link)
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.user.threadread_set.count(), 1)
+        self.user.threadread_set.get(last_read_post_id=self.post.pk)
+
+        self.assertTrue(response.json()["thread_is_read"])
+
     def test_read_subscribed_thread_post(self):
         """api marks post as read and updates subscription"""
         self.thread.subscription_set.create(
@@ -713,11 +713,7 @@ class ThreadPostSplitApiTestCase(AuthenticatedUserTestCase):
         # posts were moved to new thread
         self.assertEqual(split_thread.post_set.filter(pk__in=self.posts).count(), 2)
 
-        # postreads were removed
-        postreads = self.user.postread_set.filter(post__is_event=False).order_by("id")
-
-        postreads_threads = list(postreads.values_list("thread_id", flat=True))
-        self.assertEqual(postreads_threads, [self.thread.pk])
-
-        postreads_categories = list(postreads.values_list("category_id", flat=True))
-        self.assertEqual(postreads_categories, [self.category.pk])
+        # split posts are not read in new thread
+        thread_read = self.user.threadread_set.get()
+        self.assertEqual(thread_read.thread_id, self.thread.pk)
+        self.assertEqual(thread_read.category_id, self.category.pk)
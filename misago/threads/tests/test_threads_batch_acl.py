@@ -0,0 +1,112 @@
+import pytest
+
+from ...acl.objectacl import add_acl_to_obj
+from ..models import Post
+from ..permissions import threads
+from ..test import post_thread, reply_thread
+
+THREAD_CHECKS = {
+    "can_reply": threads.can_reply_thread,
+    "can_edit": threads.can_edit_thread,
+    "can_pin": threads.can_pin_thread,
+    "can_hide": threads.can_hide_thread,
+    "can_unhide": threads.can_unhide_thread,
+    "can_delete": threads.can_delete_thread,
+    "can_move": threads.can_move_thread,
+    "can_merge": threads.can_merge_thread,
+    "can_approve": threads.can_approve_thread,
+}
+
+POST_CHECKS = {
+    "can_edit": threads.can_edit_post,
+    "can_unhide": threads.can_unhide_post,
+    "can_hide": threads.can_hide_post,
+    "can_delete": threads.can_delete_post,
+    "can_protect": threads.can_protect_post,
+    "can_approve": threads.can_approve_post,
+    "can_move": threads.can_move_post,
+    "can_merge": threads.can_merge_post,
+}
+
+EVENT_CHECKS = {
+    "can_hide": threads.can_hide_event,
+    "can_delete": threads.can_delete_event,
+}
+
+
+@pytest.fixture
+def threads_list(default_category, user, other_user):
+    return [
+        post_thread(default_category),
+        post_thread(default_category, poster=user),
+        post_thread(default_category, poster=user, is_hidden=True),
+        post_thread(default_category, poster=other_user, is_closed=True),
+        post_thread(default_category, is_unapproved=True),
+    ]
+
+
+@pytest.fixture
+def posts_list(thread, user, other_user):
+    reply_thread(thread, poster=user)
+    reply_thread(thread, poster=user, is_hidden=True)
+    reply_thread(thread, poster=other_user, is_protected=True)
+    reply_thread(thread, is_unapproved=True)
+    reply_thread(thread, is_event=True)
+
+    posts = list(Post.objects.filter(thread=thread).order_by("id"))
+    for post in posts:
+        post.thread = thread
+        post.category = thread.category
+    return posts
+
+
+@pytest.fixture(
+    params=["anonymous_user_acl", "user_acl", "staffuser_acl", "superuser_acl"]
+)
+def any_user_acl(db, request):
+    return request.getfixturevalue(request.param)
+
+
+def test_batch_annotated_threads_acl_matches_individual_checks(
+    any_user_acl, threads_list
+):
+    add_acl_to_obj(any_user_acl, threads_list)
+
+    for thread in threads_list:
+        for acl_key, check in THREAD_CHECKS.items():
+            assert thread.acl[acl_key] == check(any_user_acl, thread), acl_key
+
+
+def test_batch_annotated_threads_acl_matches_single_thread_acl(
+    any_user_acl, threads_list
+):
+    add_acl_to_obj(any_user_acl, threads_list)
+    batch_acls = [thread.acl for thread in threads_list]
+
+    for thread in threads_list:
+        add_acl_to_obj(any_user_acl, thread)
+
+    assert batch_acls == [thread.acl for thread in threads_list]
+
+
+def test_batch_annotated_posts_acl_matches_individual_checks(any_user_acl, posts_list):
+    add_acl_to_obj(any_user_acl, posts_list)
+
+    for post in posts_list:
+        checks = EVENT_CHECKS if post.is_event else POST_CHECKS
+        for acl_key, check in checks.items():
+            assert post.acl[acl_key] == check(any_user_acl, post), acl_key
+        if not post.is_event:
+            assert post.acl["can_reply"] == threads.can_reply_thread(
+                any_user_acl, post.thread
+            )
+
+
+def test_batch_annotated_posts_acl_matches_single_post_acl(any_user_acl, posts_list):
+    add_acl_to_obj(any_user_acl, posts_list)
+    batch_acls = [post.acl for post in posts_list]
+
+    for post in posts_list:
+        add_acl_to_obj(any_user_acl, post)
+
+    assert batch_acls == [post.acl for post in posts_list]
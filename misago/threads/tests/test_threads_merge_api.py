@@ -671,15 +671,11 @@ class ThreadsMergeApiTests(ThreadsApiTestCase):
         # are old threads gone?
         self.assertEqual([t.pk for t in Thread.objects.all()], [new_thread.pk])
 
-        # posts reads are kept
-        postreads = self.user.postread_set.filter(post__is_event=False).order_by("id")
-
-        self.assertEqual(
-            list(postreads.values_list("post_id", flat=True)),
-            [self.thread.first_post_id, thread.first_post_id],
-        )
-        self.assertEqual(postreads.filter(thread=new_thread).count(), 2)
-        self.assertEqual(postreads.filter(category=self.category).count(), 2)
+        # older read post is kept
+        thread_read = self.user.threadread_set.get()
+        self.assertEqual(thread_read.thread_id, new_thread.id)
+        self.assertEqual(thread_read.category_id, self.category.id)
+        self.assertEqual(thread_read.last_read_post_id, self.thread.first_post_id)
 
         # subscriptions are kept
         self.assertEqual(self.user.subscription_set.count(), 1)
@@ -0,0 +1,11 @@
+import pytest
+from django.core.exceptions import MiddlewareNotUsed
+
+from ...core.deprecations import RemovedInMisagoWarning
+from ..middleware import UnreadThreadsCountMiddleware
+
+
+def test_deprecated_middleware_warns_and_removes_itself_from_middleware_chain():
+    with pytest.warns(RemovedInMisagoWarning):
+        with pytest.raises(MiddlewareNotUsed):
+            UnreadThreadsCountMiddleware(lambda request: None)
@@ -0,0 +1,129 @@
+import pytest
+from django.test import override_settings
+
+from ...acl import objectacl, useracl
+from ...acl.test import patch_user_acl
+from ...categories.models import Category
+from ..models import Post, Thread
+from ..permissions.threads import (
+    exclude_invisible_posts,
+    exclude_invisible_threads,
+    get_categories_visibility,
+    get_threads_visibility,
+    visibility_cache,
+)
+from ..test import reply_thread
+
+
+@pytest.fixture(autouse=True)
+def clear_visibility_cache(db):
+    visibility_cache.clear_local()
+    yield
+    visibility_cache.clear_local()
+
+
+def get_threads_categories():
+    return list(Category.objects.all_categories())
+
+
+def test_anonymous_user_sees_only_approved_visible_threads(
+    anonymous_user_acl, thread, hidden_thread, unapproved_thread
+):
+    queryset = exclude_invisible_threads(
+        anonymous_user_acl, get_threads_categories(), Thread.objects
+    )
+    assert list(queryset) == [thread]
+
+
+def test_user_sees_own_unapproved_thread(
+    user_acl, thread, user_unapproved_thread, unapproved_thread
+):
+    queryset = exclude_invisible_threads(
+        user_acl, get_threads_categories(), Thread.objects.order_by("id")
+    )
+    assert list(queryset) == [thread, user_unapproved_thread]
+
+
+def test_moderator_sees_all_threads(
+    superuser_acl, thread, hidden_thread, unapproved_thread
+):
+    queryset = exclude_invisible_threads(
+        superuser_acl, get_threads_categories(), Thread.objects.order_by("id")
+    )
+    assert list(queryset) == [thread, hidden_thread, unapproved_thread]
+
+
+def test_user_without_visible_categories_sees_no_threads(user_acl, thread):
+    queryset = exclude_invisible_threads(user_acl, [], Thread.objects)
+    assert not queryset.exists()
+
+
+def test_anonymous_user_doesnt_see_unapproved_posts_and_hidden_events(
+    anonymous_user_acl, thread
+):
+    reply_thread(thread, is_unapproved=True)
+    reply_thread(thread, is_event=True, is_hidden=True)
+
+    queryset = exclude_invisible_posts(
+        anonymous_user_acl, get_threads_categories(), Post.objects
+    )
+    assert list(queryset) == [thread.first_post]
+
+    queryset = exclude_invisible_posts(
+        anonymous_user_acl, thread.category, Post.objects
+    )
+    assert list(queryset) == [thread.first_post]
+
+
+def test_threads_visibility_is_split_into_category_id_buckets(
+    anonymous_user_acl, default_category
+):
+    visibility = get_categories_visibility(
+        anonymous_user_acl, [default_category], "threads", get_threads_visibility
+    )
+    assert visibility == {"show_accepted_visible": (default_category.pk,)}
+
+
+@override_settings(MISAGO_VERSIONED_CACHE_LOCAL_SIZE=10)
+def test_visibility_is_cached_for_acl_key(mocker, user, other_user, cache_versions):
+    add_acl_to_obj = mocker.patch(
+        "misago.threads.permissions.threads.add_acl_to_obj",
+        side_effect=objectacl.add_acl_to_obj,
+    )
+
+    categories = get_threads_categories()
+    user_acl = useracl.get_user_acl(user, cache_versions)
+    other_user_acl = useracl.get_user_acl(other_user, cache_versions)
+
+    exclude_invisible_threads(user_acl, categories, Thread.objects)
+    exclude_invisible_threads(user_acl, categories, Thread.objects)
+    exclude_invisible_threads(other_user_acl, categories, Thread.objects)
+    add_acl_to_obj.assert_called_once()
+
+
+@override_settings(MISAGO_VERSIONED_CACHE_LOCAL_SIZE=10)
+def test_visibility_is_cached_for_set_of_categories(mocker, user, cache_versions):
+    add_acl_to_obj = mocker.patch(
+        "misago.threads.permissions.threads.add_acl_to_obj",
+        side_effect=objectacl.add_acl_to_obj,
+    )
+
+    categories = get_threads_categories()
+    user_acl = useracl.get_user_acl(user, cache_versions)
+
+    exclude_invisible_threads(user_acl, categories, Thread.objects)
+    root_category = Category.objects.root_category()
+    exclude_invisible_threads(user_acl, categories + [root_category], Thread.objects)
+    assert add_acl_to_obj.call_count == 2
+
+
+@override_settings(MISAGO_VERSIONED_CACHE_LOCAL_SIZE=10)
+@patch_user_acl({"categories": {}, "visible_categories": []})
+def test_visibility_is_not_cached_for_patched_acl(user, cache_versions, thread):
+    user_acl = useracl.get_user_acl(user, cache_versions)
+    assert "acl_key" not in user_acl
+
+    queryset = exclude_invisible_threads(
+        user_acl, get_threads_categories(), Thread.objects
+    )
+    assert not queryset.exists()
@@ -2,6 +2,7 @@ from ...acl.objectacl import add_acl_to_obj
 from ...core.shortcuts import paginate, pagination_dict
 from ...readtracker.poststracker import make_read_aware
 from ...users.online.utils import make_users_status_aware
+from ..checksums import verify_posts
 from ..paginator import PostsPaginator
 from ..permissions import exclude_invisible_posts
 from ..serializers import PostSerializer
@@ -37,6 +38,7 @@ class ViewModel:
                 posters.append(post.poster)
 
         make_users_status_aware(request, posters)
+        verify_posts(posts)
 
         if thread.category.acl["can_see_posts_likes"]:
             add_likes_to_posts(request.user, posts)
@@ -1,17 +1,28 @@
 from django.core.exceptions import PermissionDenied
 from django.core.paginator import EmptyPage, InvalidPage
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
 from django.http import Http404
 from django.utils.translation import gettext as _
 from django.utils.translation import gettext_lazy
 
 from ...acl.objectacl import add_acl_to_obj
+from ...categories import THREADS_ROOT_NAME
 from ...core.cursorpagination import get_page
 from ...readtracker import threadstracker
 from ...readtracker.cutoffdate import get_cutoff_date
+from ...readtracker.unreadthreads import filter_unread_threads, get_unread_threads_index
+from ...readtracker.watermarks import (
+    exclude_read_posts,
+    exclude_read_threads,
+    get_visited_threads_condition,
+)
 from ..models import Post, Thread
 from ..participants import make_participants_aware
-from ..permissions import exclude_invisible_posts, exclude_invisible_threads
+from ..permissions import (
+    can_see_all_posts,
+    exclude_invisible_posts,
+    exclude_invisible_threads,
+)
 from ..serializers import ThreadsListSerializer
 from ..subscriptions import make_subscription_aware
 from ..utils import add_categories_to_items
@@ -209,22 +220,34 @@ def filter_read_threads_queryset(request, categories, list_type, queryset):
     # grab cutoffs for categories
     cutoff_date = get_cutoff_date(request.settings, request.user)
 
+    index = None
+    if categories and categories[0].thread_type.root_name == THREADS_ROOT_NAME:
+        index = get_unread_threads_index(request.user)
+
     visible_posts = Post.objects.filter(posted_on__gt=cutoff_date)
     visible_posts = exclude_invisible_posts(request.user_acl, categories, visible_posts)
+    unread_posts = exclude_read_posts(request.user, visible_posts)
+
+    if index:
+        queryset = filter_unread_threads(index, queryset)
+        queryset = queryset.filter(last_post_on__gt=cutoff_date)
+        queryset = exclude_read_threads(request.user, queryset)
 
-    queryset = queryset.filter(id__in=visible_posts.distinct().values("thread"))
+        # unread last posts may be invisible to user, in which case threads
+        # are checked for other unread posts that they can see
+        if not can_see_all_posts(request.user_acl, categories):
+            queryset = queryset.filter(
+                Exists(unread_posts.filter(thread_id=OuterRef("id")))
+            )
+    else:
+        queryset = queryset.filter(id__in=unread_posts.distinct().values("thread"))
 
-    read_posts = visible_posts.filter(id__in=request.user.postread_set.values("post"))
+    visited_threads = get_visited_threads_condition(request.user)
 
     if list_type == "new":
-        # new threads have no entry in reads table
-        return queryset.exclude(id__in=read_posts.distinct().values("thread"))
+        # new threads were never read by user
+        return queryset.exclude(visited_threads)
 
     if list_type == "unread":
         # unread threads were read in past but have new posts
-        unread_posts = visible_posts.exclude(
-            id__in=request.user.postread_set.values("post")
-        )
-        queryset = queryset.filter(id__in=read_posts.distinct().values("thread"))
-        queryset = queryset.filter(id__in=unread_posts.distinct().values("thread"))
-        return queryset
+        return queryset.filter(visited_threads)
@@ -1,13 +1,13 @@
 from math import ceil
 
 from django.core.exceptions import PermissionDenied
-from django.db.models import Q
 from django.shortcuts import get_object_or_404, redirect
 from django.utils.translation import gettext as _
 from django.views import View
 
 from ...conf import settings
 from ...readtracker.cutoffdate import get_cutoff_date
+from ...readtracker.watermarks import get_thread_watermark
 from ..permissions import exclude_invisible_posts
 from ..viewmodels import ForumThread, PrivateThread
 
@@ -88,14 +88,14 @@ class ThreadGotoLastView(GotoView):
 
 
 class GetFirstUnreadPostMixin:
-    def get_first_unread_post(self, user, posts_queryset):
+    def get_first_unread_post(self, user, thread, posts_queryset):
         if user.is_authenticated:
             cutoff_date = get_cutoff_date(self.request.settings, user)
-            expired_posts = Q(posted_on__lt=cutoff_date)
-            read_posts = Q(id__in=user.postread_set.values("post"))
+            watermark = get_thread_watermark(user, thread)
 
             first_unread = (
-                posts_queryset.exclude(expired_posts | read_posts)
+                posts_queryset.filter(id__gt=watermark)
+                .exclude(posted_on__lt=cutoff_date)
                 .order_by("id")
                 .first()
             )
@@ -110,7 +110,7 @@ class ThreadGotoNewView(GotoView, GetFirstUnreadPostMixin):
     thread = ForumThread
 
     def get_target_post(self, user, thread, posts_queryset, **kwargs):
-        return self.get_first_unread_post(user, posts_queryset)
+        return self.get_first_unread_post(user, thread, posts_queryset)
 
 
 class ThreadGotoBestAnswerView(GotoView):
@@ -159,4 +159,4 @@ class PrivateThreadGotoNewView(GotoView, GetFirstUnreadPostMixin):
     thread = PrivateThread
 
     def get_target_post(self, user, thread, posts_queryset, **kwargs):
-        return self.get_first_unread_post(user, posts_queryset)
+        return self.get_first_unread_post(user, thread, posts_queryset)
@@ -1 +1,2 @@
 BANS_CACHE = "bans"
+USERNAMES_CACHE = "usernames"
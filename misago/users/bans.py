@@ -10,6 +10,7 @@ from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 
 from . import BANS_CACHE
+from ..cache.metrics import cache_metrics
 from .models import Ban, BanCache
 
 CACHE_SESSION_KEY = "misago_ip_check"
@@ -46,11 +47,17 @@ def get_user_ban(user, cache_versions):
     """
     try:
         ban_cache = user.ban_cache
-        if not ban_cache.is_valid(cache_versions):
-            _set_user_ban_cache(user, cache_versions)
+        if ban_cache.is_valid(cache_versions):
+            cache_metrics.record_hit(BANS_CACHE)
+        else:
+            cache_metrics.record_miss(BANS_CACHE)
+            with cache_metrics.measure_rebuild(BANS_CACHE):
+                _set_user_ban_cache(user, cache_versions)
     except BanCache.DoesNotExist:
-        user.ban_cache = BanCache(user=user)
-        user.ban_cache = _set_user_ban_cache(user, cache_versions)
+        cache_metrics.record_miss(BANS_CACHE)
+        with cache_metrics.measure_rebuild(BANS_CACHE):
+            user.ban_cache = BanCache(user=user)
+            user.ban_cache = _set_user_ban_cache(user, cache_versions)
 
     if user.ban_cache.ban:
         return user.ban_cache
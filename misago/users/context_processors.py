@@ -1,25 +1,15 @@
 from django.urls import reverse
 
+from ..conf.cache import settings_cache
+from ..core.frontendcontext import update_frontend_context
 from .pages import user_profile, usercp, users_list
 from .serializers import AnonymousUserSerializer, AuthenticatedUserSerializer
 
 
 def user_links(request):
     if request.include_frontend_context:
-        request.frontend_context.update(
-            {
-                "REQUEST_ACTIVATION_URL": reverse("misago:request-activation"),
-                "FORGOTTEN_PASSWORD_URL": reverse("misago:forgotten-password"),
-                "BANNED_URL": reverse("misago:banned"),
-                "USERCP_URL": reverse("misago:options"),
-                "USERS_LIST_URL": reverse("misago:users"),
-                "AUTH_API": reverse("misago:api:auth"),
-                "AUTH_CRITERIA_API": reverse("misago:api:auth-criteria"),
-                "USERS_API": reverse("misago:api:user-list"),
-                "CAPTCHA_API": reverse("misago:api:captcha-question"),
-                "USERNAME_CHANGES_API": reverse("misago:api:usernamechange-list"),
-                "MENTION_API": reverse("misago:api:mention-suggestions"),
-            }
+        update_frontend_context(
+            request, settings_cache, "user_links", get_user_links_frontend_context
         )
 
     return {
@@ -29,6 +19,22 @@ def user_links(request):
     }
 
 
+def get_user_links_frontend_context():
+    return {
+        "REQUEST_ACTIVATION_URL": reverse("misago:request-activation"),
+        "FORGOTTEN_PASSWORD_URL": reverse("misago:forgotten-password"),
+        "BANNED_URL": reverse("misago:banned"),
+        "USERCP_URL": reverse("misago:options"),
+        "USERS_LIST_URL": reverse("misago:users"),
+        "AUTH_API": reverse("misago:api:auth"),
+        "AUTH_CRITERIA_API": reverse("misago:api:auth-criteria"),
+        "USERS_API": reverse("misago:api:user-list"),
+        "CAPTCHA_API": reverse("misago:api:captcha-question"),
+        "USERNAME_CHANGES_API": reverse("misago:api:usernamechange-list"),
+        "MENTION_API": reverse("misago:api:mention-suggestions"),
+    }
+
+
 def preload_user_json(request):
     if not request.include_frontend_context:
         return {}
@@ -0,0 +1,127 @@
+"""
+Resolver for users mentioned in posts
+
+Resolved users are kept in process-local LRU that's invalidated by bumping
+usernames cache version whenever user's username changes or user is deleted.
+Slugs of users that don't exist are not cached, so new users can be mentioned
+right after they register.
+"""
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Lock, local
+
+from django.contrib.auth import get_user_model
+
+from . import USERNAMES_CACHE
+from ..cache.metrics import cache_metrics
+from ..cache.versions import get_cache_versions_snapshot, invalidate_cache
+from ..conf import settings
+
+_bulk_data = local()
+
+
+class MentionsResolver:
+    def __init__(self):
+        self.lock = Lock()
+        self.users = OrderedDict()
+        self.version = None
+
+    def resolve(self, slugs):
+        """returns dict of slugs of existing users and their ids and usernames"""
+        bulk_users = getattr(_bulk_data, "users", None)
+        if bulk_users is not None:
+            users_data = {
+                slug: bulk_users[slug] for slug in slugs if slug in bulk_users
+            }
+            slugs = [slug for slug in slugs if slug not in _bulk_data.slugs]
+        else:
+            users_data = {}
+
+        if not slugs:
+            return users_data
+
+        size = settings.MISAGO_MENTIONS_CACHE_SIZE
+        if not size:
+            users_data.update(get_users_data_from_db(slugs))
+            return users_data
+
+        version = get_cache_versions_snapshot()[USERNAMES_CACHE]
+        missing_slugs = []
+        with self.lock:
+            if self.version != version:
+                self.version = version
+                self.users.clear()
+
+            for slug in slugs:
+                user_data = self.users.get(slug)
+                if user_data:
+                    self.users.move_to_end(slug)
+                    users_data[slug] = user_data
+                else:
+                    missing_slugs.append(slug)
+
+        if missing_slugs:
+            cache_metrics.record_miss(USERNAMES_CACHE)
+            db_users_data = get_users_data_from_db(missing_slugs)
+            users_data.update(db_users_data)
+            self.set(version, db_users_data)
+        else:
+            cache_metrics.record_hit(USERNAMES_CACHE)
+
+        return users_data
+
+    def set(self, version, users_data):
+        size = settings.MISAGO_MENTIONS_CACHE_SIZE
+        with self.lock:
+            if self.version != version:
+                return
+
+            for slug, user_data in users_data.items():
+                self.users[slug] = user_data
+                self.users.move_to_end(slug)
+            while len(self.users) > size:
+                self.users.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.users.clear()
+            self.version = None
+
+
+mentions_resolver = MentionsResolver()
+
+
+def resolve_mentions(slugs):
+    return mentions_resolver.resolve(slugs)
+
+
+@contextmanager
+def resolve_mentions_in_bulk(slugs):
+    """Resolves mentions of many posts with one query
+
+    Mentions of given slugs resolved within this context are read from data
+    loaded on enter. Other slugs are resolved as usual.
+    """
+    if getattr(_bulk_data, "users", None) is not None:
+        yield
+        return
+
+    _bulk_data.slugs = set(slugs)
+    _bulk_data.users = get_users_data_from_db(_bulk_data.slugs)
+    try:
+        yield
+    finally:
+        _bulk_data.slugs = None
+        _bulk_data.users = None
+
+
+def get_users_data_from_db(slugs):
+    User = get_user_model()
+    queryset = User.objects.filter(slug__in=slugs).values_list("id", "username", "slug")
+
+    return {slug: (user_id, username) for user_id, username, slug in queryset}
+
+
+def invalidate_mentions_cache():
+    invalidate_cache(USERNAMES_CACHE)
+    mentions_resolver.clear()
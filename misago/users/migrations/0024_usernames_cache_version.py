@@ -0,0 +1,26 @@
+# Generated by Django 3.2.15 on 2026-10-18 19:43
+
+from django.db import migrations, models
+
+from .. import USERNAMES_CACHE
+from ...cache.operations import StartCacheVersioning
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("misago_users", "0023_remove_user_sso_id"),
+        ("misago_cache", "0001_initial"),
+    ]
+
+    operations = [
+        StartCacheVersioning(USERNAMES_CACHE),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["slug"],
+                name="misago_user_slug_prefix_part",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ),
+    ]
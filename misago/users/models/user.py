@@ -238,6 +238,12 @@ class User(AbstractBaseUser, PermissionsMixin):
                 fields=["is_deleting_account"],
                 condition=Q(is_deleting_account=True),
             ),
+            models.Index(
+                name="misago_user_slug_prefix_part",
+                fields=["slug"],
+                opclasses=["varchar_pattern_ops"],
+                condition=Q(is_active=True),
+            ),
         ]
 
     def clean(self):
@@ -280,6 +286,7 @@ class User(AbstractBaseUser, PermissionsMixin):
         """
         self.username = anonymous_username
         self.slug = slugify(self.username)
+        self._username_changed = True
 
         from ..signals import anonymize_user_data
 
@@ -372,6 +379,8 @@ class User(AbstractBaseUser, PermissionsMixin):
             self.slug = slugify(new_username)
 
             if self.pk:
+                self._username_changed = True
+
                 changed_by = changed_by or self
                 namechange = self.record_name_change(
                     changed_by, new_username, old_username
@@ -3,11 +3,13 @@ from datetime import timedelta
 
 from django.contrib.auth import get_user_model
 from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import Signal, receiver
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from ..core.pgutils import chunk_queryset
+from .mentions import invalidate_mentions_cache
 from .models import AuditTrail, DataDownload
 from .profilefields import profilefields
 
@@ -84,6 +86,18 @@ def handle_name_change(sender, **kwargs):
     sender.user_renames.update(changed_by_username=sender.username)
 
 
+@receiver(post_save, sender=User)
+def invalidate_mentions_cache_after_name_change(sender, instance, **kwargs):
+    if getattr(instance, "_username_changed", False):
+        instance._username_changed = False
+        invalidate_mentions_cache()
+
+
+@receiver(post_delete, sender=User)
+def invalidate_mentions_cache_after_user_delete(sender, **kwargs):
+    invalidate_mentions_cache()
+
+
 @receiver(remove_old_ips)
 def remove_old_registrations_ips(sender, *, ip_storage_time, **kwargs):
     datetime_cutoff = timezone.now() - timedelta(days=ip_storage_time)
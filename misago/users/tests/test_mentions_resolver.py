@@ -0,0 +1,93 @@
+import pytest
+from django.test import override_settings
+
+from ...cache.test import assert_invalidates_cache
+from ...cache.versions import get_cache_versions
+from .. import USERNAMES_CACHE
+from ..mentions import mentions_resolver, resolve_mentions, resolve_mentions_in_bulk
+from ..test import create_test_user
+
+
+@pytest.fixture(autouse=True)
+def clear_mentions_resolver():
+    mentions_resolver.clear()
+    yield
+    mentions_resolver.clear()
+
+
+def test_resolver_returns_data_of_mentioned_users(user):
+    assert resolve_mentions([user.slug, "nonexisting"]) == {
+        user.slug: (user.id, user.username)
+    }
+
+
+@override_settings(MISAGO_MENTIONS_CACHE_SIZE=10)
+def test_resolver_caches_resolved_users(django_assert_num_queries, user):
+    resolve_mentions([user.slug])
+    with django_assert_num_queries(1):  # Cache versions
+        assert resolve_mentions([user.slug]) == {user.slug: (user.id, user.username)}
+
+
+@override_settings(MISAGO_MENTIONS_CACHE_SIZE=10)
+def test_resolver_doesnt_cache_nonexisting_users(db):
+    resolve_mentions(["newuser"])
+    new_user = create_test_user("NewUser", "newuser@example.com")
+    assert resolve_mentions(["newuser"]) == {"newuser": (new_user.id, "NewUser")}
+
+
+@override_settings(MISAGO_MENTIONS_CACHE_SIZE=10)
+def test_resolver_cache_is_invalidated_when_user_is_renamed(user):
+    old_slug = user.slug
+    resolve_mentions([old_slug])
+
+    with assert_invalidates_cache(USERNAMES_CACHE):
+        user.set_username("Renamed")
+        user.save()
+
+    assert resolve_mentions([old_slug]) == {}
+    assert resolve_mentions(["renamed"]) == {"renamed": (user.id, "Renamed")}
+
+
+@override_settings(MISAGO_MENTIONS_CACHE_SIZE=10)
+def test_resolver_cache_is_invalidated_when_user_is_deleted(user):
+    resolve_mentions([user.slug])
+
+    with assert_invalidates_cache(USERNAMES_CACHE):
+        user.delete(anonymous_username="Deleted")
+
+    assert resolve_mentions([user.slug]) == {}
+
+
+def test_resolver_cache_is_not_invalidated_by_other_user_changes(user):
+    version = get_cache_versions()[USERNAMES_CACHE]
+    user.title = "Changed"
+    user.save()
+    assert get_cache_versions()[USERNAMES_CACHE] == version
+
+
+@override_settings(MISAGO_MENTIONS_CACHE_SIZE=2)
+def test_resolver_cache_is_bounded(db):
+    users = [create_test_user("User%s" % i, "user%s@example.com" % i) for i in range(3)]
+    resolve_mentions([user.slug for user in users])
+    assert len(mentions_resolver.users) == 2
+
+
+def test_bulk_resolver_resolves_mentions_with_one_query(
+    django_assert_num_queries, user, other_user
+):
+    slugs = [user.slug, other_user.slug, "nonexisting"]
+    with django_assert_num_queries(1):
+        with resolve_mentions_in_bulk(slugs):
+            assert resolve_mentions([user.slug]) == {
+                user.slug: (user.id, user.username)
+            }
+            assert resolve_mentions([other_user.slug, "nonexisting"]) == {
+                other_user.slug: (other_user.id, other_user.username)
+            }
+
+
+def test_bulk_resolver_resolves_other_mentions_from_db(user, other_user):
+    with resolve_mentions_in_bulk([user.slug]):
+        assert resolve_mentions([other_user.slug]) == {
+            other_user.slug: (other_user.id, other_user.username)
+        }